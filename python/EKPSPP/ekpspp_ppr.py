@@ -10,15 +10,15 @@ Tab 4: Monthly Prod & Inj — 5-year history with chart per well
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import re, threading, traceback, time
+import re, threading, traceback, time, os, sys
 from collections import defaultdict
 
 # ╔══════════════════════════════════════════════════════════════════════════╗
 # ║  EKPSPP Connection                                                      ║
 # ╚══════════════════════════════════════════════════════════════════════════╝
-DB_TNS_ALIAS = "EKPSPP.WORLD"
-DB_USER      = "oxy_read"
-DB_PASSWORD  = "oxy_read"
+# Credentials / TNS alias live in python/common/db.py (DB_CONFIGS["ekpspp"])
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import db
 # ═════════════════════════════════════════════════════════════════════════════
 
 DEFAULT_TEST_APIS = """0403031235
@@ -45,19 +45,8 @@ DEFAULT_TEST_APIS = """0403031235
 
 
 def get_oracle_connection():
-    try:
-        import cx_Oracle as ora
-        return ora.connect(user=DB_USER, password=DB_PASSWORD, dsn=DB_TNS_ALIAS)
-    except ImportError:
-        pass
-    try:
-        import oracledb as ora
-        try: ora.init_oracle_client()
-        except ora.ProgrammingError: pass
-        return ora.connect(user=DB_USER, password=DB_PASSWORD, dsn=DB_TNS_ALIAS)
-    except ImportError:
-        pass
-    raise ImportError("Neither cx_Oracle nor oracledb installed.")
+    """Pooled EKPSPP connection; close() returns it to the pool."""
+    return db.get_connection("ekpspp")
 
 
 # ---------------------------------------------------------------------------
@@ -614,6 +603,7 @@ class WellDataViewer(tk.Tk):
             from matplotlib.figure import Figure
             from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
             from datetime import datetime
+            from common import downsample   # long histories drawn at pixel resolution
         except ImportError:
             messagebox.showerror("Missing Library",
                                  "matplotlib is required for charts.\n"
@@ -719,6 +709,9 @@ class WellDataViewer(tk.Tk):
             ax2.grid(True, alpha=0.3)
 
         fig.tight_layout(rect=[0, 0, 1, 0.94])
+        for ax in fig.axes:
+            for line in ax.get_lines():
+                downsample.attach(line)
         canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
         canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
@@ -759,6 +752,7 @@ class WellDataViewer(tk.Tk):
     # ── FETCH ALL ──
     def _fetch_all_tabs(self):
         t_total = time.time()
+        conn = cur = None
         try:
             self.after(0, self.log, f"Connecting for {len(self.validated_apis)} APIs…")
             conn = get_oracle_connection()
@@ -789,7 +783,7 @@ class WellDataViewer(tk.Tk):
                 for lbl in (self.lbl_tab2_status, self.lbl_tab3_status, self.lbl_tab4_status, self.lbl_tab5_status):
                     self.after(0, lambda l=lbl: l.config(text="No completions found.", foreground="orange"))
                 self.after(0, lambda: self.lbl_status.config(text="No completions.", foreground="orange"))
-                cur.close(); conn.close(); return
+                return
 
             # Tab 2
             self.after(0, lambda: self.lbl_tab2_status.config(text="Fetching…", foreground="blue"))
@@ -849,7 +843,6 @@ class WellDataViewer(tk.Tk):
                 text=f"{n5} daily rows" if n5 else "No daily injection data (60 days)",
                 foreground="green" if n5 else "orange"))
 
-            cur.close(); conn.close()
             elapsed = time.time() - t_total
             self.after(0, self.log, f"All tabs done in {elapsed:.1f}s.")
             self.after(0, lambda: self.lbl_status.config(
@@ -863,6 +856,14 @@ class WellDataViewer(tk.Tk):
                 self.after(0, lambda l=lbl: l.config(text="Error", foreground="red"))
             self.after(0, lambda: self.lbl_status.config(text="✗ Error — see log", foreground="red"))
             self.after(0, lambda: messagebox.showerror("Error", f"Failed:\n{e}"))
+        finally:
+            # Always hand the session back, or failed runs drain the pool
+            for res in (cur, conn):
+                if res is not None:
+                    try:
+                        res.close()
+                    except Exception:
+                        pass
 
     def _populate_generic(self, tree, results):
         for iid in tree.get_children(): tree.delete(iid)
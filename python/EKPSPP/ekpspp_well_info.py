@@ -12,7 +12,9 @@ Performance Strategy (3-step query):
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+import os
 import re
+import sys
 import threading
 import traceback
 import time
@@ -20,9 +22,9 @@ import time
 # ╔══════════════════════════════════════════════════════════════════════════╗
 # ║  EKPSPP Connection                                                      ║
 # ╚══════════════════════════════════════════════════════════════════════════╝
-DB_TNS_ALIAS = "EKPSPP.WORLD"
-DB_USER      = "oxy_read"
-DB_PASSWORD  = "oxy_read"
+# Credentials / TNS alias live in python/common/db.py (DB_CONFIGS["ekpspp"])
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import db
 # ═════════════════════════════════════════════════════════════════════════════
 
 # Pre-loaded test APIs (clear for production use)
@@ -50,25 +52,8 @@ DEFAULT_TEST_APIS = """0403031235
 
 
 def get_oracle_connection():
-    """Return a cx_Oracle / oracledb connection to EKPSPP using TNS alias."""
-    try:
-        import cx_Oracle as ora
-        return ora.connect(user=DB_USER, password=DB_PASSWORD, dsn=DB_TNS_ALIAS)
-    except ImportError:
-        pass
-    try:
-        import oracledb as ora
-        try:
-            ora.init_oracle_client()
-        except ora.ProgrammingError:
-            pass
-        return ora.connect(user=DB_USER, password=DB_PASSWORD, dsn=DB_TNS_ALIAS)
-    except ImportError:
-        pass
-    raise ImportError(
-        "Neither 'cx_Oracle' nor 'oracledb' is installed.\n"
-        "Install with:  pip install cx_Oracle   or   pip install oracledb"
-    )
+    """Pooled EKPSPP connection; close() returns it to the pool."""
+    return db.get_connection("ekpspp")
 
 
 # ---------------------------------------------------------------------------
@@ -434,13 +419,14 @@ class WellDataViewer(tk.Tk):
         def _worker():
             t0 = time.time()
             try:
-                conn = get_oracle_connection()
-                cur = conn.cursor()
-                cur.execute("SELECT 1 FROM DUAL")
-                cur.fetchone()
+                with get_oracle_connection() as conn:
+                    cur = conn.cursor()
+                    try:
+                        cur.execute("SELECT 1 FROM DUAL")
+                        cur.fetchone()
+                    finally:
+                        cur.close()
                 elapsed = time.time() - t0
-                cur.close()
-                conn.close()
                 self.after(0, self.log, f"Connection OK ({elapsed:.1f}s)")
                 self.after(0, lambda: self.lbl_status.config(
                     text=f"✓ Connected ({elapsed:.1f}s)", foreground="green"))
@@ -552,16 +538,15 @@ class WellDataViewer(tk.Tk):
     def _run_basic_query(self):
         t0 = time.time()
         try:
-            conn = get_oracle_connection()
-            self.after(0, self.log, "Connected to EKPSPP.")
+            with get_oracle_connection() as conn:
+                self.after(0, self.log, "Connected to EKPSPP.")
 
-            def log_from_thread(msg):
-                self.after(0, self.log, msg)
+                def log_from_thread(msg):
+                    self.after(0, self.log, msg)
 
-            results, sql_text = run_three_step_query(
-                self.validated_apis, conn, log_from_thread
-            )
-            conn.close()
+                results, sql_text = run_three_step_query(
+                    self.validated_apis, conn, log_from_thread
+                )
 
             self.after(0, self._show_sql, sql_text)
             self.after(0, self._populate_tree2, results)
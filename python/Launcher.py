@@ -1,10 +1,15 @@
 import os
 import sys
 import subprocess
+import threading
 import tkinter as tk
 from tkinter import ttk
 import ttkbootstrap as tb
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.warm import WarmPool   # pre-imported tool processes — see common/warm.py
+from common import catalog         # cached script list / #Help lines — see common/catalog.py
+
 """
 Launcher app with dynamically generated sections for different folders.
 Buttons are created automatically by scanning Python files in the specified folders at runtime.
@@ -20,7 +25,7 @@ class ToolTip:
         self.widget.bind("<Leave>", self.hide)
 
     def show(self, event=None):
-        if self.tooltip:
+        if self.tooltip or not self.text:
             return
         x = self.widget.winfo_rootx() + 20
         y = self.widget.winfo_rooty() + self.widget.winfo_height() + 5
@@ -51,6 +56,11 @@ class Launcher(tb.Window):
 
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
 
+        # Workers with pandas/matplotlib/oracledb already loaded; a click hands one the script
+        self.warm = WarmPool()
+        self.warm.start()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
         # Define sections: (label, folder, bootstyle)
         sections = [
             ("UIC", "UIC", "primary"),
@@ -59,6 +69,11 @@ class Launcher(tb.Window):
             ("EKPSPP", "EKPSPP", "success"),
         ]
 
+        # Buttons come from the cached catalog straight away; a background scan
+        # then refreshes only the sections whose scripts changed.
+        self.stored = catalog.load()
+        self.catalog = dict(self.stored)
+        self.sections = {}     # folder -> (frame, bootstyle, entries, {script: ToolTip})
         for label, folder, bootstyle in sections:
             frame = tb.LabelFrame(self, text=label)
             frame.pack(fill="x", padx=12, pady=8)
@@ -68,29 +83,49 @@ class Launcher(tb.Window):
                 frame.configure(height=560)
             frame.pack_propagate(False)
             folder_path = os.path.join(self.base_dir, folder)
-            if os.path.isdir(folder_path):
-                scripts = sorted([f for f in os.listdir(folder_path) if f.endswith('.py')])
-                self.create_buttons(frame, folder, scripts, bootstyle)
+            entries = self.catalog.get(folder)
+            if entries is None and os.path.isdir(folder_path):
+                entries = catalog.scan(folder_path)    # first start: no cache yet
+                self.catalog[folder] = entries
+            self.sections[folder] = (frame, bootstyle, entries or [], {})
+            self.create_buttons(frame, folder, entries or [], bootstyle)
 
-    def get_script_help(self, script_path: str) -> str | None:
-        """Read the first line of a script to check for #Help comment."""
-        try:
-            with open(script_path, 'r', encoding='utf-8') as f:
-                first_line = f.readline().strip()
-                if first_line.startswith('#Help'):
-                    return first_line[5:].strip(': -').lstrip(': ')  # Return text after #Help
-        except Exception:
-            pass
-        return None
+        threading.Thread(target=self._revalidate, daemon=True).start()
 
-    def create_buttons(self, frame, folder, scripts, bootstyle):
+    def _revalidate(self):
+        """Rescan the folders (worker thread) and hand changes to the UI thread."""
+        fresh = {}
+        for folder, (_, _, entries, _) in list(self.sections.items()):
+            folder_path = os.path.join(self.base_dir, folder)
+            fresh[folder] = catalog.scan(folder_path, entries) if os.path.isdir(folder_path) else []
+        if fresh != self.stored:
+            catalog.save(catalog.CATALOG_FILE, fresh)
+        self.after(0, self._apply_catalog, fresh)
+
+    def _apply_catalog(self, fresh):
+        for folder, entries in fresh.items():
+            frame, bootstyle, old, tips = self.sections[folder]
+            if entries == old:
+                continue
+            if [e["name"] for e in entries] == [e["name"] for e in old]:
+                for e in entries:                      # same buttons: only help text moved
+                    tips[e["name"]].text = e["help"]
+            else:
+                for child in frame.winfo_children():
+                    child.destroy()
+                tips.clear()
+                self.create_buttons(frame, folder, entries, bootstyle)
+            self.sections[folder] = (frame, bootstyle, entries, tips)
+        self.catalog = self.stored = fresh
+
+    def create_buttons(self, frame, folder, entries, bootstyle):
         max_cols = 4
-        for i, script in enumerate(scripts):
+        tips = self.sections[folder][3]
+        for i, entry in enumerate(entries):
             row = i // max_cols
             col = i % max_cols
+            script = entry["name"]
             display_name = script[:-3]  # remove .py
-            script_path = os.path.join(self.base_dir, folder, script)
-            help_text = self.get_script_help(script_path)
             btn = tb.Button(
                 frame,
                 text=display_name,
@@ -101,19 +136,24 @@ class Launcher(tb.Window):
                 ),
             )
             btn.grid(row=row, column=col, padx=10, pady=10, sticky="w")
-            # Add tooltip if help text is available
-            if help_text:
-                ToolTip(btn, help_text)
+            # Tooltip shows the help text (if any); kept so a rescan can update it
+            tips[script] = ToolTip(btn, entry["help"])
 
     def run_script(self, path: str, name: str = "Script"):
         if not os.path.isfile(path):
             return
+        if self.warm.run(path):
+            return
         cmd = [sys.executable, path]
         try:
             subprocess.Popen(cmd, cwd=os.path.dirname(path) or self.base_dir)
         except Exception:
             pass
 
+    def _on_close(self):
+        self.warm.close()
+        self.destroy()
+
 
 if __name__ == "__main__":
     app = Launcher()
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
@@ -6,6 +7,46 @@ from datetime import datetime
 import threading
 import queue
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.index_store import IndexStore, SKIPPED   # per-folder commits — see python/common/
+from common.crawler import Crawler                  # parallel scandir workers
+from common.compact_index import shards_dir_for, write_shards   # gzip shards for the search page
+
+PROGRESS_EVERY_S = 10   # seconds between progress lines in the log
+
+
+def import_legacy_status(store, status_file_path, data_file_path):
+    """Seed a new store from an interrupted run's <name>_status.json /
+    <name>_files.json, so it carries on instead of starting over.  (A run
+    stopped during discovery had indexed nothing yet and just starts over.)"""
+    try:
+        with open(status_file_path, 'r') as f:
+            status_data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 0
+    if not status_data.get("meta", {}).get("discovery_complete"):
+        return 0
+    files_by_folder = {}
+    try:
+        with open(data_file_path, 'r') as f:
+            for item in json.load(f):
+                try:
+                    mtime = datetime.strptime(item['modified_date'], '%Y-%m-%d %H:%M:%S').timestamp()
+                except (KeyError, ValueError):
+                    mtime = None
+                folder, name = os.path.split(item['path'])
+                files_by_folder.setdefault(folder, []).append((name, mtime, None))
+    except (OSError, json.JSONDecodeError):
+        pass
+    done = {e['path'] for e in status_data.get("folders", []) if e['status'] == 'Yes'}
+    for entry in status_data.get("folders", []):
+        store.add_root(entry['path'])
+    for fid, path in list(store.pending()):
+        if path in done:
+            store.commit_folder(fid, (), files_by_folder.get(path, ()))
+    return len(done)
+
+
 class IndexerGUI:
     def __init__(self, root):
         self.root = root
@@ -64,8 +105,10 @@ class IndexerGUI:
             return "".join(c if c.isalnum() else '_' for c in name)
 
         def write_json(file_path, data):
-            with open(file_path, 'w') as f:
+            tmp_path = file_path + ".tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(data, f, indent=4)
+            os.replace(tmp_path, file_path)   # never leave a half-written folders.json
         
         def read_json(file_path):
             try:
@@ -87,97 +130,65 @@ class IndexerGUI:
             self.log_queue.put((f"Processing Top-Level Folder: {top_folder_info['name']}", 0))
             base_name = sanitize_filename(top_folder_info['name'])
             status_file_path = os.path.join(script_dir, f"{base_name}_status.json")
+            store_path = os.path.join(script_dir, f"{base_name}_index.sqlite")
             data_file_path = os.path.join(script_dir, f"{base_name}_files.json")
 
-            # --- PHASE 1: DISCOVERY ---
-            status_data = read_json(status_file_path)
-            if not status_data or not status_data.get("meta", {}).get("discovery_complete", False):
-                self.log_queue.put(("Starting/Resuming Phase 1: Discovery.", 1))
-                try:
-                    if not os.path.exists(top_folder_info['path']):
-                         self.log_queue.put((f"ERROR: Path not found: {top_folder_info['path']}. Skipping.", 1))
-                         continue
-                    
-                    status_data = {"meta": {"discovery_complete": False}, "folders": []}
-                    all_subfolders = [top_folder_info['path']] 
-                    subfolders_found = 0
-
-                    for root, dirs, _ in os.walk(top_folder_info['path']):
-                        for d in dirs:
-                            all_subfolders.append(os.path.join(root, d))
-                            subfolders_found += 1
-                            if subfolders_found % 500 == 0:
-                                status_data["folders"] = [{"path": p, "status": "No"} for p in all_subfolders]
-                                write_json(status_file_path, status_data)
-                                self.log_queue.put((f"Discovery checkpoint: {subfolders_found} folders found and saved.", 2))
-                    
-                    status_data["folders"] = [{"path": p, "status": "No"} for p in all_subfolders]
-                    status_data["meta"]["discovery_complete"] = True 
-                    write_json(status_file_path, status_data)
-                    self.log_queue.put((f"Discovery complete. Found a total of {len(all_subfolders)} subfolders.", 1))
-                except Exception as e:
-                    self.log_queue.put((f"ERROR during Discovery Phase: {e}. Progress saved. Will retry on next run.", 1))
-                    continue
-            
-            # --- PHASE 2: GRANULAR INDEXING ---
-            self.log_queue.put(("Starting Phase 2: Granular Indexing.", 1))
-            
-            subfolder_statuses = status_data["folders"]
-            indexed_files_data = read_json(data_file_path) or []
-            
-            something_was_indexed_in_run = False
-            subfolders_since_update = 0 
-            total_subfolders = len(subfolder_statuses)
-
-            for i, folder_entry in enumerate(subfolder_statuses):
-                if folder_entry['status'] == 'Yes':
-                    continue
+            if not os.path.exists(top_folder_info['path']):
+                self.log_queue.put((f"ERROR: Path not found: {top_folder_info['path']}. Skipping.", 1))
+                continue
 
-                try:
-                    # The following line was removed to reduce log messages
-                    # self.log_queue.put((f"Scanning subfolder: {folder_entry['path']}", 2))
-                    with os.scandir(folder_entry['path']) as it:
-                        for entry in it:
-                            if entry.is_file(follow_symlinks=False):
-                                try:
-                                    mod_time = datetime.fromtimestamp(entry.stat().st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                                    indexed_files_data.append({
-                                        "name": entry.name,
-                                        "path": entry.path,
-                                        "modified_date": mod_time
-                                    })
-                                except (OSError, PermissionError):
-                                    pass
-                    
-                    folder_entry['status'] = 'Yes'
-                    something_was_indexed_in_run = True
-                    subfolders_since_update += 1
-
-                    if subfolders_since_update >= 500:
-                        self.log_queue.put((f"CHECKPOINT: Saving progress. {i + 1} of {total_subfolders} subfolders processed.", 2))
-                        write_json(status_file_path, status_data)
-                        write_json(data_file_path, indexed_files_data)
-                        subfolders_since_update = 0
-
-                except (OSError, PermissionError) as e:
-                    self.log_queue.put((f"WARNING: Skipping inaccessible subfolder {folder_entry['path']}: {e}", 2))
-                    folder_entry['status'] = 'Yes' 
-                    something_was_indexed_in_run = True
-                    continue
-
-            if something_was_indexed_in_run:
-                self.log_queue.put(("Saving final data for this run...", 1))
-                write_json(status_file_path, status_data)
-                write_json(data_file_path, indexed_files_data)
-
-            if all(f['status'] == 'Yes' for f in subfolder_statuses):
-                self.log_queue.put((f"SUCCESS: Granular indexing complete for {top_folder_info['name']}.", 1))
-                top_folder_info['Indexed'] = "Yes"
-                top_folder_info['Date Indexed'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                top_folder_info['Index File'] = os.path.basename(data_file_path) 
-                write_json(main_config_path, main_config)
-            elif something_was_indexed_in_run:
-                 self.log_queue.put((f"Finished a partial indexing run for {top_folder_info['name']}. Restart to continue.", 1))
+            try:
+                with IndexStore(store_path) as store:
+                    if store.is_new:
+                        carried = import_legacy_status(store, status_file_path, data_file_path)
+                        if carried:
+                            self.log_queue.put((f"Carried over {carried} indexed folders from {os.path.basename(status_file_path)}.", 1))
+                    store.add_root(top_folder_info['path'])
+
+                    # --- Crawl: list each pending folder once (subfolders + files), commit per folder ---
+                    c = store.counts()
+                    self.log_queue.put((f"Indexing: {c['done'] + c['skipped']} folders done, {c['pending']} pending.", 1))
+                    def report(st):
+                        self.log_queue.put((f"Progress: {st.dirs} folders, {st.files} files listed this run, "
+                                            f"{st.queued} queued ({st.dirs / max(st.elapsed, 1e-9):.0f} folders/s).", 2))
+                    crawler = Crawler(progress=report, progress_s=PROGRESS_EVERY_S)
+                    for listing in crawler.walk([path for _, path in store.pending()]):
+                        if listing.error is not None:
+                            self.log_queue.put((f"WARNING: Skipping inaccessible subfolder {listing.path}: {listing.error}", 2))
+                            store.commit_path(listing.path, state=SKIPPED)
+                            continue
+                        files = []
+                        for entry in listing.files:
+                            try:
+                                st = entry.stat(follow_symlinks=False)   # cached by the crawler
+                                files.append((entry.name, st.st_mtime, st.st_size))
+                            except OSError:
+                                pass
+                        store.commit_path(listing.path, [d.path for d in listing.dirs], files)
+
+                    # --- Compaction: stream the store into the final export ---
+                    self.log_queue.put(("Writing final index file...", 1))
+                    n_files = store.export_json(data_file_path, lambda folder, name, mtime, size: {
+                        "name": name,
+                        "path": os.path.join(folder, name),
+                        "modified_date": datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S') if mtime is not None else "",
+                    })
+                    shards_dir = shards_dir_for(data_file_path)
+                    manifest = write_shards(shards_dir, store.iter_files(), [top_folder_info['path']],
+                                            top_folder_info['name'])
+                    self.log_queue.put((f"Wrote {len(manifest['shards'])} index shards to {os.path.basename(shards_dir)}.", 1))
+            except Exception as e:
+                self.log_queue.put((f"ERROR while indexing: {e}. Progress is saved per folder; run again to continue.", 1))
+                continue
+
+            self.log_queue.put((f"SUCCESS: Granular indexing complete for {top_folder_info['name']} ({n_files} files).", 1))
+            if os.path.exists(status_file_path):
+                os.remove(status_file_path)      # superseded by the .sqlite store
+            top_folder_info['Indexed'] = "Yes"
+            top_folder_info['Date Indexed'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            top_folder_info['Index File'] = os.path.basename(data_file_path)
+            top_folder_info['Manifest'] = f"{os.path.basename(shards_dir)}/manifest.json"
+            write_json(main_config_path, main_config)
 
         self.log_queue.put(("All top-level folders processed.", 0))
 
@@ -29,6 +29,9 @@ except ImportError:
     os.system(f"{sys.executable} -m pip install PyMuPDF --break-system-packages -q")
     import fitz
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.crawler import Crawler   # parallel scandir workers — see python/common/
+
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 
@@ -403,23 +406,23 @@ class ScannerEngine:
         Save every 10 folders. Returns total number of new folders discovered.
         """
         new_roots = self.tracker.get_new_root_folders(root_folders)
-        count = 0
+        roots = []
         for root_folder in new_roots:
             root_folder = root_folder.strip()
-            if not root_folder or not os.path.isdir(root_folder):
-                continue
-            norm_root = os.path.normpath(root_folder)
-            for dirpath, dirnames, _files in os.walk(root_folder):
-                if self._stop_flag:
-                    self.tracker.save()
-                    return count
-                norm_path = os.path.normpath(dirpath)
-                self.tracker.add_folder(norm_path, root_folder=norm_root)
-                count += 1
-                if on_progress:
-                    on_progress(norm_path, count)
-                if count % FOLDER_SAVE_INTERVAL == 0:
-                    self.tracker.save()
+            if root_folder and os.path.isdir(root_folder):
+                roots.append(root_folder)
+        count = 0
+        # Folders are listed in parallel; each listing names the root it came from
+        for listing in Crawler(stat_files=False, should_stop=lambda: self._stop_flag).walk(roots):
+            if self._stop_flag:
+                break
+            norm_path = os.path.normpath(listing.path)
+            self.tracker.add_folder(norm_path, root_folder=os.path.normpath(listing.root))
+            count += 1
+            if on_progress:
+                on_progress(norm_path, count)
+            if count % FOLDER_SAVE_INTERVAL == 0:
+                self.tracker.save()
 
         self.tracker.save()
         return count
@@ -16,29 +16,24 @@ Run:            python abandoned_wells_viewer.py
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading, csv, sys
+import threading, sys, os
+from collections import OrderedDict
 from datetime import datetime
 
-# ═══════════════════════════════════════════════════════════════════════════════
-TNS_ALIAS   = "ODW"
-DB_USERNAME = "rptguser"
-DB_PASSWORD = "allusers"
-# ═══════════════════════════════════════════════════════════════════════════════
-
-try:
-    import oracledb
-except ImportError:
-    sys.exit("ERROR: oracledb not installed.  Run:  pip install oracledb")
-
-try:
-    import matplotlib
-    matplotlib.use("TkAgg")
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    HAS_MPL = True
-except ImportError:
-    HAS_MPL = False
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup       # lazy heavy imports + startup timing — see python/common/
+from common import query_cache   # pooled + disk-cached ODW reads — see python/common/
+from common.vtable import ListTable, VirtualTable   # only the visible rows live in Tk
+from common import mirror        # local cmpl_mnly_fact replica (common/mirror.py)
+from common.history_store import HistoryStore   # bulk-prefetched chart histories
+from common import export        # streamed .csv / .xlsx / .parquet exports
+
+# matplotlib loads with the first chart (or in the background once the window
+# is up), not before the window
+HAS_MPL = startup.available("matplotlib")
+mdates = startup.lazy("matplotlib.dates")
+ChartHost = startup.lazy("common.charts", "ChartHost")   # chart figure/axes reused across wells
+TkAgg = startup.lazy("matplotlib.backends.backend_tkagg")   # ChartHost's canvas, preloaded
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SQL — Tab 1: Abandoned Well Inventory (maximum detail)
@@ -150,6 +145,43 @@ WHERE cmf.cmpl_dmn_key = :cmpl_dmn_key
 ORDER BY cmf.eftv_dttm
 """
 
+# Same history for every well in a pull ("Prefetch histories"), keyed by cmpl_dmn_key
+SQL_MONTHLY_PROD_HISTORY_BULK = """
+SELECT
+    cmf.cmpl_dmn_key AS HIST_KEY,
+    cmf.eftv_dttm AS PROD_MONTH,
+    ROUND(cmf.aloc_oil_prod_dly_rte_qty, 1) AS OIL_BOPD,
+    ROUND(cmf.aloc_gros_prod_dly_rte_qty, 1) AS GROSS_BFPD,
+    ROUND(cmf.aloc_wtr_prod_dly_rte_qty, 1) AS WATER_BWPD,
+    ROUND(CASE WHEN NVL(cmf.aloc_gros_prod_dly_rte_qty, 0) > 0
+          THEN cmf.aloc_wtr_prod_dly_rte_qty / cmf.aloc_gros_prod_dly_rte_qty * 100
+          ELSE NULL END, 1) AS WC_PCT,
+    ROUND(cmf.aloc_cnts_stm_inj_dly_rte_qty, 1) AS STM_INJ_BSPD,
+    ROUND(cmf.aloc_wtr_inj_dly_rte_qty, 1) AS WTR_INJ_BWPD,
+    ROUND(cmf.avg_flw_line_temp_qty, 1) AS FLOWLINE_TEMP
+FROM dwrptg.cmpl_mnly_fact cmf
+WHERE cmf.cmpl_dmn_key IN (SELECT TO_NUMBER(column_value) FROM TABLE(:keys))
+ORDER BY cmf.cmpl_dmn_key, cmf.eftv_dttm
+"""
+
+# Same history from the local replica (SQLite) when the well's field is mirrored
+SQL_MONTHLY_PROD_HISTORY_MIRROR = """
+SELECT
+    cmf.eftv_dttm AS PROD_MONTH,
+    ROUND(cmf.aloc_oil_prod_dly_rte_qty, 1) AS OIL_BOPD,
+    ROUND(cmf.aloc_gros_prod_dly_rte_qty, 1) AS GROSS_BFPD,
+    ROUND(cmf.aloc_wtr_prod_dly_rte_qty, 1) AS WATER_BWPD,
+    ROUND(CASE WHEN IFNULL(cmf.aloc_gros_prod_dly_rte_qty, 0) > 0
+          THEN cmf.aloc_wtr_prod_dly_rte_qty / cmf.aloc_gros_prod_dly_rte_qty * 100
+          ELSE NULL END, 1) AS WC_PCT,
+    ROUND(cmf.aloc_cnts_stm_inj_dly_rte_qty, 1) AS STM_INJ_BSPD,
+    ROUND(cmf.aloc_wtr_inj_dly_rte_qty, 1) AS WTR_INJ_BWPD,
+    ROUND(cmf.avg_flw_line_temp_qty, 1) AS FLOWLINE_TEMP
+FROM cmpl_mnly_fact cmf
+WHERE cmf.cmpl_dmn_key = :cmpl_dmn_key
+ORDER BY cmf.eftv_dttm
+"""
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SQL — Well test history for a single well (full life)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -168,6 +200,22 @@ WHERE f.cmpl_fac_id = :cmpl_fac_id
 ORDER BY f.prod_msmt_strt_dttm
 """
 
+SQL_WELL_TEST_HISTORY_BULK = """
+SELECT
+    f.cmpl_fac_id AS HIST_KEY,
+    f.prod_msmt_strt_dttm AS TEST_DATE,
+    f.bopd_qty AS OIL_BOPD,
+    f.gros_wtr_prod_vol_qty AS WTR_BWPD,
+    ROUND(f.bopd_qty * NVL(f.prod_gas_oil_rat_qty, 0) / 1000, 2) AS GAS_MCFD,
+    f.prod_wtr_cut_pct AS WC_PCT,
+    f.test_temp_qty AS TEST_TEMP
+FROM dwrptg.cmpl_prod_tst_fact f
+JOIN dwrptg.cmpl_prod_tst_dmn d ON d.cmpl_prod_tst_dmn_key = f.cmpl_prod_tst_dmn_key
+WHERE f.cmpl_fac_id IN (SELECT TO_NUMBER(column_value) FROM TABLE(:keys))
+  AND d.use_for_aloc_indc = 'Y'
+ORDER BY f.cmpl_fac_id, f.prod_msmt_strt_dttm
+"""
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SQL — Status history for a single well
 # FIXED: opnl_stat_on_indc (not cmpl_stat_type_cde which does not exist)
@@ -185,6 +233,20 @@ WHERE cosf.cmpl_fac_id = :cmpl_fac_id
 ORDER BY cosf.opnl_stat_eftv_dttm
 """
 
+SQL_STATUS_HISTORY_BULK = """
+SELECT
+    cosf.cmpl_fac_id AS HIST_KEY,
+    cosf.opnl_stat_eftv_dttm AS STATUS_START,
+    cosf.opnl_stat_term_dttm AS STATUS_END,
+    cosf.opnl_stat_on_indc AS ON_OFF,
+    cosf.off_rsn_type_cde AS OFF_REASON,
+    cosf.off_rsn_sub_type_cde AS OFF_SUB_REASON,
+    ROUND(NVL(cosf.opnl_stat_term_dttm, SYSDATE) - cosf.opnl_stat_eftv_dttm, 0) AS DURATION_DAYS
+FROM dwrptg.cmpl_opnl_stat_fact cosf
+WHERE cosf.cmpl_fac_id IN (SELECT TO_NUMBER(column_value) FROM TABLE(:keys))
+ORDER BY cosf.cmpl_fac_id, cosf.opnl_stat_eftv_dttm
+"""
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SQL — WRA notes for a single well
 # ─────────────────────────────────────────────────────────────────────────────
@@ -202,21 +264,10 @@ FETCH FIRST 50 ROWS ONLY
 # ─────────────────────────────────────────────────────────────────────────────
 # DB helpers
 # ─────────────────────────────────────────────────────────────────────────────
-def get_connection():
-    try:
-        oracledb.init_oracle_client()
-    except Exception:
-        pass
-    return oracledb.connect(user=DB_USERNAME, password=DB_PASSWORD, dsn=TNS_ALIAS)
+def run_query(sql, params=None, refresh=False):
+    return query_cache.run_query(sql, params, "odw", refresh=refresh)
 
-def run_query(sql, params=None):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(sql, params or {})
-    cols = [d[0] for d in cur.description]
-    rows = cur.fetchall()
-    cur.close(); conn.close()
-    return cols, rows
+CHART_CACHE_SIZE = 50   # wells whose chart data (prod / tests / status) stay in memory
 
 def fmt(val):
     if val is None: return ""
@@ -238,7 +289,6 @@ def fmt(val):
 # Treeview helpers
 # ─────────────────────────────────────────────────────────────────────────────
 def populate_tree(tree, columns, rows, col_widths=None):
-    tree.delete(*tree.get_children())
     dcols = ["#"] + list(columns)
     tree["columns"] = dcols; tree["show"] = "headings"
     tree.heading("#", text="#", anchor="center")
@@ -247,48 +297,27 @@ def populate_tree(tree, columns, rows, col_widths=None):
         tree.heading(c, text=c, anchor="w",
                      command=lambda col=c: _sort_tree(tree, col, False))
         tree.column(c, width=(col_widths or {}).get(c, max(80, len(c)*9)), anchor="w")
-    for i, row in enumerate(rows):
-        tree.insert("", "end", values=[i+1]+[fmt(v) for v in row],
-                    tags=("even" if i%2==0 else "odd",))
-
-def _sort_key(val, reverse):
-    if val == "":
-        return (1, 0, "")
-    stripped = val.replace(",", "")
-    try:
-        return (0, float(stripped), "")
-    except ValueError:
-        pass
-    return (0, 0, val)
+    VirtualTable.attach(tree, formatter=fmt, number_col="#").set_rows(columns, rows)
 
 def _sort_tree(tree, col, rev):
-    data = [(tree.set(k, col), k) for k in tree.get_children("")]
-    data.sort(key=lambda t: _sort_key(t[0], rev), reverse=rev)
-    for i, (_, k) in enumerate(data):
-        tree.move(k, "", i)
-        tree.item(k, tags=("even" if i % 2 == 0 else "odd",))
-        tree.set(k, "#", i + 1)
+    VirtualTable.of(tree).sort(col, rev)
     tree.heading(col, command=lambda: _sort_tree(tree, col, not rev))
 
 def export_tree(tree, title="export"):
-    ch = tree.get_children()
-    if not ch: messagebox.showinfo("No Data","Nothing to export."); return
+    vt = VirtualTable.of(tree)
+    if not vt or not len(vt): messagebox.showinfo("No Data","Nothing to export."); return
     path = filedialog.asksaveasfilename(
-        defaultextension=".csv", filetypes=[("CSV","*.csv")],
+        defaultextension=".csv", filetypes=export.FILETYPES,
         initialfile=f"{title}_{datetime.now():%Y%m%d_%H%M%S}.csv")
     if not path: return
-    cols = [c for c in tree["columns"] if c!="#"]
-    with open(path,"w",newline="",encoding="utf-8") as f:
-        w = csv.writer(f); w.writerow(cols)
-        for c in ch: w.writerow(tree.item(c,"values")[1:])
-    messagebox.showinfo("Saved",f"{len(ch)} rows -> {path}")
+    try: n = vt.export(path)    # typed values, streamed — see common/export.py
+    except Exception as e: messagebox.showerror("Export Error", str(e)); return
+    messagebox.showinfo("Saved",f"{n:,} rows -> {path}")
 
 def _sort_well_tree(tree, col, rev, callback):
-    data = [(tree.set(k, col), k) for k in tree.get_children("")]
-    data.sort(key=lambda t: _sort_key(t[0], rev), reverse=rev)
-    for i, (_, k) in enumerate(data):
-        tree.move(k, "", i)
-        tree.item(k, tags=("even" if i % 2 == 0 else "odd",))
+    lt = ListTable.of(tree)
+    if lt is not None:
+        lt.sort(col, rev)
     tree.heading(col, command=lambda: _sort_well_tree(tree, col, not rev, callback))
 
 
@@ -309,7 +338,15 @@ class App:
 
         self.inv_data = []
         self.chart_wells = []  # (name, fld, purp, matl, fac_id, dmn_key, abandon_dt, cum_mbo)
+        self.chart_by_name = {}      # name -> chart_wells tuple   (built in _pull_bg)
+        self.well_fac_by_name = {}   # name -> well_fac_id from the inventory
+        self._chart_cache = OrderedDict()   # cmpl_fac_id -> (mc, mr, tc, tr, sc, sr), LRU
+        self._chart_fid = None       # well the chart panel is currently showing / loading
+        self.histories = HistoryStore()   # "Prefetch histories": every pulled well's chart data
+        self.prefetch = False
         self.abandon_date_val = None
+        self.refresh = False   # "Force refresh" — bypass the local query cache
+        self.chart = None      # ChartHost, built by _host() on the first draw
 
         self._style()
         self._topbar()
@@ -359,6 +396,14 @@ class App:
                      values=[f"{d:02d}" for d in range(1,32)], state="readonly").pack(side="left",padx=2)
         self.pull_btn = ttk.Button(r, text="  Pull Data  ", style="Accent.TButton", command=self._on_pull)
         self.pull_btn.pack(side="left", padx=(15,0))
+        self.force_refresh = tk.BooleanVar(value=False)
+        ttk.Checkbutton(r, text="Force refresh", variable=self.force_refresh,
+                        command=lambda: setattr(self, "refresh", self.force_refresh.get())
+                        ).pack(side="left", padx=(10,0))
+        self.prefetch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(r, text="Prefetch histories", variable=self.prefetch_var,
+                        command=lambda: setattr(self, "prefetch", self.prefetch_var.get())
+                        ).pack(side="left", padx=(10,0))
 
     def _notebook(self):
         self.nb = ttk.Notebook(self.root)
@@ -472,12 +517,9 @@ class App:
         chart_area.pack(fill="both", expand=True, padx=6, pady=(4,0))
 
         if HAS_MPL:
-            self.fig = Figure(figsize=(10,5), dpi=100, facecolor=self.PANEL)
-            self.canvas = FigureCanvasTkAgg(self.fig, master=chart_area)
-            self.canvas.get_tk_widget().pack(fill="both", expand=True)
             tb_frame = tk.Frame(chart_area, bg=self.PANEL)
-            tb_frame.pack(fill="x")
-            NavigationToolbar2Tk(self.canvas, tb_frame).update()
+            tb_frame.pack(side="bottom", fill="x")
+            self._chart_frames = (chart_area, tb_frame)   # ChartHost goes in on first draw
 
         # -- Notes text area (hidden by default) --
         self.notes_frame = tk.Frame(right, bg=self.PANEL)
@@ -534,7 +576,7 @@ class App:
             p = {"abandon_after_date": self.abandon_date_val}
 
             # Tab 1: Inventory
-            ic, ir = run_query(SQL_ABANDONED_INVENTORY, p)
+            ic, ir = run_query(SQL_ABANDONED_INVENTORY, p, self.refresh)
             # Display columns: first 23 (skip internal IDs at end)
             disp_cols = ic[:23]; disp_rows = [r[:23] for r in ir]
             self.inv_data = ir
@@ -542,14 +584,25 @@ class App:
 
             # Tab 2: Chart well list
             self.root.after(0, self._set_status, "Building chart well list ...")
-            _, cw_rows = run_query(SQL_CHART_WELL_LIST, p)
+            _, cw_rows = run_query(SQL_CHART_WELL_LIST, p, self.refresh)
             # (name, fld, purp, matl, fac_id, dmn_key, abandon_dt, cum_mbo)
             cw = []
             for r in cw_rows:
                 cw.append((r[0] or "", r[1] or "", r[2] or "", r[3] or "",
                            r[4], r[5], r[6], r[7] or 0))
             cw.sort(key=lambda t: (t[1] or "", t[0] or ""))
+
+            # Lookups for the well selector — first match wins, as the scans did
+            by_name, wfids = {}, {}
+            for t in cw:
+                by_name.setdefault(t[0], t)
+            for r in ir:
+                wfids.setdefault(r[0], r[25])   # well_fac_id position in inventory query
             self.chart_wells = cw
+            self.chart_by_name, self.well_fac_by_name = by_name, wfids
+            if self.refresh:
+                self.root.after(0, self._chart_cache.clear)
+                self.histories = HistoryStore()
 
             n_inv = len(ir)
             n_prod = len([r for r in ir if (r[10] or "") == 'PROD'])
@@ -558,13 +611,42 @@ class App:
                             f"Loaded {n_inv} abandoned well(s):  "
                             f"{n_prod} producers, {n_inj} injectors, "
                             f"{n_inv - n_prod - n_inj} other.")
+            if HAS_MPL:   # the chart is next: import matplotlib here, not on the Tk thread
+                startup.preload(TkAgg, mdates, ChartHost)
             self.root.after(0, self._populate_chart_controls)
 
+            if self.prefetch:
+                self._prefetch_bg(cw)
+
         except Exception as e:
             self.root.after(0, self._err, str(e))
         finally:
             self.root.after(0, lambda: self.pull_btn.config(state="normal"))
 
+    def _prefetch_bg(self, cw):
+        """Chart histories for every well in the pull, a few set-based queries."""
+        store = HistoryStore()
+        self.histories = store           # filled as it goes; the chart checks per kind
+        prog = lambda kind, done, n: self.root.after(
+            0, self._set_status, f"Prefetching {kind} histories ... {done}/{n} wells")
+        store.load("monthly", SQL_MONTHLY_PROD_HISTORY_BULK, [t[5] for t in cw],
+                   refresh=self.refresh, progress=prog)
+        store.load("tests", SQL_WELL_TEST_HISTORY_BULK, [t[4] for t in cw if t[2] == "PROD"],
+                   refresh=self.refresh, progress=prog)
+        store.load("status", SQL_STATUS_HISTORY_BULK, [t[4] for t in cw],
+                   refresh=self.refresh, progress=prog)
+        self.root.after(0, self._set_status,
+                        f"Prefetched chart histories for {len(cw)} well(s) — charts draw from memory.")
+
+    def _stored_chart(self, fid, dkey, purp):
+        """(mc, mr, tc, tr, sc, sr) from the prefetched histories, or None."""
+        h = self.histories
+        monthly, status = h.get("monthly", dkey), h.get("status", fid)
+        tests = h.get("tests", fid) if purp == "PROD" else ([], [])
+        if monthly is None or status is None or tests is None:
+            return None
+        return monthly + tests + status
+
     # ── display ──────────────────────────────────────────────────────────────
     def _show_inv(self, cols, rows):
         w = {"CMPL_NME":160, "WELL_API_NBR":110, "OPNL_FLD":100,
@@ -599,17 +681,15 @@ class App:
     def _refresh_well_tree(self):
         fld = self.fld_var.get()
         purp = self.purp_var.get()
-        self.well_tree.delete(*self.well_tree.get_children())
-        count = 0
+        rows = []
         for name, f, p, matl, fid, dkey, adate, cum in self.chart_wells:
             if fld != "All" and f != fld:
                 continue
             if purp != "All" and p != purp:
                 continue
-            cum_str = fmt(cum) if cum and cum > 0 else ""
-            tag = "even" if count % 2 == 0 else "odd"
-            self.well_tree.insert("", "end", values=(name, f, cum_str), tags=(tag,))
-            count += 1
+            rows.append((name, f, cum if cum and cum > 0 else None))
+        ListTable.attach(self.well_tree, formatter=fmt).set_rows(("WELL","FIELD","CUM_OIL"), rows)
+        count = len(rows)
         self.well_count_lbl.config(text=f"{count} well(s)")
         children = self.well_tree.get_children()
         if children:
@@ -618,7 +698,7 @@ class App:
             self._on_well_select()
         else:
             if HAS_MPL:
-                self.fig.clear(); self.canvas.draw()
+                self._host().message("")
             self.chart_lbl.config(text="No wells for selected filters.")
 
     def _get_selected_info(self):
@@ -626,32 +706,32 @@ class App:
         if not sel:
             return None
         vals = self.well_tree.item(sel[0], "values")
-        name = vals[0]
-        for n, f, p, m, fid, dkey, adate, cum in self.chart_wells:
-            if n == name:
-                return (n, f, p, m, fid, dkey, adate, cum)
-        return None
+        return self.chart_by_name.get(vals[0])
 
     def _on_well_select(self, _=None):
         info = self._get_selected_info()
         if not info or not HAS_MPL:
             return
         name, fld, purp, matl, fid, dkey, adate, cum = info
-        self.chart_lbl.config(text=f"Loading {name} ...", fg="#888")
         self.notes_btn.config(state="disabled")
-        # Find well_fac_id from inventory data
-        wfid = None
-        for r in self.inv_data:
-            if r[0] == name:
-                wfid = r[25]  # well_fac_id position in inventory query
-                break
-        self._current_well_fac_id = wfid
+        self._current_well_fac_id = self.well_fac_by_name.get(name)
         self._current_well_name = name
+        self._chart_fid = fid
         # Hide notes if visible
         if self.notes_visible:
             self.notes_frame.pack_forget()
             self.notes_visible = False
             self.notes_btn.config(text="Show WRA Notes")
+        hit = None if self.refresh else self._chart_cache.get(fid)
+        if hit is not None:
+            self._chart_cache.move_to_end(fid)
+            self._draw_timeline(*hit, name, fld, purp, matl, adate)
+            return
+        hit = self._stored_chart(fid, dkey, purp)
+        if hit is not None:
+            self._draw_timeline(*hit, name, fld, purp, matl, adate)
+            return
+        self.chart_lbl.config(text=f"Loading {name} ...", fg="#888")
         threading.Thread(target=self._chart_bg,
                          args=(name, fld, purp, matl, fid, dkey, adate), daemon=True).start()
 
@@ -661,30 +741,59 @@ class App:
     def _chart_bg(self, name, fld, purp, matl, fid, dkey, adate):
         try:
             # Monthly production (full life)
-            mc, mr = run_query(SQL_MONTHLY_PROD_HISTORY, {"cmpl_dmn_key": dkey})
+            if not self.refresh and mirror.has_field(fld):
+                mc, mr = mirror.query(SQL_MONTHLY_PROD_HISTORY_MIRROR, {"cmpl_dmn_key": dkey},
+                                      date_cols=("PROD_MONTH",))
+            else:
+                mc, mr = run_query(SQL_MONTHLY_PROD_HISTORY, {"cmpl_dmn_key": dkey}, self.refresh)
 
             # Well tests (full life) — producers only
             tc, tr = [], []
             if purp == "PROD":
-                tc, tr = run_query(SQL_WELL_TEST_HISTORY, {"cmpl_fac_id": fid})
+                tc, tr = run_query(SQL_WELL_TEST_HISTORY, {"cmpl_fac_id": fid}, self.refresh)
 
             # Status history
-            sc, sr = run_query(SQL_STATUS_HISTORY, {"cmpl_fac_id": fid})
+            sc, sr = run_query(SQL_STATUS_HISTORY, {"cmpl_fac_id": fid}, self.refresh)
 
-            self.root.after(0, self._draw_timeline, mc, mr, tc, tr, sc, sr,
+            self.root.after(0, self._chart_loaded, fid, (mc, mr, tc, tr, sc, sr),
                            name, fld, purp, matl, adate)
         except Exception as e:
             self.root.after(0, self._err, str(e))
 
-    def _draw_timeline(self, mc, mr, tc, tr, sc, sr, name, fld, purp, matl, adate):
-        self.fig.clear()
+    def _chart_loaded(self, fid, data, name, fld, purp, matl, adate):
+        """Main thread: remember the well's chart data, draw it if still selected."""
+        self._chart_cache[fid] = data
+        self._chart_cache.move_to_end(fid)
+        while len(self._chart_cache) > CHART_CACHE_SIZE:
+            self._chart_cache.popitem(last=False)
+        if fid == self._chart_fid:       # skip results for wells already arrowed past
+            self._draw_timeline(*data, name, fld, purp, matl, adate)
+
+    def _timeline_axes_prod(self, fig):
+        # 2 subplots: top = oil/gross/tests, bottom = water cut + flowline temp
+        ax1 = fig.add_subplot(211)
+        ax2 = fig.add_subplot(212, sharex=ax1)
+        ax2b = ax2.twinx()
+        ax1.set_ylabel("Rate (bbl/d)", fontsize=9)
+        ax1.tick_params(labelsize=8); ax1.grid(True, alpha=0.2)
+        ax2.tick_params(labelsize=8); ax2.grid(True, alpha=0.2)
+        ax2b.set_ylabel("Flowline Temp (°F)", fontsize=9, color="#e67e22")
+        ax2b.tick_params(labelsize=8, labelcolor="#e67e22")
+        return ax1, ax2, ax2b
+
+    def _timeline_axes_single(self, fig, ylabel):
+        ax1 = fig.add_subplot(111)
+        ax1.set_ylabel(ylabel, fontsize=9)
+        ax1.tick_params(labelsize=8); ax1.grid(True, alpha=0.2)
+        return [ax1]
 
+    def _draw_timeline(self, mc, mr, tc, tr, sc, sr, name, fld, purp, matl, adate):
         has_prod = len(mr) > 0
         has_tests = len(tr) > 0
 
         if not has_prod and not has_tests:
             self.chart_lbl.config(text=f"{name}: no production or test data.", fg="#c0392b")
-            self.canvas.draw()
+            self._host().message("")
             self.notes_btn.config(state="normal" if self._current_well_fac_id else "disabled")
             return
 
@@ -708,96 +817,74 @@ class App:
         # ── Determine what to plot based on well purpose ──
         is_producer = purp == "PROD"
         is_injector = purp == "INJ"
+        ch = self._host()   # axes + lines are reused; only data, limits, labels change
+        pa_style = dict(color=self.ACCENT, ls="--", lw=1.5, alpha=0.7)
 
         if is_producer:
-            # 2 subplots: top = oil/gross/tests, bottom = water cut + flowline temp
-            ax1 = self.fig.add_subplot(211)
-            ax2 = self.fig.add_subplot(212, sharex=ax1)
+            ax1, ax2, ax2b = ch.begin("prod", self._timeline_axes_prod)
 
             # ── Top panel: Oil, Gross, Well Tests ──
-            lines = []
             if any(v > 0 for v in m_oil):
-                l, = ax1.plot(m_dates, m_oil, "-", color="#27ae60", lw=1.2, alpha=0.8, label="Oil (BOPD)")
-                lines.append(l)
+                ch.line("oil", ax1, m_dates, m_oil, "-", color="#27ae60", lw=1.2, alpha=0.8, label="Oil (BOPD)")
             if any(v > 0 for v in m_gross):
-                l, = ax1.plot(m_dates, m_gross, "-", color="#2980b9", lw=1.0, alpha=0.5, label="Gross (BFPD)")
-                lines.append(l)
+                ch.line("gross", ax1, m_dates, m_gross, "-", color="#2980b9", lw=1.0, alpha=0.5, label="Gross (BFPD)")
             if has_tests and any(v > 0 for v in t_oil):
-                l = ax1.scatter(t_dates, t_oil, marker="o", s=20, color="#e74c3c",
-                               zorder=5, label="Well Test Oil")
-                lines.append(l)
+                ch.scatter("tests", ax1, t_dates, t_oil, marker="o", s=20, color="#e74c3c",
+                           zorder=5, label="Well Test Oil")
 
             # Mark abandon date
             if adate:
-                ax1.axvline(x=adate, color=self.ACCENT, ls="--", lw=1.5, alpha=0.7, label="P&A Date")
-                ax2.axvline(x=adate, color=self.ACCENT, ls="--", lw=1.5, alpha=0.7)
+                ch.vline("pa", ax1, adate, label="P&A Date", **pa_style)
+                ch.vline("pa2", ax2, adate, **pa_style)
 
-            ax1.set_ylabel("Rate (bbl/d)", fontsize=9)
-            ax1.legend(fontsize=7, loc="upper right", framealpha=0.85, ncol=2)
-            ax1.tick_params(labelsize=8); ax1.grid(True, alpha=0.2)
+            ch.legend(ax1, fontsize=7, loc="upper right", framealpha=0.85, ncol=2)
 
             # ── Bottom panel: Water Cut + Flowline Temp ──
             wc_clean = [(d, v) for d, v in zip(m_dates, m_wc) if v is not None and 0 <= v <= 100]
             temp_clean = [(d, v) for d, v in zip(m_dates, m_temp) if v is not None and 80 <= v <= 400]
 
-            lines2 = []
+            ax2.set_ylabel("Water Cut (%)" if wc_clean else "", fontsize=9, color="#8e44ad")
             if wc_clean:
                 wd, wv = zip(*wc_clean)
-                l, = ax2.plot(wd, wv, "-", color="#8e44ad", lw=1.0, alpha=0.7, label="Water Cut %")
-                lines2.append(l)
-                ax2.set_ylabel("Water Cut (%)", fontsize=9, color="#8e44ad")
+                ch.line("wc", ax2, wd, wv, "-", color="#8e44ad", lw=1.0, alpha=0.7, label="Water Cut %")
                 ax2.set_ylim(0, 105)
 
+            ax2b.set_visible(bool(temp_clean))
             if temp_clean:
-                ax2b = ax2.twinx()
                 td, tv = zip(*temp_clean)
-                l, = ax2b.plot(td, tv, "-", color="#e67e22", lw=1.0, alpha=0.7, label="Flowline Temp (°F)")
-                lines2.append(l)
-                ax2b.set_ylabel("Flowline Temp (°F)", fontsize=9, color="#e67e22")
-                ax2b.tick_params(labelsize=8, labelcolor="#e67e22")
+                ch.line("temp", ax2b, td, tv, "-", color="#e67e22", lw=1.0, alpha=0.7, label="Flowline Temp (°F)")
 
-            if lines2:
-                ax2.legend(lines2, [l.get_label() for l in lines2],
-                          fontsize=7, loc="upper right", framealpha=0.85)
-            ax2.tick_params(labelsize=8); ax2.grid(True, alpha=0.2)
+            ch.legend(ax2, [ax2b], fontsize=7, loc="upper right", framealpha=0.85)
 
             all_dates = m_dates + t_dates
             self._fmt_x(ax2, all_dates)
 
         elif is_injector:
             # Single panel: steam + water injection monthly rates
-            ax1 = self.fig.add_subplot(111)
-            lines = []
+            ax1, = ch.begin("inj", lambda fig: self._timeline_axes_single(fig, "Injection Rate (bbl/d)"))
             if matl == "Steam" or any(v > 0 for v in m_stm):
-                l, = ax1.plot(m_dates, m_stm, "-", color="#e67e22", lw=1.2, label="Steam Inj (BSPD)")
-                ax1.fill_between(m_dates, m_stm, alpha=0.1, color="#e67e22")
-                lines.append(l)
+                ch.line("stm", ax1, m_dates, m_stm, "-", color="#e67e22", lw=1.2, label="Steam Inj (BSPD)")
+                ch.fill("stm_fill", ax1, m_dates, m_stm, alpha=0.1, color="#e67e22")
             if matl == "Water" or any(v > 0 for v in m_wtr_inj):
-                l, = ax1.plot(m_dates, m_wtr_inj, "-", color="#2980b9", lw=1.2, label="Water Inj (BWPD)")
-                ax1.fill_between(m_dates, m_wtr_inj, alpha=0.1, color="#2980b9")
-                lines.append(l)
+                ch.line("winj", ax1, m_dates, m_wtr_inj, "-", color="#2980b9", lw=1.2, label="Water Inj (BWPD)")
+                ch.fill("winj_fill", ax1, m_dates, m_wtr_inj, alpha=0.1, color="#2980b9")
 
             if adate:
-                ax1.axvline(x=adate, color=self.ACCENT, ls="--", lw=1.5, alpha=0.7, label="P&A Date")
+                ch.vline("pa", ax1, adate, label="P&A Date", **pa_style)
 
-            ax1.set_ylabel("Injection Rate (bbl/d)", fontsize=9)
-            if lines:
-                ax1.legend(fontsize=8, loc="upper right", framealpha=0.85)
-            ax1.tick_params(labelsize=8); ax1.grid(True, alpha=0.2)
+            ch.legend(ax1, fontsize=8, loc="upper right", framealpha=0.85)
             self._fmt_x(ax1, m_dates)
 
         else:
             # Generic: just oil + gross
-            ax1 = self.fig.add_subplot(111)
+            ax1, = ch.begin("other", lambda fig: self._timeline_axes_single(fig, "Rate (bbl/d)"))
             if any(v > 0 for v in m_oil):
-                ax1.plot(m_dates, m_oil, "-", color="#27ae60", lw=1.2, label="Oil (BOPD)")
+                ch.line("oil", ax1, m_dates, m_oil, "-", color="#27ae60", lw=1.2, label="Oil (BOPD)")
             if any(v > 0 for v in m_gross):
-                ax1.plot(m_dates, m_gross, "-", color="#2980b9", lw=1.0, alpha=0.5, label="Gross (BFPD)")
+                ch.line("gross", ax1, m_dates, m_gross, "-", color="#2980b9", lw=1.0, alpha=0.5, label="Gross (BFPD)")
             if adate:
-                ax1.axvline(x=adate, color=self.ACCENT, ls="--", lw=1.5, alpha=0.7, label="P&A Date")
-            ax1.set_ylabel("Rate (bbl/d)", fontsize=9)
-            ax1.legend(fontsize=8, loc="upper right", framealpha=0.85)
-            ax1.tick_params(labelsize=8); ax1.grid(True, alpha=0.2)
+                ch.vline("pa", ax1, adate, label="P&A Date", **pa_style)
+            ch.legend(ax1, fontsize=8, loc="upper right", framealpha=0.85)
             self._fmt_x(ax1, m_dates)
 
         # ── Title ──
@@ -808,8 +895,7 @@ class App:
             t += f"  |  P&A: {adate:%Y-%m-%d}"
         ax1.set_title(t, fontsize=11, fontweight="bold", pad=10)
 
-        self.fig.tight_layout()
-        self.canvas.draw()
+        ch.finish()
 
         info_parts = [f"{name}"]
         if has_prod: info_parts.append(f"{len(mr)} monthly pts")
@@ -817,6 +903,14 @@ class App:
         self.chart_lbl.config(text=" — ".join(info_parts), fg=self.ACCENT)
         self.notes_btn.config(state="normal" if self._current_well_fac_id else "disabled")
 
+    def _host(self):
+        """The chart host, built on the first draw so matplotlib loads after the window."""
+        if self.chart is None:
+            area, tb = self._chart_frames
+            self.chart = ChartHost(area, figsize=(10,5), facecolor=self.PANEL, toolbar_parent=tb)
+            self.fig = self.chart.fig
+        return self.chart
+
     def _fmt_x(self, ax, dates):
         if not dates: return
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
@@ -826,6 +920,7 @@ class App:
         elif span > 720:  ax.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
         elif span > 360:  ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
         elif span > 120:  ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+        else:             ax.xaxis.set_major_locator(mdates.AutoDateLocator())   # axes are reused
         self.fig.autofmt_xdate(rotation=45)
 
     # ── WRA Notes toggle ─────────────────────────────────────────────────────
@@ -845,7 +940,8 @@ class App:
 
     def _load_notes_bg(self):
         try:
-            _, rows = run_query(SQL_WRA_NOTES, {"well_fac_id": self._current_well_fac_id})
+            _, rows = run_query(SQL_WRA_NOTES, {"well_fac_id": self._current_well_fac_id},
+                                self.refresh)
             self.root.after(0, self._show_notes, rows)
         except Exception as e:
             self.root.after(0, lambda: self.notes_text.delete("1.0", "end"))
@@ -867,8 +963,11 @@ class App:
 
 # ─────────────────────────────────────────────────────────────────────────────
 def main():
+    startup.mark("imports")
     root = tk.Tk()
     App(root)
+    startup.first_paint(root, then=lambda: startup.preload(TkAgg, mdates, ChartHost,
+                                                           background=True))
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import os
+import sys
 import oracledb
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
@@ -7,29 +8,6 @@ import tkinter.font
 import pandas as pd
 
 
-def ensure_oracle_thick_mode():
-    """Initialize oracledb thick mode when available.
-
-    This is required for Oracle password verifier types that are not
-    supported by thin mode, such as the DPY-3015 error shown in the app.
-    """
-    if not oracledb.is_thin_mode():
-        return
-
-    lib_dir = os.getenv("ORACLE_CLIENT_LIB_DIR")
-    try:
-        if lib_dir:
-            oracledb.init_oracle_client(lib_dir=lib_dir)
-        else:
-            oracledb.init_oracle_client()
-    except Exception as exc:
-        raise ConnectionError(
-            "Oracle thick mode could not be initialized. "
-            "Install Oracle Instant Client and set ORACLE_CLIENT_LIB_DIR, "
-            "or ensure ORACLE_HOME/PATH points to the client installation. "
-            f"Original error: {exc}"
-        ) from exc
-
 """
 UI tool: Well Status + Cumulative Snapshot
 
@@ -49,39 +27,9 @@ Uses the same OracleConnectionManager style/credentials as your other tools.
 # ---------------------------
 # Oracle Connection Manager
 # ---------------------------
-class OracleConnectionManager:
-    def __init__(self):
-        self._connections = {
-            "odw": {
-                "user": os.getenv("DB_USER_ODW", "rptguser"),
-                "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
-                "dsn": "odw",
-            },
-            "sandbox": {
-                "user": os.getenv("DB_USER_SANDBOX", "engsb"),
-                "password": os.getenv("DB_PASSWORD_SANDBOX", "Engine33r_SB"),
-                "dsn": "odw",
-            },
-            "openwells": {
-                "user": os.getenv("DB_USER_OW", "gen_user"),
-                "password": os.getenv("DB_PASSWORD_OW", "allusers"),
-                "dsn": "owdb1",
-            },
-        }
-
-    def get_connection(self, name):
-        if name not in self._connections:
-            raise ValueError(f"Unknown DB connection name: {name}")
-        cfg = self._connections[name]
-        ensure_oracle_thick_mode()
-        try:
-            return oracledb.connect(user=cfg["user"], password=cfg["password"], dsn=cfg["dsn"])
-        except oracledb.Error as e:
-            (err,) = e.args
-            raise ConnectionError(f"Failed to connect to Oracle DB '{name}': {err.message}") from e
-
-    def available_connections(self):
-        return list(self._connections.keys())
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import db
+from common.db import OracleConnectionManager   # pooled sessions — python/common/db.py
 
 
 # ---------------------------
@@ -147,9 +95,10 @@ class WellStatusSummaryApp(tk.Tk):
             messagebox.showwarning("Input Error", "Please enter at least one WELL API number.")
             self.clear_table()
             return
-        in_list = ", ".join([f"'{a}'" for a in apis])
+        # Whole list as one collection bind — stable SQL text, no 1000-entry IN limit
+        params = {"apis": db.key_list(apis)}
 
-        sql = f"""
+        sql = """
             -- Last Injection Date
             WITH T1 AS (
                 SELECT cmpl_fac_id, eftv_dttm AS last_inj_dte FROM (
@@ -194,18 +143,18 @@ class WellStatusSummaryApp(tk.Tk):
             LEFT JOIN T2 ON cd.cmpl_fac_id = T2.cmpl_fac_id
             WHERE cd.actv_indc = 'Y'
               AND wd.actv_indc = 'Y'
-              AND wd.well_api_nbr IN ({in_list})
+              AND wd.well_api_nbr IN (SELECT column_value FROM TABLE(:apis))
         """
 
         try:
-            conn = self.conn_manager.get_connection("odw")
-            cur = conn.cursor()
-            cur.execute(sql)
-
-            rows = cur.fetchall() if cur.description else []
-            cols = [c[0] for c in cur.description] if cur.description else []
-            cur.close()
-            conn.close()
+            with self.conn_manager.get_connection("odw") as conn:
+                cur = conn.cursor()
+                try:
+                    cur.execute(sql, db.bind_params(conn, params))
+                    rows = cur.fetchall() if cur.description else []
+                    cols = [c[0] for c in cur.description] if cur.description else []
+                finally:
+                    cur.close()
 
             if not rows:
                 messagebox.showinfo("No Results", "No data returned for the given APIs.")
@@ -13,29 +13,23 @@ Run:            python recent_wells_performance.py
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading, csv, sys
+import threading, sys, os
 from datetime import datetime
 
-# ═══════════════════════════════════════════════════════════════════════════════
-TNS_ALIAS   = "ODW"
-DB_USERNAME = "rptguser"
-DB_PASSWORD = "allusers"
-# ═══════════════════════════════════════════════════════════════════════════════
-
-try:
-    import oracledb
-except ImportError:
-    sys.exit("ERROR: oracledb not installed.  Run:  pip install oracledb")
-
-try:
-    import matplotlib
-    matplotlib.use("TkAgg")
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    HAS_MPL = True
-except ImportError:
-    HAS_MPL = False
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup       # lazy heavy imports + startup timing — see python/common/
+from common import query_cache   # pooled + disk-cached ODW reads — see python/common/
+from common.vtable import ListTable, VirtualTable   # only the visible rows live in Tk
+from common.history_store import HistoryStore   # bulk-prefetched chart histories
+from common import export        # streamed .csv / .xlsx / .parquet exports
+
+# matplotlib loads with the first chart (or in the background once the window
+# is up), not before the window
+HAS_MPL = startup.available("matplotlib")
+mdates = startup.lazy("matplotlib.dates")
+ChartHost = startup.lazy("common.charts", "ChartHost")   # chart figure/axes reused across wells
+TkAgg = startup.lazy("matplotlib.backends.backend_tkagg")   # ChartHost's canvas, preloaded
+downsample = startup.lazy("common.downsample")   # daily series drawn at pixel resolution, refined on zoom
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SQL
@@ -211,21 +205,38 @@ WHERE cdf.cmpl_fac_id = :cmpl_fac_id
 ORDER BY cdf.eftv_dttm
 """
 
+# Same two histories for every chart well in a pull ("Prefetch histories")
+SQL_PROD_WELL_TESTS_BULK = """
+SELECT f.cmpl_fac_id AS HIST_KEY,
+       f.prod_msmt_strt_dttm AS TEST_DATE,
+       f.bopd_qty AS OIL_BOPD,
+       f.gros_wtr_prod_vol_qty AS WTR_BWPD,
+       ROUND(f.bopd_qty * NVL(f.prod_gas_oil_rat_qty,0)/1000, 2) AS GAS_MCFD
+FROM dwrptg.cmpl_prod_tst_fact f
+JOIN dwrptg.cmpl_prod_tst_dmn  d ON d.cmpl_prod_tst_dmn_key = f.cmpl_prod_tst_dmn_key
+WHERE f.cmpl_fac_id IN (SELECT TO_NUMBER(column_value) FROM TABLE(:keys))
+  AND d.use_for_aloc_indc = 'Y'
+  AND f.prod_msmt_strt_dttm >= :spud_date
+ORDER BY f.cmpl_fac_id, f.prod_msmt_strt_dttm
+"""
+
+SQL_INJ_DAILY_BULK = """
+SELECT cdf.cmpl_fac_id AS HIST_KEY,
+       cdf.eftv_dttm AS INJ_DATE,
+       ROUND(cdf.aloc_stm_inj_vol_qty, 1) AS STEAM_BBL,
+       ROUND(cdf.aloc_wtr_inj_vol_qty, 1) AS WATER_BBL
+FROM dwrptg.cmpl_dly_fact cdf
+WHERE cdf.cmpl_fac_id IN (SELECT TO_NUMBER(column_value) FROM TABLE(:keys))
+  AND cdf.eftv_dttm >= :start_date
+ORDER BY cdf.cmpl_fac_id, cdf.eftv_dttm
+"""
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DB helpers
 # ─────────────────────────────────────────────────────────────────────────────
-def get_connection():
-    try: oracledb.init_oracle_client()
-    except: pass
-    return oracledb.connect(user=DB_USERNAME, password=DB_PASSWORD, dsn=TNS_ALIAS)
-
-def run_query(sql, params=None):
-    conn = get_connection(); cur = conn.cursor()
-    cur.execute(sql, params or {})
-    cols = [d[0] for d in cur.description]; rows = cur.fetchall()
-    cur.close(); conn.close()
-    return cols, rows
+def run_query(sql, params=None, refresh=False):
+    return query_cache.run_query(sql, params, "odw", refresh=refresh)
 
 def fmt(val):
     if val is None: return ""
@@ -239,7 +250,6 @@ def fmt(val):
 # Treeview helpers
 # ─────────────────────────────────────────────────────────────────────────────
 def populate_tree(tree, columns, rows, col_widths=None):
-    tree.delete(*tree.get_children())
     dcols = ["#"] + list(columns)
     tree["columns"] = dcols; tree["show"] = "headings"
     tree.heading("#", text="#", anchor="center")
@@ -248,46 +258,27 @@ def populate_tree(tree, columns, rows, col_widths=None):
         tree.heading(c, text=c, anchor="w",
                      command=lambda col=c: _sort_tree(tree, col, False))
         tree.column(c, width=(col_widths or {}).get(c, max(80, len(c)*9)), anchor="w")
-    for i, row in enumerate(rows):
-        tree.insert("", "end", values=[i+1]+[fmt(v) for v in row],
-                    tags=("even" if i%2==0 else "odd",))
-
-def _sort_key(val, reverse):
-    if val == "": return (1, 0, "")
-    stripped = val.replace(",", "")
-    try: return (0, float(stripped), "")
-    except ValueError: pass
-    return (0, 0, val)
+    VirtualTable.attach(tree, formatter=fmt, number_col="#").set_rows(columns, rows)
 
 def _sort_tree(tree, col, rev):
-    data = [(tree.set(k, col), k) for k in tree.get_children("")]
-    data.sort(key=lambda t: _sort_key(t[0], rev), reverse=rev)
-    for i, (_, k) in enumerate(data):
-        tree.move(k, "", i)
-        tree.item(k, tags=("even" if i%2==0 else "odd",))
-        tree.set(k, "#", i+1)
+    VirtualTable.of(tree).sort(col, rev)
     tree.heading(col, command=lambda: _sort_tree(tree, col, not rev))
 
 def _sort_well_tree(tree, col, rev):
-    data = [(tree.set(k, col), k) for k in tree.get_children("")]
-    data.sort(key=lambda t: _sort_key(t[0], rev), reverse=rev)
-    for i, (_, k) in enumerate(data):
-        tree.move(k, "", i)
-        tree.item(k, tags=("even" if i%2==0 else "odd",))
+    lt = ListTable.of(tree)
+    if lt: lt.sort(col, rev)
     tree.heading(col, command=lambda: _sort_well_tree(tree, col, not rev))
 
 def export_tree(tree, title="export"):
-    ch = tree.get_children()
-    if not ch: messagebox.showinfo("No Data","Nothing to export."); return
+    vt = VirtualTable.of(tree)
+    if not vt or not len(vt): messagebox.showinfo("No Data","Nothing to export."); return
     path = filedialog.asksaveasfilename(
-        defaultextension=".csv", filetypes=[("CSV","*.csv")],
+        defaultextension=".csv", filetypes=export.FILETYPES,
         initialfile=f"{title}_{datetime.now():%Y%m%d_%H%M%S}.csv")
     if not path: return
-    cols = [c for c in tree["columns"] if c!="#"]
-    with open(path,"w",newline="",encoding="utf-8") as f:
-        w = csv.writer(f); w.writerow(cols)
-        for c in ch: w.writerow(tree.item(c,"values")[1:])
-    messagebox.showinfo("Saved",f"{len(ch)} rows -> {path}")
+    try: n = vt.export(path)    # typed values, streamed — see common/export.py
+    except Exception as e: messagebox.showerror("Export Error", str(e)); return
+    messagebox.showinfo("Saved",f"{n:,} rows -> {path}")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -329,6 +320,10 @@ class App:
         # chart_wells: list of (name, fld, engr, purp, matl, fac_id, peak_oil)
         self.chart_wells = []
         self.spud_date_val = None
+        self.refresh = False   # "Force refresh" — bypass the local query cache
+        self.histories = HistoryStore()   # "Prefetch histories": every chart well's data
+        self.prefetch = False
+        self.chart = None      # ChartHost, built by _host() on the first draw
 
         self._style(); self._topbar(); self._notebook()
         self._tab1_inventory(); self._tab2_welltests(); self._tab3_chart()
@@ -372,6 +367,14 @@ class App:
                      values=[f"{d:02d}" for d in range(1,32)], state="readonly").pack(side="left",padx=2)
         self.pull_btn = ttk.Button(r, text="  Pull Data  ", style="Accent.TButton", command=self._on_pull)
         self.pull_btn.pack(side="left", padx=(15,0))
+        self.force_refresh = tk.BooleanVar(value=False)
+        ttk.Checkbutton(r, text="Force refresh", variable=self.force_refresh,
+                        command=lambda: setattr(self, "refresh", self.force_refresh.get())
+                        ).pack(side="left", padx=(10,0))
+        self.prefetch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(r, text="Prefetch histories", variable=self.prefetch_var,
+                        command=lambda: setattr(self, "prefetch", self.prefetch_var.get())
+                        ).pack(side="left", padx=(10,0))
 
     def _notebook(self):
         self.nb = ttk.Notebook(self.root)
@@ -493,11 +496,8 @@ class App:
         ca = tk.Frame(right, bg=self.PANEL)
         ca.pack(fill="both", expand=True, padx=6, pady=(4,6))
         if HAS_MPL:
-            self.fig = Figure(figsize=(10,5), dpi=100, facecolor=self.PANEL)
-            self.canvas = FigureCanvasTkAgg(self.fig, master=ca)
-            self.canvas.get_tk_widget().pack(fill="both", expand=True)
-            tb = tk.Frame(ca, bg=self.PANEL); tb.pack(fill="x")
-            NavigationToolbar2Tk(self.canvas, tb).update()
+            tb = tk.Frame(ca, bg=self.PANEL); tb.pack(side="bottom", fill="x")
+            self._chart_frames = (ca, tb)   # ChartHost goes in on first draw
 
     def _make_tree(self, parent):
         tree = ttk.Treeview(parent, selectmode="extended")
@@ -539,20 +539,20 @@ class App:
             p = {"spud_date": self.spud_date_val}
 
             # Inventory
-            ic, ir = run_query(SQL_WELL_INVENTORY, p)
+            ic, ir = run_query(SQL_WELL_INVENTORY, p, self.refresh)
             self.raw_inv_cols = ic; self.raw_inv_rows = ir
 
             # Well Tests
             self.root.after(0, self._set_status, "Querying well tests ...")
-            lc, lr = run_query(SQL_WELL_TESTS_LATEST, p)
-            pc, pr = run_query(SQL_WELL_TESTS_PEAK, p)
+            lc, lr = run_query(SQL_WELL_TESTS_LATEST, p, self.refresh)
+            pc, pr = run_query(SQL_WELL_TESTS_PEAK, p, self.refresh)
             mc, mr = self._merge_tests(lc, lr, pc, pr)
             self.raw_wt_cols = mc; self.raw_wt_rows = mr
 
             # Chart wells
             self.root.after(0, self._set_status, "Finding wells with data ...")
-            _, prod_rows = run_query(SQL_PRODUCERS_WITH_TESTS, p)
-            _, inj_rows  = run_query(SQL_INJECTORS_WITH_DATA, p)
+            _, prod_rows = run_query(SQL_PRODUCERS_WITH_TESTS, p, self.refresh)
+            _, inj_rows  = run_query(SQL_INJECTORS_WITH_DATA, p, self.refresh)
 
             # chart_wells: (name, fld, engr, purp, matl, fac_id, peak_oil)
             cw = []
@@ -567,13 +567,32 @@ class App:
             self.root.after(0, self._set_status,
                             f"Loaded {n} well(s).  Chart: "
                             f"{len(prod_rows)} producers + {len(inj_rows)} injectors with data.")
+            if HAS_MPL:   # the chart is next: import matplotlib here, not on the Tk thread
+                startup.preload(TkAgg, mdates, ChartHost)
             self.root.after(0, self._populate_all_filters)
 
+            # Histories are per spud-date cutoff, so a new pull starts a new store
+            self.histories = HistoryStore()
+            if self.prefetch:
+                self._prefetch_bg(cw)
+
         except Exception as e:
             self.root.after(0, self._err, str(e))
         finally:
             self.root.after(0, lambda: self.pull_btn.config(state="normal"))
 
+    def _prefetch_bg(self, cw):
+        """Chart histories for every chart well, one set-based query per kind."""
+        store = self.histories
+        prog = lambda kind, done, n: self.root.after(
+            0, self._set_status, f"Prefetching {kind} histories ... {done}/{n} wells")
+        store.load("tests", SQL_PROD_WELL_TESTS_BULK, [t[5] for t in cw if t[3] == "PROD"],
+                   {"spud_date": self.spud_date_val}, self.refresh, progress=prog)
+        store.load("injection", SQL_INJ_DAILY_BULK, [t[5] for t in cw if t[3] == "INJ"],
+                   {"start_date": self.spud_date_val}, self.refresh, progress=prog)
+        self.root.after(0, self._set_status,
+                        f"Prefetched chart histories for {len(cw)} well(s) — charts draw from memory.")
+
     def _merge_tests(self, lc, lr, pc, pr):
         pm = {}
         ni = pc.index("WELL_NME"); ndi = pc.index("PEAK_TEST_DATE"); noi = pc.index("PEAK_OIL_BOPD")
@@ -689,16 +708,14 @@ class App:
     def _refresh_well_tree(self):
         fld  = self.ch_fld_var.get()
         engr = self.ch_engr_var.get()
-        self.well_tree.delete(*self.well_tree.get_children())
-        count = 0
+        rows = []
         for name, f, eg, purp, matl, fid, peak in self.chart_wells:
             if fld  != "All" and f  != fld:  continue
             if engr != "All" and eg != engr: continue
             wtype = "PROD" if purp == "PROD" else f"INJ-{matl}" if purp == "INJ" else purp
-            peak_str = fmt(peak) if peak and peak > 0 else ""
-            tag = "even" if count % 2 == 0 else "odd"
-            self.well_tree.insert("", "end", values=(name, wtype, peak_str), tags=(tag,))
-            count += 1
+            rows.append((name, wtype, peak if peak and peak > 0 else None))
+        ListTable.attach(self.well_tree, formatter=fmt).set_rows(("WELL","TYPE","PEAK_OIL"), rows)
+        count = len(rows)
         self.well_count_lbl.config(text=f"{count} well(s)")
         children = self.well_tree.get_children()
         if children:
@@ -706,7 +723,7 @@ class App:
             self.well_tree.focus(children[0])
             self._on_well_select()
         else:
-            if HAS_MPL: self.fig.clear(); self.canvas.draw()
+            if HAS_MPL: self._host().message("")
             self.chart_lbl.config(text="No wells with data for selected filters.")
 
     def _get_selected_info(self):
@@ -725,6 +742,10 @@ class App:
         info = self._get_selected_info()
         if not info or not HAS_MPL: return
         name, fld, purp, matl, fid, pk = info
+        if purp == "PROD" and self.histories.has("tests", fid):
+            self._draw_prod(*self.histories.get("tests", fid), name, fld); return
+        if purp == "INJ" and self.histories.has("injection", fid):
+            self._draw_inj(*self.histories.get("injection", fid), name, fld, matl); return
         self.chart_lbl.config(text=f"Loading {name} ...", fg="#888")
         threading.Thread(target=self._chart_bg,
                          args=(name, fld, purp, matl, fid), daemon=True).start()
@@ -736,83 +757,107 @@ class App:
         try:
             if purp == "PROD":
                 c, r = run_query(SQL_PROD_WELL_TESTS,
-                                 {"cmpl_fac_id": fid, "spud_date": self.spud_date_val})
+                                 {"cmpl_fac_id": fid, "spud_date": self.spud_date_val}, self.refresh)
                 self.root.after(0, self._draw_prod, c, r, name, fld)
             elif purp == "INJ":
                 c, r = run_query(SQL_INJ_DAILY,
-                                 {"cmpl_fac_id": fid, "start_date": self.spud_date_val})
+                                 {"cmpl_fac_id": fid, "start_date": self.spud_date_val}, self.refresh)
                 self.root.after(0, self._draw_inj, c, r, name, fld, matl)
         except Exception as e:
             self.root.after(0, self._err, str(e))
 
+    def _prod_axes(self, fig):
+        ax1 = fig.add_subplot(111); ax2 = ax1.twinx()
+        ax1.set_ylabel("Liquid Rate (bbl/d)", fontsize=9)
+        ax1.tick_params(labelsize=8); ax1.grid(True, alpha=0.25)
+        ax2.set_ylabel("Gas (MCFD)", fontsize=9, color="#e74c3c")
+        ax2.tick_params(labelsize=8, labelcolor="#e74c3c")
+        return [ax1, ax2]
+
+    def _inj_axes(self, fig):
+        ax = fig.add_subplot(111)
+        ax.tick_params(labelsize=8); ax.grid(True, alpha=0.25)
+        return [ax]
+
     def _draw_prod(self, cols, rows, name, fld):
-        self.fig.clear()
         if not rows:
             self.chart_lbl.config(text=f"{name}: no data.", fg="#c0392b")
-            self.canvas.draw(); return
+            self._host().message(""); return
         dates, oil, wtr, gas = [], [], [], []
         for r in rows:
             dates.append(r[0]); oil.append(r[1] or 0); wtr.append(r[2] or 0); gas.append(r[3] or 0)
-        ax1 = self.fig.add_subplot(111); lines = []
+        ch = self._host()   # axes + lines are reused; only data, limits, labels change
+        ax1, ax2 = ch.begin("prod", self._prod_axes)
         if any(v>0 for v in oil):
-            l, = ax1.plot(dates, oil, "o-", color="#27ae60", ms=5, lw=1.5, label="Oil (BOPD)"); lines.append(l)
+            ch.line("oil", ax1, dates, oil, "o-", color="#27ae60", ms=5, lw=1.5, label="Oil (BOPD)")
         if any(v>0 for v in wtr):
-            l, = ax1.plot(dates, wtr, "s-", color="#2980b9", ms=4, lw=1.2, label="Water (BWPD)"); lines.append(l)
-        ax1.set_ylabel("Liquid Rate (bbl/d)", fontsize=9)
-        ax1.tick_params(labelsize=8); ax1.grid(True, alpha=0.25)
-        if any(v>0 for v in gas):
-            ax2 = ax1.twinx()
-            l, = ax2.plot(dates, gas, "x--", color="#e74c3c", ms=4, lw=1.2, label="Gas (MCFD)"); lines.append(l)
-            ax2.set_ylabel("Gas (MCFD)", fontsize=9, color="#e74c3c")
-            ax2.tick_params(labelsize=8, labelcolor="#e74c3c")
-        ax1.legend(lines, [l.get_label() for l in lines], fontsize=8, loc="upper left", framealpha=0.85)
+            ch.line("wtr", ax1, dates, wtr, "s-", color="#2980b9", ms=4, lw=1.2, label="Water (BWPD)")
+        has_gas = any(v>0 for v in gas)
+        ax2.set_visible(has_gas)
+        if has_gas:
+            ch.line("gas", ax2, dates, gas, "x--", color="#e74c3c", ms=4, lw=1.2, label="Gas (MCFD)")
+        ch.legend(ax1, [ax2], fontsize=8, loc="upper left", framealpha=0.85)
         t = f"{name}  —  Allocated Well Tests"
         if fld: t += f"  ({fld})"
         ax1.set_title(t, fontsize=11, fontweight="bold", pad=10)
         self._fmt_x(ax1, dates)
-        self.fig.tight_layout(); self.canvas.draw()
+        ch.finish()
         self.chart_lbl.config(text=f"{name} — {len(rows)} well tests", fg=self.ACCENT)
 
     def _draw_inj(self, cols, rows, name, fld, matl):
-        self.fig.clear()
         if not rows:
             self.chart_lbl.config(text=f"{name}: no injection data.", fg="#c0392b")
-            self.canvas.draw(); return
+            self._host().message(""); return
         dates, stm, wtr = [], [], []
         for r in rows:
             dates.append(r[0]); stm.append(r[1] or 0); wtr.append(r[2] or 0)
-        ax = self.fig.add_subplot(111)
+        ch = self._host()
+        ax, = ch.begin("inj", self._inj_axes)
         if matl == "Steam":
-            ax.plot(dates, stm, color="#e67e22", lw=0.9, alpha=0.85, label="Steam Inj (bbl/d)")
-            ax.fill_between(dates, stm, alpha=0.15, color="#e67e22")
+            l = ch.line("stm_inj", ax, dates, stm, color="#e67e22", lw=0.9, alpha=0.85, label="Steam Inj (bbl/d)")
+            downsample.attach(l, fill=dict(alpha=0.15, color="#e67e22"))
             ax.set_ylabel("Steam Injection (bbl/d)", fontsize=9, color="#e67e22")
         elif matl == "Water":
-            ax.plot(dates, wtr, color="#2980b9", lw=0.9, alpha=0.85, label="Water Inj (bbl/d)")
-            ax.fill_between(dates, wtr, alpha=0.15, color="#2980b9")
+            l = ch.line("wtr_inj", ax, dates, wtr, color="#2980b9", lw=0.9, alpha=0.85, label="Water Inj (bbl/d)")
+            downsample.attach(l, fill=dict(alpha=0.15, color="#2980b9"))
             ax.set_ylabel("Water Injection (bbl/d)", fontsize=9, color="#2980b9")
         else:
-            if any(v>0 for v in stm): ax.plot(dates, stm, color="#e67e22", lw=0.9, label="Steam (bbl/d)")
-            if any(v>0 for v in wtr): ax.plot(dates, wtr, color="#2980b9", lw=0.9, label="Water (bbl/d)")
-            ax.set_ylabel("Injection (bbl/d)", fontsize=9)
-        ax.tick_params(labelsize=8); ax.grid(True, alpha=0.25)
-        ax.legend(fontsize=8, loc="upper left", framealpha=0.85)
+            if any(v>0 for v in stm):
+                downsample.attach(ch.line("stm", ax, dates, stm, color="#e67e22", lw=0.9, label="Steam (bbl/d)"))
+            if any(v>0 for v in wtr):
+                downsample.attach(ch.line("wtr", ax, dates, wtr, color="#2980b9", lw=0.9, label="Water (bbl/d)"))
+            ax.set_ylabel("Injection (bbl/d)", fontsize=9, color="black")
+        ch.legend(ax, fontsize=8, loc="upper left", framealpha=0.85)
         t = f"{name}  —  Daily Measured Injection"
         if fld: t += f"  ({fld})"
         ax.set_title(t, fontsize=11, fontweight="bold", pad=10)
         self._fmt_x(ax, dates)
-        self.fig.tight_layout(); self.canvas.draw()
+        ch.finish()
         self.chart_lbl.config(text=f"{name} — {len(rows):,} daily points", fg=self.ACCENT)
 
+    def _host(self):
+        """The chart host, built on the first draw so matplotlib loads after the window."""
+        if self.chart is None:
+            area, tb = self._chart_frames
+            self.chart = ChartHost(area, figsize=(10,5), facecolor=self.PANEL, toolbar_parent=tb)
+            self.fig = self.chart.fig
+        return self.chart
+
     def _fmt_x(self, ax, dates):
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
         span = (max(dates)-min(dates)).days if len(dates)>1 else 30
         if   span > 720: ax.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
         elif span > 360: ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
         elif span > 120: ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+        else:            ax.xaxis.set_major_locator(mdates.AutoDateLocator())   # axes are reused
         self.fig.autofmt_xdate(rotation=45)
 
 def main():
-    root = tk.Tk(); App(root); root.mainloop()
+    startup.mark("imports")
+    root = tk.Tk(); App(root)
+    startup.first_paint(root, then=lambda: startup.preload(TkAgg, mdates, ChartHost, downsample,
+                                                           background=True))
+    root.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,6 @@
 # file: Last3Tests_ByAPI.py
 import os
+import sys
 import oracledb
 import tkinter as tk
 from tkinter import messagebox
@@ -9,25 +10,6 @@ import pandas as pd
 from datetime import datetime
 
 
-def ensure_oracle_thick_mode():
-    """Initialize python-oracledb thick mode when available."""
-    if not oracledb.is_thin_mode():
-        return
-
-    lib_dir = os.getenv("ORACLE_CLIENT_LIB_DIR")
-    try:
-        if lib_dir:
-            oracledb.init_oracle_client(lib_dir=lib_dir)
-        else:
-            oracledb.init_oracle_client()
-    except Exception as exc:
-        raise ConnectionError(
-            "Oracle thick mode could not be initialized. "
-            "Install Oracle Instant Client and set ORACLE_CLIENT_LIB_DIR, "
-            "or ensure ORACLE_HOME/PATH points to the client installation. "
-            f"Original error: {exc}"
-        ) from exc
-
 APP_TITLE = "Last 3 Well Tests by API Numbers"
 APP_WIDTH = 2400
 APP_HEIGHT = 1480
@@ -35,21 +17,11 @@ APP_HEIGHT = 1480
 # ---------------------------
 # Oracle Connection Manager
 # ---------------------------
-class OracleConnectionManager:
-    def __init__(self):
-        self._connections = {
-            "odw": {
-                "user": os.getenv("DB_USER_ODW", "rptguser"),
-                "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
-                "dsn": os.getenv("DB_DSN_ODW", "odw"),
-            }
-        }
-        self._active = "odw"
-
-    def connect(self):
-        cfg = self._connections[self._active]
-        ensure_oracle_thick_mode()
-        return oracledb.connect(user=cfg["user"], password=cfg["password"], dsn=cfg["dsn"])
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import db
+from common.db import OracleConnectionManager   # pooled sessions — python/common/db.py
+from common import export        # streamed .csv / .xlsx / .parquet exports
+
 
 # ---------------------------
 # Query Builder
@@ -63,8 +35,8 @@ def build_sql_and_binds(api_list, producers_only=True, allocated_only=True):
     if not api_list:
         raise ValueError("No API numbers provided.")
 
-    placeholders = ",".join(f":a{i}" for i in range(len(api_list)))
-    binds = {f"a{i}": api for i, api in enumerate(api_list)}
+    # One collection bind for the whole list: same SQL text for every list, no 1000 limit
+    binds = {"apis": db.key_list(api_list)}
 
     prod_clause = "AND cd.prim_purp_type_cde = 'PROD'" if producers_only else ""
     alloc_clause = "AND wt.use_for_aloc_indc = 1" if allocated_only else ""
@@ -102,7 +74,7 @@ def build_sql_and_binds(api_list, producers_only=True, allocated_only=True):
           {prod_clause}
           AND cd.cmpl_state_type_cde <> 'ABND'
           {alloc_clause}
-          AND wd.well_api_nbr IN ({placeholders})
+          AND wd.well_api_nbr IN (SELECT column_value FROM TABLE(:apis))
           AND wt.strt_dttm IS NOT NULL
     )
     SELECT
@@ -220,7 +192,7 @@ class App(tb.Window):
 
             with self.conn_mgr.connect() as conn:
                 cur = conn.cursor()
-                cur.execute(sql, binds)
+                cur.execute(sql, db.bind_params(conn, binds))
                 cols = [d[0].lower() for d in cur.description]
                 rows = cur.fetchall()
 
@@ -284,7 +256,7 @@ class App(tb.Window):
             return
         try:
             fname = f"last3_welltests_by_api_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            self.df_results.to_csv(fname, index=False)
+            export.write(fname, *export.frame_source(self.df_results))   # typed, in slices
             messagebox.showinfo("Exported", f"Saved: {fname}")
         except Exception as e:
             messagebox.showerror("Error", f"Export failed: {e}")
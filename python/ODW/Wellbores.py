@@ -1,4 +1,5 @@
 import os
+import sys
 import oracledb
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
@@ -8,29 +9,6 @@ import pandas as pd
 from datetime import datetime
 
 
-def ensure_oracle_thick_mode():
-    """Initialize python-oracledb thick mode when available.
-
-    Some Oracle password verifier types are only supported in thick mode.
-    This helper tries to switch from thin mode to thick mode before connect.
-    """
-    if not oracledb.is_thin_mode():
-        return
-
-    oracle_client_lib_dir = os.getenv("ORACLE_CLIENT_LIB_DIR")
-    try:
-        if oracle_client_lib_dir:
-            oracledb.init_oracle_client(lib_dir=oracle_client_lib_dir)
-        else:
-            oracledb.init_oracle_client()
-    except Exception as exc:
-        raise ConnectionError(
-            "Oracle thick mode could not be initialized. "
-            "Install Oracle Instant Client and set ORACLE_CLIENT_LIB_DIR, "
-            "or ensure ORACLE_HOME/PATH points to the client installation. "
-            f"Original error: {exc}"
-        ) from exc
-
 """
 Small UI app to query WELLBORE info for a list of WELL API numbers.
 
@@ -43,44 +21,9 @@ Small UI app to query WELLBORE info for a list of WELL API numbers.
 # ---------------------------
 # Oracle Connection Manager
 # ---------------------------
-class OracleConnectionManager:
-    def __init__(self):
-        # Environment variables can override these defaults
-        self._connections = {
-            "odw": {
-                "user": os.getenv("DB_USER_ODW", "rptguser"),
-                "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
-                "dsn": "odw",
-            },
-            "sandbox": {
-                "user": os.getenv("DB_USER_SANDBOX", "engsb"),
-                "password": os.getenv("DB_PASSWORD_SANDBOX", "Engine33r_SB"),
-                "dsn": "odw",
-            },
-            "openwells": {
-                "user": os.getenv("DB_USER_OW", "gen_user"),
-                "password": os.getenv("DB_PASSWORD_OW", "allusers"),
-                "dsn": "owdb1",
-            },
-        }
-
-    def get_connection(self, name):
-        if name not in self._connections:
-            raise ValueError(f"Unknown DB connection name: {name}")
-        config = self._connections[name]
-        ensure_oracle_thick_mode()
-        try:
-            return oracledb.connect(
-                user=config["user"], password=config["password"], dsn=config["dsn"]
-            )
-        except oracledb.Error as e:
-            error_obj, = e.args
-            raise ConnectionError(
-                f"Failed to connect to Oracle DB '{name}': {error_obj.message}"
-            ) from e
-
-    def available_connections(self):
-        return list(self._connections.keys())
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import db
+from common.db import OracleConnectionManager   # pooled sessions — python/common/db.py
 
 
 # ---------------------------
@@ -168,13 +111,11 @@ class WellCompletionApp(tk.Tk):
             self.clear_table()
             return
 
-        # Bind list for IN (:api0, :api1, ...)
-        bind_names = [f"api{i}" for i in range(len(apis))]
-        placeholders = ", ".join([f":{b}" for b in bind_names])
-        params = {b: v for b, v in zip(bind_names, apis)}
+        # Whole list as one collection bind — stable SQL text, no 1000-entry IN limit
+        params = {"apis": db.key_list(apis)}
 
         # --- Wellbore-by-API query (bind-safe) ---
-        sql = f"""
+        sql = """
             SELECT
                 wd.well_nme            AS WELL_NME,
                 wd.well_api_nbr        AS WELL_API_NBR,
@@ -190,18 +131,18 @@ class WellCompletionApp(tk.Tk):
             JOIN wlbr_dmn wbd
               ON wd.well_fac_id = wbd.well_fac_id
             WHERE wd.actv_indc = 'Y'
-              AND wd.well_api_nbr IN ({placeholders})
+              AND wd.well_api_nbr IN (SELECT column_value FROM TABLE(:apis))
         """
 
         try:
-            conn = self.conn_manager.get_connection("odw")
-            cur = conn.cursor()
-            cur.execute(sql, params)
-
-            rows = cur.fetchall() if cur.description else []
-            cols = [c[0] for c in cur.description] if cur.description else []
-            cur.close()
-            conn.close()
+            with self.conn_manager.get_connection("odw") as conn:
+                cur = conn.cursor()
+                try:
+                    cur.execute(sql, db.bind_params(conn, params))
+                    rows = cur.fetchall() if cur.description else []
+                    cols = [c[0] for c in cur.description] if cur.description else []
+                finally:
+                    cur.close()
 
             if not rows:
                 messagebox.showinfo("No Results", "No data returned for the given APIs.")
@@ -11,39 +11,46 @@ Select a field from a dropdown and get:
   Tab 6: Monthly Field Trend (12-month stacked chart)
 
 Connects to CRC Oracle Data Warehouse (ODW) via oracledb.
+
+Tabs 1, 2, 5 and 6 come from ONE snapshot fetch of the field's monthly
+completion rows, reduced locally (common/field_snapshot.py); only the
+down-well and idle-well lists are separate queries.
+
+A background warmer prefetches every field's snapshot (most-used first) at
+startup and then hourly, so switching fields renders from the local cache.
+Set RE_TOOLS_WARM=0 to turn it off; RE_TOOLS_WARM_TOP_N limits it to the N
+most-used fields.
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup       # lazy heavy imports + startup timing — see python/common/
+
 # ---------------------------------------------------------------------------
 # Oracle connection
 # ---------------------------------------------------------------------------
-try:
-    import oracledb
-    try:
-        oracledb.init_oracle_client()
-    except Exception:
-        pass
-except ImportError:
+if not startup.available("oracledb"):
     messagebox.showerror("Missing Package", "oracledb is required.\npip install oracledb")
     raise SystemExit
 
-try:
-    import matplotlib
-    matplotlib.use("TkAgg")
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    HAS_MPL = True
-except ImportError:
-    HAS_MPL = False
+# matplotlib loads on the first chart, not before the window
+HAS_MPL = startup.available("matplotlib")
+FigureCanvasTkAgg = startup.lazy("matplotlib.backends.backend_tkagg", "FigureCanvasTkAgg")
+NavigationToolbar2Tk = startup.lazy("matplotlib.backends.backend_tkagg", "NavigationToolbar2Tk")
+Figure = startup.lazy("matplotlib.figure", "Figure")
+mdates = startup.lazy("matplotlib.dates")
 
-DB_USER = "rptguser"
-DB_PASS = "allusers"
-DB_DSN = "ODW"
+from common import query_cache   # pooled + disk-cached ODW reads — see python/common/
+# one-fetch KPIs / top-bottom / strategy / trend (pandas) — loaded on first use
+field_snapshot = startup.lazy("common.field_snapshot")
+
+WARM_ON_START = os.getenv("RE_TOOLS_WARM", "1") != "0"
 
 FIELDS = [
     "San Ardo",
@@ -56,98 +63,10 @@ FIELDS = [
 ]
 
 
-def get_connection():
-    return oracledb.connect(user=DB_USER, password=DB_PASS, dsn=DB_DSN)
-
-
 # ============================================================================
 # SQL QUERIES
 # ============================================================================
 
-# Latest-month field summary — producers
-SQL_FIELD_SUMMARY_PROD = """
-SELECT
-    COUNT(DISTINCT cd.cmpl_fac_id) AS active_producers,
-    ROUND(SUM(cmf.aloc_oil_prod_dly_rte_qty), 0) AS total_oil_bopd,
-    ROUND(SUM(cmf.aloc_gros_prod_dly_rte_qty), 0) AS total_gross_bfpd,
-    ROUND(SUM(cmf.aloc_wtr_prod_dly_rte_qty), 0) AS total_water_bwpd,
-    ROUND(
-        SUM(cmf.aloc_wtr_prod_dly_rte_qty) /
-        NULLIF(SUM(cmf.aloc_gros_prod_dly_rte_qty), 0) * 100, 1
-    ) AS field_wc_pct,
-    MAX(cmf.eftv_dttm) AS data_month
-FROM dwrptg.cmpl_dmn cd
-JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
-WHERE cd.opnl_fld = :field_name
-  AND cd.actv_indc = 'Y'
-  AND cd.prim_purp_type_cde = 'PROD'
-  AND cmf.eftv_dttm = (
-      SELECT MAX(cmf2.eftv_dttm)
-      FROM dwrptg.cmpl_mnly_fact cmf2
-      JOIN dwrptg.cmpl_dmn cd2 ON cd2.cmpl_dmn_key = cmf2.cmpl_dmn_key
-      WHERE cd2.opnl_fld = :field_name
-        AND cd2.actv_indc = 'Y'
-        AND cd2.prim_purp_type_cde = 'PROD'
-        AND cmf2.aloc_oil_prod_dly_rte_qty > 0
-  )
-"""
-
-# Latest-month field summary — injectors
-SQL_FIELD_SUMMARY_INJ = """
-SELECT
-    COUNT(DISTINCT cd.cmpl_fac_id) AS active_injectors,
-    ROUND(SUM(cmf.aloc_cnts_stm_inj_dly_rte_qty), 0) AS total_steam_bspd,
-    ROUND(SUM(cmf.aloc_wtr_inj_dly_rte_qty), 0) AS total_water_inj_bwpd
-FROM dwrptg.cmpl_dmn cd
-JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
-WHERE cd.opnl_fld = :field_name
-  AND cd.actv_indc = 'Y'
-  AND cd.prim_purp_type_cde = 'INJ'
-  AND cmf.eftv_dttm = (
-      SELECT MAX(cmf2.eftv_dttm)
-      FROM dwrptg.cmpl_mnly_fact cmf2
-      JOIN dwrptg.cmpl_dmn cd2 ON cd2.cmpl_dmn_key = cmf2.cmpl_dmn_key
-      WHERE cd2.opnl_fld = :field_name
-        AND cd2.actv_indc = 'Y'
-        AND cd2.prim_purp_type_cde = 'INJ'
-  )
-"""
-
-# Top 15 + Bottom 15 producers (latest month with production)
-SQL_TOP_BOTTOM = """
-WITH ranked AS (
-    SELECT
-        cd.cmpl_nme,
-        cd.engr_strg_nme,
-        ROUND(cmf.aloc_oil_prod_dly_rte_qty, 1) AS oil_bopd,
-        ROUND(cmf.aloc_gros_prod_dly_rte_qty, 1) AS gross_bfpd,
-        ROUND(CASE WHEN NVL(cmf.aloc_gros_prod_dly_rte_qty, 0) > 0
-              THEN cmf.aloc_wtr_prod_dly_rte_qty / cmf.aloc_gros_prod_dly_rte_qty * 100
-              ELSE NULL END, 1) AS wc_pct,
-        ROW_NUMBER() OVER (ORDER BY cmf.aloc_oil_prod_dly_rte_qty DESC) AS rank_top,
-        ROW_NUMBER() OVER (ORDER BY cmf.aloc_oil_prod_dly_rte_qty ASC) AS rank_bot
-    FROM dwrptg.cmpl_dmn cd
-    JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
-    WHERE cd.opnl_fld = :field_name
-      AND cd.actv_indc = 'Y'
-      AND cd.prim_purp_type_cde = 'PROD'
-      AND cmf.aloc_oil_prod_dly_rte_qty > 0
-      AND cmf.eftv_dttm = (
-          SELECT MAX(cmf2.eftv_dttm)
-          FROM dwrptg.cmpl_mnly_fact cmf2
-          JOIN dwrptg.cmpl_dmn cd2 ON cd2.cmpl_dmn_key = cmf2.cmpl_dmn_key
-          WHERE cd2.opnl_fld = :field_name
-            AND cd2.actv_indc = 'Y'
-            AND cd2.prim_purp_type_cde = 'PROD'
-            AND cmf2.aloc_oil_prod_dly_rte_qty > 0
-      )
-)
-SELECT cmpl_nme, engr_strg_nme, oil_bopd, gross_bfpd, wc_pct, rank_top, rank_bot
-FROM ranked
-WHERE rank_top <= 15 OR rank_bot <= 15
-ORDER BY oil_bopd DESC
-"""
-
 # Wells currently down by reason
 SQL_WELLS_DOWN = """
 SELECT
@@ -187,79 +106,6 @@ HAVING MAX(cmf.eftv_dttm) < ADD_MONTHS(TRUNC(SYSDATE, 'MM'), -6)
 ORDER BY months_idle DESC NULLS FIRST
 """
 
-# Engineering strategy breakdown (latest month)
-SQL_ENGR_STRATEGY = """
-SELECT
-    cd.engr_strg_nme,
-    COUNT(DISTINCT CASE WHEN cd.prim_purp_type_cde = 'PROD' THEN cd.cmpl_fac_id END) AS producers,
-    COUNT(DISTINCT CASE WHEN cd.prim_purp_type_cde = 'INJ' THEN cd.cmpl_fac_id END) AS injectors,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-              THEN cmf.aloc_oil_prod_dly_rte_qty ELSE 0 END), 0) AS oil_bopd,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-              THEN cmf.aloc_gros_prod_dly_rte_qty ELSE 0 END), 0) AS gross_bfpd,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'INJ'
-              THEN cmf.aloc_cnts_stm_inj_dly_rte_qty ELSE 0 END), 0) AS steam_bspd,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'INJ'
-              THEN cmf.aloc_wtr_inj_dly_rte_qty ELSE 0 END), 0) AS water_inj_bwpd,
-    ROUND(
-        SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-            THEN cmf.aloc_wtr_prod_dly_rte_qty ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-            THEN cmf.aloc_gros_prod_dly_rte_qty ELSE 0 END), 0) * 100, 1
-    ) AS wc_pct,
-    ROUND(
-        SUM(CASE WHEN cd.prim_purp_type_cde = 'INJ'
-            THEN cmf.aloc_cnts_stm_inj_dly_rte_qty ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-            THEN cmf.aloc_oil_prod_dly_rte_qty ELSE 0 END), 0), 1
-    ) AS instantaneous_sor
-FROM dwrptg.cmpl_dmn cd
-JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
-WHERE cd.opnl_fld = :field_name
-  AND cd.actv_indc = 'Y'
-  AND cd.prim_purp_type_cde IN ('PROD', 'INJ')
-  AND cmf.eftv_dttm = (
-      SELECT MAX(cmf2.eftv_dttm)
-      FROM dwrptg.cmpl_mnly_fact cmf2
-      JOIN dwrptg.cmpl_dmn cd2 ON cd2.cmpl_dmn_key = cmf2.cmpl_dmn_key
-      WHERE cd2.opnl_fld = :field_name AND cd2.actv_indc = 'Y'
-  )
-GROUP BY cd.engr_strg_nme
-ORDER BY oil_bopd DESC
-"""
-
-# Monthly field trend (12 months)
-SQL_MONTHLY_TREND = """
-SELECT
-    cmf.eftv_dttm AS month,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-              THEN cmf.aloc_oil_prod_dly_rte_qty ELSE 0 END), 0) AS oil_bopd,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-              THEN cmf.aloc_gros_prod_dly_rte_qty ELSE 0 END), 0) AS gross_bfpd,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'INJ'
-              THEN cmf.aloc_cnts_stm_inj_dly_rte_qty ELSE 0 END), 0) AS steam_bspd,
-    ROUND(SUM(CASE WHEN cd.prim_purp_type_cde = 'INJ'
-              THEN cmf.aloc_wtr_inj_dly_rte_qty ELSE 0 END), 0) AS water_inj_bwpd,
-    ROUND(
-        SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-            THEN cmf.aloc_wtr_prod_dly_rte_qty ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN cd.prim_purp_type_cde = 'PROD'
-            THEN cmf.aloc_gros_prod_dly_rte_qty ELSE 0 END), 0) * 100, 1
-    ) AS wc_pct,
-    COUNT(DISTINCT CASE WHEN cd.prim_purp_type_cde = 'PROD'
-          AND cmf.aloc_oil_prod_dly_rte_qty > 0 THEN cd.cmpl_fac_id END) AS active_producers,
-    COUNT(DISTINCT CASE WHEN cd.prim_purp_type_cde = 'INJ'
-          AND cmf.aloc_cnts_stm_inj_dly_rte_qty > 0 THEN cd.cmpl_fac_id END) AS active_injectors
-FROM dwrptg.cmpl_dmn cd
-JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
-WHERE cd.opnl_fld = :field_name
-  AND cd.actv_indc = 'Y'
-  AND cd.prim_purp_type_cde IN ('PROD', 'INJ')
-  AND cmf.eftv_dttm >= ADD_MONTHS(TRUNC(SYSDATE, 'MM'), -12)
-GROUP BY cmf.eftv_dttm
-ORDER BY cmf.eftv_dttm
-"""
-
 
 # ============================================================================
 # APPLICATION
@@ -274,6 +120,30 @@ class FieldQuicklookApp:
 
         self._build_ui()
 
+        self._warmer = None
+
+    def start_background(self):
+        """Once the window is up: import field_snapshot (pandas / numpy) and
+        matplotlib off the Tk thread, then start the background prefetch of
+        every field (snapshot + down/idle lists)."""
+        if HAS_MPL:
+            startup.preload(Figure, FigureCanvasTkAgg, mdates, background=True)
+        if not WARM_ON_START:
+            startup.preload(field_snapshot, background=True)
+            return
+
+        def start():
+            self._warmer = field_snapshot.Warmer(
+                FIELDS, extra_sql=(SQL_WELLS_DOWN, SQL_IDLE_WELLS),
+                progress=lambda f, i, n: self.root.after(
+                    0, lambda: self.warm_var.set(f"Prefetching {f} ({i}/{n})...")),
+                done=lambda failed: self.root.after(
+                    0, lambda: self.warm_var.set(
+                        f"Prefetch done — {len(failed)} field(s) failed" if failed
+                        else "All fields prefetched")))
+            self._warmer.start()
+        threading.Thread(target=start, daemon=True).start()
+
     def _build_ui(self):
         # Top bar
         top = ttk.Frame(self.root, padding=5)
@@ -286,13 +156,24 @@ class FieldQuicklookApp:
                                          font=("Consolas", 11))
         self.field_combo.pack(side=tk.LEFT, padx=(0, 5))
         self.field_combo.current(0)
+        self.field_combo.bind("<<ComboboxSelected>>", lambda e: self._on_load())
 
         self.load_btn = ttk.Button(top, text="Load", command=self._on_load)
-        self.load_btn.pack(side=tk.LEFT, padx=(0, 15))
+        self.load_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+        self.refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Force refresh", variable=self.refresh_var).pack(
+            side=tk.LEFT, padx=(0, 15))
 
         self.status_var = tk.StringVar(value="Select a field and click Load")
         ttk.Label(top, textvariable=self.status_var, foreground="gray").pack(side=tk.LEFT)
 
+        self.warm_var = tk.StringVar(value="")
+        ttk.Label(top, textvariable=self.warm_var, foreground="gray").pack(side=tk.RIGHT)
+        self.asof_var = tk.StringVar(value="")
+        ttk.Label(top, textvariable=self.asof_var, foreground="#2980B9").pack(
+            side=tk.RIGHT, padx=(0, 15))
+
         # Notebook
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -322,50 +203,35 @@ class FieldQuicklookApp:
         if not field:
             messagebox.showwarning("Input", "Select a field.")
             return
+        if str(self.load_btn["state"]) == tk.DISABLED:
+            return      # a load is already running
         self.load_btn.config(state=tk.DISABLED)
         self.status_var.set(f"Loading {field}...")
-        threading.Thread(target=self._load_all, args=(field,), daemon=True).start()
+        threading.Thread(target=self._load_all, args=(field, self.refresh_var.get()),
+                         daemon=True).start()
 
-    def _load_all(self, field):
+    def _load_all(self, field, refresh=False):
         try:
-            conn = get_connection()
-            cur = conn.cursor()
             params = {"field_name": field}
 
-            cur.execute(SQL_FIELD_SUMMARY_PROD, params)
-            row_prod = cur.fetchone()
-            cols_prod = [d[0] for d in cur.description]
-
-            cur.execute(SQL_FIELD_SUMMARY_INJ, params)
-            row_inj = cur.fetchone()
-            cols_inj = [d[0] for d in cur.description]
-
-            cur.execute(SQL_TOP_BOTTOM, params)
-            cols_tb = [d[0] for d in cur.description]
-            rows_tb = cur.fetchall()
-
-            cur.execute(SQL_WELLS_DOWN, params)
-            cols_dn = [d[0] for d in cur.description]
-            rows_dn = cur.fetchall()
-
-            cur.execute(SQL_IDLE_WELLS, params)
-            cols_idle = [d[0] for d in cur.description]
-            rows_idle = cur.fetchall()
-
-            cur.execute(SQL_ENGR_STRATEGY, params)
-            cols_engr = [d[0] for d in cur.description]
-            rows_engr = cur.fetchall()
+            def q(sql):
+                # (cols, rows) from the local cache, or ODW on a miss / refresh
+                return query_cache.run_query(sql, params, "odw", refresh=refresh)
 
-            cur.execute(SQL_MONTHLY_TREND, params)
-            cols_trend = [d[0] for d in cur.description]
-            rows_trend = cur.fetchall()
+            # KPIs, top/bottom, strategy and trend — one fetch, reduced locally
+            snap = field_snapshot.load(field, refresh)
+            field_snapshot.record_use(field)
+            cols_tb, rows_tb = snap["top_bottom"]
+            cols_engr, rows_engr = snap["engr"]
+            cols_trend, rows_trend = snap["trend"]
 
-            conn.close()
+            cols_dn, rows_dn = q(SQL_WELLS_DOWN)
+            cols_idle, rows_idle = q(SQL_IDLE_WELLS)
 
             self.root.after(0, lambda: self._populate_all(
-                field,
-                dict(zip(cols_prod, row_prod)) if row_prod else {},
-                dict(zip(cols_inj, row_inj)) if row_inj else {},
+                field, snap,
+                snap["prod_kpi"],
+                snap["inj_kpi"],
                 cols_tb, rows_tb,
                 cols_dn, rows_dn,
                 cols_idle, rows_idle,
@@ -381,7 +247,7 @@ class FieldQuicklookApp:
         self.load_btn.config(state=tk.NORMAL)
         messagebox.showerror("Database Error", msg)
 
-    def _populate_all(self, field, prod_kpi, inj_kpi,
+    def _populate_all(self, field, snap, prod_kpi, inj_kpi,
                       cols_tb, rows_tb,
                       cols_dn, rows_dn,
                       cols_idle, rows_idle,
@@ -392,6 +258,10 @@ class FieldQuicklookApp:
         if isinstance(data_month, datetime):
             data_month = data_month.strftime("%b %Y")
         self.status_var.set(f"{field}  —  Data month: {data_month}")
+        built = snap.get("built_at")
+        if data_month:
+            self.asof_var.set(f"Data as of {data_month}"
+                              + (f"  (snapshot {built:%b %d %H:%M})" if built else ""))
         self.load_btn.config(state=tk.NORMAL)
 
         self._populate_kpi(field, prod_kpi, inj_kpi)
@@ -706,6 +576,8 @@ class FieldQuicklookApp:
 # MAIN
 # ============================================================================
 if __name__ == "__main__":
+    startup.mark("imports")
     root = tk.Tk()
     app = FieldQuicklookApp(root)
+    startup.first_paint(root, then=app.start_background)
     root.mainloop()
\ No newline at end of file
@@ -16,41 +16,41 @@ Performance notes (v2):
   - Well is resolved ONCE via cmpl_dmn; all subsequent queries use
     numeric IDs (cmpl_fac_id, well_fac_id, cmpl_dmn_key, wlbr_fac_id)
     which hit indexed columns directly — no cmpl_dmn re-scan.
-  - Connection is opened once and reused across lookups.
+  - Sessions come from the shared pool (common/db.py); results are cached
+    locally (common/query_cache.py).
+  - Once the IDs are known the tab queries run in parallel (QUERY_WORKERS
+    pooled sessions); each tab fills in as soon as its own data arrives and
+    the bottom bar shows how long every query took.
   - WRA notes limited to last 5 years + 200-row cap.
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup       # lazy heavy imports + startup timing — see python/common/
+
 # ---------------------------------------------------------------------------
 # Oracle connection
 # ---------------------------------------------------------------------------
-try:
-    import oracledb
-    try:
-        oracledb.init_oracle_client()
-    except Exception:
-        pass  # thin mode fallback
-except ImportError:
+if not startup.available("oracledb"):
     messagebox.showerror("Missing Package", "oracledb is required.\npip install oracledb")
     raise SystemExit
 
-try:
-    import matplotlib
-    matplotlib.use("TkAgg")
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    HAS_MPL = True
-except ImportError:
-    HAS_MPL = False
+# matplotlib loads on the first chart, not before the window
+HAS_MPL = startup.available("matplotlib")
+FigureCanvasTkAgg = startup.lazy("matplotlib.backends.backend_tkagg", "FigureCanvasTkAgg")
+NavigationToolbar2Tk = startup.lazy("matplotlib.backends.backend_tkagg", "NavigationToolbar2Tk")
+Figure = startup.lazy("matplotlib.figure", "Figure")
+mdates = startup.lazy("matplotlib.dates")
 
-DB_USER = "rptguser"
-DB_PASS = "allusers"
-DB_DSN = "ODW"
+from common import query_cache   # pooled + disk-cached ODW reads — see python/common/
 
 
 # ============================================================================
@@ -261,6 +261,20 @@ WHERE wo.PID = :cmpl_fac_id
 ORDER BY wo.STARTDATE DESC
 """
 
+# ---------- Tab -> queries it needs: (label, sql, id bind) ---------------
+# All of these run at the same time once Step 0 has resolved the IDs.
+QUERY_WORKERS = 4
+
+TAB_QUERIES = {
+    "mech":   (("Casing/Tubing", SQL_CASING_TUBING, "wlbr_fac_id"),
+               ("Perforations", SQL_PERFORATIONS, "wlbr_fac_id")),
+    "status": (("Status", SQL_CURRENT_STATUS, "cmpl_fac_id"),
+               ("Well Tests", SQL_LATEST_WELL_TEST, "cmpl_fac_id")),
+    "wra":    (("WRA Notes", SQL_WRA_NOTES, "well_fac_id"),),
+    "prod":   (("Monthly Prod", SQL_MONTHLY_PROD, "cmpl_dmn_key"),),
+    "wo":     (("Workovers", SQL_WORKOVERS, "cmpl_fac_id"),),
+}
+
 
 # ============================================================================
 # APPLICATION
@@ -273,27 +287,19 @@ class WellPassportApp:
         self.root.geometry("1200x800")
         self.root.minsize(1000, 600)
 
-        self._conn = None       # persistent connection
         self._well_data = {}    # cache for completion data
+        self._well_name = ""
 
-        self._build_ui()
-
-    # ---- CONNECTION --------------------------------------------------------
+        # Parallel tab loading — per-lookup state lives on the Tk thread
+        self._executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS,
+                                            thread_name_prefix="passport")
+        self._lookup_gen = 0
+        self._results = {}      # tab -> {label: (cols, rows)}
+        self._timings = []      # (label, seconds) in arrival order
+        self._errors = []
+        self._t_start = 0.0
 
-    def _get_conn(self):
-        """Return a persistent connection, reopening if stale."""
-        if self._conn is not None:
-            try:
-                self._conn.ping()
-                return self._conn
-            except Exception:
-                try:
-                    self._conn.close()
-                except Exception:
-                    pass
-                self._conn = None
-        self._conn = oracledb.connect(user=DB_USER, password=DB_PASS, dsn=DB_DSN)
-        return self._conn
+        self._build_ui()
 
     # ---- UI BUILD ----------------------------------------------------------
 
@@ -316,13 +322,22 @@ class WellPassportApp:
         self.api_entry.bind("<Return>", lambda e: self._on_lookup())
 
         self.lookup_btn = ttk.Button(top, text="Lookup", command=self._on_lookup)
-        self.lookup_btn.pack(side=tk.LEFT, padx=(0, 15))
+        self.lookup_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+        self.refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Force refresh", variable=self.refresh_var).pack(
+            side=tk.LEFT, padx=(0, 15))
 
         self.status_var = tk.StringVar(
             value="Enter a completion name or API # and click Lookup")
         ttk.Label(top, textvariable=self.status_var, foreground="gray").pack(
             side=tk.LEFT)
 
+        # Per-query timing readout
+        self.timing_var = tk.StringVar(value="")
+        ttk.Label(self.root, textvariable=self.timing_var, foreground="gray",
+                  anchor=tk.W, padding=(8, 2)).pack(side=tk.BOTTOM, fill=tk.X)
+
         # Notebook (tabs)
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -358,25 +373,36 @@ class WellPassportApp:
 
         self.lookup_btn.config(state=tk.DISABLED)
         self.status_var.set("Resolving well...")
-        threading.Thread(target=self._load_all, args=(name, api), daemon=True).start()
+        self.timing_var.set("")
+        self._lookup_gen += 1
+        self._results = {tab: {} for tab in TAB_QUERIES}
+        self._timings = []
+        self._errors = []
+        self._t_start = time.perf_counter()
+        threading.Thread(target=self._load_all,
+                         args=(name, api, self.refresh_var.get(), self._lookup_gen),
+                         daemon=True).start()
 
     @staticmethod
-    def _safe_query(cur, sql, params):
-        """Execute a query, returning (cols, rows).  On error return ([], [])
-        and the error message so the caller can keep going."""
+    def _safe_query(sql, params, refresh=False):
+        """Execute a query (via the local cache), returning (cols, rows).
+        On error return ([], []) and the error message so the caller can
+        keep going."""
         try:
-            cur.execute(sql, params)
-            cols = [d[0] for d in cur.description]
-            rows = cur.fetchall()
+            cols, rows = query_cache.run_query(sql, params, "odw", refresh=refresh)
             return cols, rows, None
         except Exception as e:
             return [], [], str(e)
 
-    def _load_all(self, name_input, api_input):
-        errors = []          # collect per-query errors, show at end
+    @classmethod
+    def _timed_query(cls, sql, params, refresh=False):
+        """_safe_query plus wall time — runs on an executor thread."""
+        t0 = time.perf_counter()
+        cols, rows, err = cls._safe_query(sql, params, refresh)
+        return cols, rows, err, time.perf_counter() - t0
+
+    def _load_all(self, name_input, api_input, refresh=False, gen=0):
         try:
-            conn = self._get_conn()
-            cur = conn.cursor()
 
             # ----------------------------------------------------------
             # Step 0: Resolve the well — name, API, or both
@@ -386,18 +412,16 @@ class WellPassportApp:
             info_by_api = None
 
             if name_input:
-                cur.execute(SQL_RESOLVE_BY_NAME, {"well_name": name_input})
-                cols = [d[0] for d in cur.description]
-                row = cur.fetchone()
-                if row:
-                    info_by_name = dict(zip(cols, row))
+                cols, rows = query_cache.run_query(
+                    SQL_RESOLVE_BY_NAME, {"well_name": name_input}, "odw", refresh=refresh)
+                if rows:
+                    info_by_name = dict(zip(cols, rows[0]))
 
             if api_input:
-                cur.execute(SQL_RESOLVE_BY_API, {"api_nbr": api_input})
-                cols = [d[0] for d in cur.description]
-                row = cur.fetchone()
-                if row:
-                    info_by_api = dict(zip(cols, row))
+                cols, rows = query_cache.run_query(
+                    SQL_RESOLVE_BY_API, {"api_nbr": api_input}, "odw", refresh=refresh)
+                if rows:
+                    info_by_api = dict(zip(cols, rows[0]))
 
             # Decide which result to use, handle mismatches
             if name_input and api_input:
@@ -444,81 +468,35 @@ class WellPassportApp:
             self.root.after(0, lambda a=resolved_api or "": self.api_var.set(a))
             self.root.after(0, lambda n=resolved_name: self.status_var.set(
                 f"Loading {n}..."))
+            self.root.after(0, lambda n=resolved_name: self._show_info(n, info, gen))
 
             # ----------------------------------------------------------
-            # Extract numeric IDs — used by ALL subsequent queries
+            # Numeric IDs — used by ALL subsequent queries
             # ----------------------------------------------------------
-            cmpl_fac_id = info["CMPL_FAC_ID"]
-            well_fac_id = info["WELL_FAC_ID"]
-            cmpl_dmn_key = info["CMPL_DMN_KEY"]
-            wlbr_fac_id = info.get("WLBR_FAC_ID")  # may be None
+            ids = {
+                "cmpl_fac_id": info["CMPL_FAC_ID"],
+                "well_fac_id": info["WELL_FAC_ID"],
+                "cmpl_dmn_key": info["CMPL_DMN_KEY"],
+                "wlbr_fac_id": info.get("WLBR_FAC_ID"),  # may be None
+            }
 
             # ----------------------------------------------------------
-            # Each query is wrapped individually so one failure doesn't
-            # prevent the remaining tabs from loading.
+            # Fan the tab queries out to the pool.  Each one is wrapped
+            # individually so one failure doesn't prevent the remaining
+            # tabs from loading; results are handed to the Tk thread as
+            # they arrive.
             # ----------------------------------------------------------
-
-            # Casing / tubing
-            if wlbr_fac_id:
-                cols_ct, rows_ct, err = self._safe_query(
-                    cur, SQL_CASING_TUBING, {"wlbr_fac_id": wlbr_fac_id})
-                if err:
-                    errors.append(f"Casing/Tubing: {err}")
-
-                cols_pf, rows_pf, err = self._safe_query(
-                    cur, SQL_PERFORATIONS, {"wlbr_fac_id": wlbr_fac_id})
-                if err:
-                    errors.append(f"Perforations: {err}")
-            else:
-                cols_ct, rows_ct = [], []
-                cols_pf, rows_pf = [], []
-
-            # Current status
-            cols_st, rows_st, err = self._safe_query(
-                cur, SQL_CURRENT_STATUS, {"cmpl_fac_id": cmpl_fac_id})
-            if err:
-                errors.append(f"Status: {err}")
-
-            # Latest well tests
-            cols_wt, rows_wt, err = self._safe_query(
-                cur, SQL_LATEST_WELL_TEST, {"cmpl_fac_id": cmpl_fac_id})
-            if err:
-                errors.append(f"Well Tests: {err}")
-
-            # WRA Notes
-            cols_wr, rows_wr, err = self._safe_query(
-                cur, SQL_WRA_NOTES, {"well_fac_id": well_fac_id})
-            if err:
-                errors.append(f"WRA Notes: {err}")
-
-            # Monthly production
-            cols_mp, rows_mp, err = self._safe_query(
-                cur, SQL_MONTHLY_PROD, {"cmpl_dmn_key": cmpl_dmn_key})
-            if err:
-                errors.append(f"Monthly Prod: {err}")
-
-            # Workovers
-            cols_wo, rows_wo, err = self._safe_query(
-                cur, SQL_WORKOVERS, {"cmpl_fac_id": cmpl_fac_id})
-            if err:
-                errors.append(f"Workovers: {err}")
-
-            # Dispatch to UI — always, even if some queries failed
-            self.root.after(0, lambda: self._populate_all(
-                resolved_name, info,
-                cols_ct, rows_ct, cols_pf, rows_pf,
-                cols_st, rows_st, cols_wt, rows_wt,
-                cols_wr, rows_wr,
-                cols_mp, rows_mp,
-                cols_wo, rows_wo,
-            ))
-
-            # Show collected errors as a non-blocking warning
-            if errors:
-                summary = "\n\n".join(errors)
-                self.root.after(0, lambda s=summary: messagebox.showwarning(
-                    "Some Tabs Had Errors",
-                    f"The following queries failed (other tabs still loaded):\n\n{s}"))
+            for tab, queries in TAB_QUERIES.items():
+                for label, sql, key in queries:
+                    if ids[key] is None:     # e.g. no wellbore -> no casing/perfs
+                        self.root.after(0, lambda t=tab, l=label: self._on_query_done(
+                            gen, t, l, [], [], None, 0.0))
+                        continue
+                    fut = self._executor.submit(self._timed_query, sql,
+                                                {key: ids[key]}, refresh)
+                    fut.add_done_callback(
+                        lambda f, t=tab, l=label: self.root.after(
+                            0, lambda: self._on_query_done(gen, t, l, *f.result())))
 
         except Exception as e:
             # Only reaches here if connection or resolution itself failed
@@ -535,25 +513,67 @@ class WellPassportApp:
         self.lookup_btn.config(state=tk.NORMAL)
         messagebox.showerror("Database Error", msg)
 
-    def _populate_all(self, well, info,
-                      cols_ct, rows_ct, cols_pf, rows_pf,
-                      cols_st, rows_st, cols_wt, rows_wt,
-                      cols_wr, rows_wr,
-                      cols_mp, rows_mp,
-                      cols_wo, rows_wo):
+    def _show_info(self, well, info, gen):
+        if gen != self._lookup_gen:
+            return
+        self._well_name = well
+        self._populate_info(info)
 
+    def _on_query_done(self, gen, tab, label, cols, rows, err, secs):
+        """One tab query finished — fill its tab once all of its queries are in."""
+        if gen != self._lookup_gen:
+            return      # result from an earlier lookup
+        self._timings.append((label, secs))
+        if err:
+            self._errors.append(f"{label}: {err}")
+
+        got = self._results[tab]
+        got[label] = (cols, rows)
+        if len(got) == len(TAB_QUERIES[tab]):
+            try:
+                self._populate_tab(tab)
+            except Exception as e:
+                self._errors.append(f"{label}: {e}")
+
+        total = sum(len(q) for q in TAB_QUERIES.values())
+        timing = "   ".join(f"{l} {t:.2f}s" for l, t in self._timings)
+        elapsed = time.perf_counter() - self._t_start
+        if len(self._timings) < total:
+            self.status_var.set(f"Loading {self._well_name}...  "
+                                f"{len(self._timings)}/{total}")
+            self.timing_var.set(timing)
+            return
+
+        self._finish(timing, elapsed)
+
+    def _populate_tab(self, tab):
+        got, info, well = self._results[tab], self._well_data, self._well_name
+        if tab == "mech":
+            self._populate_mechanical(*got["Casing/Tubing"], *got["Perforations"])
+        elif tab == "status":
+            self._populate_status(info, *got["Status"], *got["Well Tests"])
+        elif tab == "wra":
+            self._populate_wra(*got["WRA Notes"])
+        elif tab == "prod":
+            self._populate_prod_chart(*got["Monthly Prod"], well, info)
+        elif tab == "wo":
+            self._populate_workovers(*got["Workovers"])
+
+    def _finish(self, timing, elapsed):
+        info = self._well_data
         self.status_var.set(
-            f"{well}  —  {info.get('OPNL_FLD', '')}  |  "
+            f"{self._well_name}  —  {info.get('OPNL_FLD', '')}  |  "
             f"{info.get('ENGR_STRG_NME', '')}  |  "
             f"{info.get('PRIM_PURP_TYPE_CDE', '')}")
+        self.timing_var.set(f"Loaded in {elapsed:.2f}s  —  {timing}")
         self.lookup_btn.config(state=tk.NORMAL)
 
-        self._populate_info(info)
-        self._populate_mechanical(cols_ct, rows_ct, cols_pf, rows_pf)
-        self._populate_status(info, cols_st, rows_st, cols_wt, rows_wt)
-        self._populate_wra(cols_wr, rows_wr)
-        self._populate_prod_chart(cols_mp, rows_mp, well, info)
-        self._populate_workovers(cols_wo, rows_wo)
+        # Show collected errors as a non-blocking warning
+        if self._errors:
+            summary = "\n\n".join(self._errors)
+            messagebox.showwarning(
+                "Some Tabs Had Errors",
+                f"The following queries failed (other tabs still loaded):\n\n{summary}")
 
     # ---- TAB 1: Completion & Wellbore --------------------------------------
 
@@ -992,6 +1012,9 @@ class WellPassportApp:
 # MAIN
 # ============================================================================
 if __name__ == "__main__":
+    startup.mark("imports")
     root = tk.Tk()
     app = WellPassportApp(root)
+    startup.first_paint(root, then=lambda: startup.preload(Figure, FigureCanvasTkAgg, mdates,
+                                                           background=True))
     root.mainloop()
\ No newline at end of file
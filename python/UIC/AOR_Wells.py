@@ -15,6 +15,7 @@ Translations:
 """
 
 import os
+import sys
 import oracledb
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, filedialog
@@ -23,14 +24,6 @@ import tkinter.font
 import ttkbootstrap as tb
 import pandas as pd
 
-# --- CONNECTION FIX: Enable Thick Mode ---
-try:
-    oracledb.init_oracle_client()
-except Exception as e:
-    print(f"Warning: Could not initialize Oracle thick client. {e}")
-# -----------------------------------------
-
-
 # ── Translation Maps ─────────────────────────────────────────────────────
 
 STATUS_MAP = {
@@ -60,39 +53,21 @@ def translate_status(status_code):
 
 # ── Oracle Connection ────────────────────────────────────────────────────
 
-class OracleConnectionManager:
-    def __init__(self):
-        self._connections = {
-            "odw": {
-                "user": os.getenv("DB_USER_ODW", "rptguser"),
-                "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
-                "dsn": "odw"
-            },
-        }
-
-    def get_connection(self, name="odw"):
-        config = self._connections[name]
-        try:
-            return oracledb.connect(
-                user=config['user'],
-                password=config['password'],
-                dsn=config['dsn']
-            )
-        except oracledb.Error as e:
-            error_obj, = e.args
-            raise ConnectionError(
-                f"Failed to connect to Oracle DB '{name}': {error_obj.message}"
-            ) from e
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.db import OracleConnectionManager   # pooled sessions — python/common/db.py
+from common.vtable import VirtualTable, autofit, frame_display   # only the visible rows live in Tk
+from common import export        # streamed .csv / .xlsx / .parquet exports
 
 
 # ── Treeview Mixin ───────────────────────────────────────────────────────
 
 class TreeviewMixin:
-    """Provides display_results, clear_results, copy_to_clipboard."""
+    """Provides display_results, clear_results, copy_to_clipboard.
+    Rows are held by a VirtualTable; only the visible ones are in the tree."""
 
     def display_results(self, df):
-        for i in self.result_tree.get_children():
-            self.result_tree.delete(i)
+        vt = VirtualTable.attach(self.result_tree)
+        vt.clear()
 
         if df.empty:
             messagebox.showinfo("No Results", "No data found for the provided UWIs.")
@@ -111,28 +86,14 @@ class TreeviewMixin:
 
         for col in columns:
             self.result_tree.heading(col, text=col, anchor="w")
-            self.result_tree.column(col, width=tree_font.measure(col) + 30, stretch=False)
-
-        for _, row in df.iterrows():
-            vals = []
-            for item in row:
-                if isinstance(item, pd.Timestamp):
-                    vals.append(item.strftime('%Y-%m-%d') if not pd.isna(item) else '')
-                elif pd.isna(item):
-                    vals.append('')
-                else:
-                    vals.append(item)
-            self.result_tree.insert("", "end", values=vals)
-
-            for i, item in enumerate(vals):
-                col_width = tree_font.measure(str(item)) + 20
-                current_col_id = columns[i]
-                if self.result_tree.column(current_col_id, width=None) < col_width:
-                    self.result_tree.column(current_col_id, width=col_width)
+
+        # Format each column once, size from a sample, hand the rows to the table
+        shown = frame_display(df)
+        autofit(self.result_tree, columns, shown, tree_font, head_pad=30, cell_pad=20)
+        vt.set_rows(columns, list(df.itertuples(index=False, name=None)), display=shown)
 
     def clear_results(self):
-        for i in self.result_tree.get_children():
-            self.result_tree.delete(i)
+        VirtualTable.attach(self.result_tree).clear()
         self.result_tree["columns"] = []
         self.current_data = None
 
@@ -342,23 +303,22 @@ class AORWellLookupApp(tb.Window, TreeviewMixin):
         sql = build_aor_sql(uwis)
 
         try:
-            conn = self.conn_manager.get_connection("odw")
-            cursor = conn.cursor()
-            cursor.execute(sql)
-
-            if not cursor.description:
+            with self.conn_manager.get_connection("odw") as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(sql)
+                    columns = [col[0] for col in cursor.description] if cursor.description else None
+                    rows = cursor.fetchall() if columns is not None else []
+                finally:
+                    cursor.close()
+
+            if columns is None:
                 messagebox.showinfo("No Results", "Query returned no data.")
                 self.clear_results()
                 self.status_var.set("No results.")
-                cursor.close()
-                conn.close()
                 return
 
-            rows = cursor.fetchall()
-            columns = [col[0] for col in cursor.description]
             df = pd.DataFrame(rows, columns=columns)
-            cursor.close()
-            conn.close()
 
             # Apply translations
             df_out = transform_aor_results(df)
@@ -394,19 +354,17 @@ class AORWellLookupApp(tb.Window, TreeviewMixin):
 
         filepath = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv")],
+            filetypes=[export.FILETYPES[1], export.FILETYPES[0], export.FILETYPES[2]],
             title="Save AOR Well Data"
         )
         if not filepath:
             return
 
         try:
-            if filepath.endswith(".csv"):
-                self.current_data.to_csv(filepath, index=False)
-            else:
-                self.current_data.to_excel(filepath, index=False, sheet_name="AOR Wells")
+            # Typed rows in the grid's order, streamed (common/export.py)
+            n = VirtualTable.of(self.result_tree).export(filepath, sheet="AOR Wells")
             messagebox.showinfo("Export Success", f"Saved to:\n{filepath}")
-            self.status_var.set(f"Exported {len(self.current_data)} rows to {filepath}")
+            self.status_var.set(f"Exported {n} rows to {filepath}")
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to save: {e}")
 
@@ -1,76 +1,35 @@
 #Help: Periodic Project Review using ODW data
 import os
-import oracledb
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup       # lazy heavy imports + startup timing — see python/common/
+
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
+from tkinter import messagebox, scrolledtext, filedialog
 from tkinter import ttk
 import tkinter.font
-import ttkbootstrap as tb
-import pandas as pd
+import ttkbootstrap as tb        # the tabs subclass tb.Frame, so this one loads up front
 from datetime import datetime, date, timedelta
 
-# --- CONNECTION FIX: Enable Thick Mode ---
-try:
-    oracledb.init_oracle_client()
-except Exception as e:
-    print(f"Warning: Could not initialize Oracle thick client. {e}")
-# -----------------------------------------
-
-
-# Oracle Connection Manager
-class OracleConnectionManager:
-    def __init__(self):
-        self._connections = {
-            "odw": {
-                "user": os.getenv("DB_USER_ODW", "rptguser"),
-                "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
-                "dsn": "odw"
-            },
-            "sandbox": {
-                "user": os.getenv("DB_USER_SANDBOX", "engsb"),
-                "password": os.getenv("DB_PASSWORD_SANDBOX", "Engine33r_SB"),
-                "dsn": "odw"
-            },
-            "openwells": {
-                "user": os.getenv("DB_USER_OW", "gen_user"),
-                "password": os.getenv("DB_PASSWORD_OW", "allusers"),
-                "dsn": "owdb1"
-            }
-        }
-
-    def get_connection(self, name):
-        if name not in self._connections:
-            raise ValueError(f"Unknown DB connection name: {name}")
-        config = self._connections[name]
-        try:
-            return oracledb.connect(
-                user=config['user'],
-                password=config['password'],
-                dsn=config['dsn']
-            )
-        except oracledb.Error as e:
-            error_obj, = e.args
-            raise ConnectionError(f"Failed to connect to Oracle DB '{name}': {error_obj.message}") from e
+# pandas / oracledb load on the first pull (or in the background once the window is up)
+pd = startup.lazy("pandas")
+oracledb = startup.lazy("oracledb")
 
-    def available_connections(self):
-        return list(self._connections.keys())
+# Shared Oracle access (pool + local result cache)
+from common import db
+from common import query_cache   # pooled + disk-cached ODW reads — see python/common/
+from common import mirror        # local cmpl_mnly_fact replica (common/mirror.py)
+from common import export        # streamed .csv / .xlsx / .parquet exports
+from common.vtable import VirtualTable, autofit, frame_display   # only the visible rows live in Tk
+# Tab SQL + Summary calculations, shared with the headless batch (python common/ppr.py)
+from common.ppr import (API_IN_LIST, SQL_BASIC_DATA, SQL_TOP_PERF, SQL_PERF_SUMMARY, SQL_TUBING_AVG,
+                        CALC_ITEMS, summary_metrics, avg_tubing_pressure)
 
 
 def format_well_api_list(raw_api_list):
-    """Convert list of user-supplied APIs to a safe SQL IN list string."""
-    cleaned = []
-    for item in raw_api_list:
-        if item is None:
-            continue
-        api = str(item).strip()
-        if not api:
-            continue
-        if api not in cleaned:
-            cleaned.append(api)
-    if not cleaned:
-        return None
-    escaped = [f"'{x.replace(chr(39), chr(39)+chr(39))}'" for x in cleaned]
-    return ", ".join(escaped)
+    """Convert list of user-supplied APIs to a de-duplicated key-list bind."""
+    return db.key_list(raw_api_list) or None
 
 
 # --------------------------------------------------------------------------
@@ -78,11 +37,12 @@ def format_well_api_list(raw_api_list):
 # --------------------------------------------------------------------------
 class TreeviewMixin:
     """Provides display_results, clear_results, copy_to_clipboard for any
-    frame that has a `self.result_tree` Treeview and `self.current_data` attr."""
+    frame that has a `self.result_tree` Treeview and `self.current_data` attr.
+    Rows are held by a VirtualTable; only the visible ones are in the tree."""
 
     def display_results(self, df, apply_global_sort=True):
-        for i in self.result_tree.get_children():
-            self.result_tree.delete(i)
+        vt = VirtualTable.attach(self.result_tree)
+        vt.clear()
 
         if df.empty:
             messagebox.showinfo("No Results", "No data found for the query.")
@@ -113,31 +73,42 @@ class TreeviewMixin:
 
         for col in columns:
             self.result_tree.heading(col, text=col, anchor="w")
-            self.result_tree.column(col, width=tree_font.measure(col) + 20, stretch=False)
-
-        for _, row in df.iterrows():
-            display_values = []
-            for item in row:
-                if isinstance(item, pd.Timestamp):
-                    display_values.append(item.strftime('%Y-%m-%d') if not pd.isna(item) else '')
-                elif pd.isna(item):
-                    display_values.append('')
-                else:
-                    display_values.append(item)
-            self.result_tree.insert("", "end", values=display_values)
-
-            for i, item in enumerate(display_values):
-                col_width = tree_font.measure(str(item)) + 10
-                current_col_id = columns[i]
-                if self.result_tree.column(current_col_id, width=None) < col_width:
-                    self.result_tree.column(current_col_id, width=col_width)
+
+        # Format each column once, size from a sample, hand the rows to the table
+        shown = frame_display(df)
+        autofit(self.result_tree, columns, shown, tree_font, head_pad=20, cell_pad=10)
+        vt.set_rows(columns, list(df.itertuples(index=False, name=None)), display=shown)
 
     def clear_results(self):
-        for i in self.result_tree.get_children():
-            self.result_tree.delete(i)
+        VirtualTable.attach(self.result_tree).clear()
         self.result_tree["columns"] = []
         self.current_data = None
 
+    def build_output_buttons(self):
+        """Copy / Export buttons under the results grid."""
+        row = tb.Frame(self)
+        row.pack(pady=10)
+        tb.Button(row, text="Copy Results to Clipboard", command=self.copy_to_clipboard,
+                  bootstyle="secondary").pack(side="left", padx=5)
+        tb.Button(row, text="Export...", command=self.export_results,
+                  bootstyle="secondary").pack(side="left", padx=5)
+
+    def export_results(self):
+        """Typed rows, in the grid's order, streamed to CSV / Excel / Parquet."""
+        vt = VirtualTable.of(self.result_tree)
+        if vt is None or not len(vt):
+            messagebox.showwarning("No Data", "No results to export."); return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx", filetypes=export.FILETYPES,
+            initialfile=f"PPR_{datetime.now():%Y%m%d_%H%M%S}.xlsx")
+        if not path:
+            return
+        try:
+            n = vt.export(path)
+            messagebox.showinfo("Export Success", f"{n:,} rows saved to:\n{path}")
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to save: {e}")
+
     def copy_to_clipboard(self):
         if self.current_data is not None and not self.current_data.empty:
             try:
@@ -219,7 +190,6 @@ class WellBasicDataTab(tb.Frame, TreeviewMixin):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
-        self.conn_manager = OracleConnectionManager()
         self.current_data = None
         self._build()
 
@@ -231,8 +201,7 @@ class WellBasicDataTab(tb.Frame, TreeviewMixin):
         self.tree_frame, self.result_tree = build_treeview(self)
         self.tree_frame.pack(pady=10, padx=20, fill="both", expand=True)
 
-        tb.Button(self, text="Copy Results to Clipboard", command=self.copy_to_clipboard,
-                  bootstyle="secondary").pack(pady=10)
+        self.build_output_buttons()
 
     def pull_basic_data(self):
         apis = self.app.api_tab.get_apis()
@@ -245,33 +214,13 @@ class WellBasicDataTab(tb.Frame, TreeviewMixin):
         if not formatted:
             self.clear_results(); return
 
-        sql_query = f"""
-SELECT
-    wd.wlbr_nme                    AS well_name,
-    cd.opnl_fld                    AS field_name,
-    cd.cmpl_nme                    AS completion_name,
-    cd.well_api_nbr                AS api_number,
-    wd.wlbr_api_suff_nbr           AS wellbore_suffix,
-    wd.wlbr_incl_type_desc         AS wellbore_type,
-    cd.prim_purp_type_cde          AS well_type,
-    cd.cmpl_state_type_cde         AS status,
-    cd.in_svc_indc                 AS in_service,
-    cd.init_prod_dte               AS initial_prod_date
-FROM dwrptg.cmpl_dmn cd
-JOIN dwrptg.wlbr_dmn wd ON cd.well_fac_id = wd.well_fac_id
-WHERE cd.actv_indc = 'Y' AND cd.well_api_nbr IN ({formatted})
-ORDER BY cd.well_api_nbr, wd.wlbr_api_suff_nbr, cd.cmpl_nme
-"""
-        self._execute(sql_query, date_cols=['INITIAL_PROD_DATE'])
-
-    def _execute(self, sql, date_cols=None):
+        sql_query = SQL_BASIC_DATA
+        self._execute(sql_query, {"apis": formatted}, date_cols=['INITIAL_PROD_DATE'])
+
+    def _execute(self, sql, params, date_cols=None):
         try:
-            conn = self.conn_manager.get_connection('odw')
-            cursor = conn.cursor()
-            cursor.execute(sql)
-            if cursor.description:
-                rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
+            columns, rows = query_cache.run_query(sql, params, refresh=self.app.force_refresh.get())
+            if columns:
                 df = pd.DataFrame(rows, columns=columns)
                 for col in (date_cols or []):
                     if col in df.columns:
@@ -279,10 +228,8 @@ ORDER BY cd.well_api_nbr, wd.wlbr_api_suff_nbr, cd.cmpl_nme
                 self.display_results(df)
                 self.current_data = df
             else:
-                conn.commit()
                 messagebox.showinfo("Query Executed", "No results to display.")
                 self.clear_results()
-            cursor.close(); conn.close()
         except ConnectionError as e:
             messagebox.showerror("Connection Error", str(e)); self.clear_results()
         except oracledb.Error as e:
@@ -299,7 +246,6 @@ class TopPerfTab(tb.Frame, TreeviewMixin):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
-        self.conn_manager = OracleConnectionManager()
         self.current_data = None
         self._build()
 
@@ -311,8 +257,7 @@ class TopPerfTab(tb.Frame, TreeviewMixin):
         self.tree_frame, self.result_tree = build_treeview(self)
         self.tree_frame.pack(pady=10, padx=20, fill="both", expand=True)
 
-        tb.Button(self, text="Copy Results to Clipboard", command=self.copy_to_clipboard,
-                  bootstyle="secondary").pack(pady=10)
+        self.build_output_buttons()
 
     def execute_query(self):
         apis = self.app.api_tab.get_apis()
@@ -324,127 +269,19 @@ class TopPerfTab(tb.Frame, TreeviewMixin):
         if not formatted:
             self.clear_results(); return
 
-        sql_query = f"""
-WITH T AS (
-    SELECT cd.cmpl_nme, cd.cmpl_fac_id, cd.well_fac_id,
-           wd.well_api_nbr, cd.engr_strg_nme
-    FROM dwrptg.cmpl_dmn cd
-    JOIN dwrptg.well_dmn wd ON cd.well_fac_id = wd.well_fac_id
-    WHERE cd.actv_indc = 'Y'
-      AND wd.actv_indc = 'Y'
-      AND wd.well_api_nbr IN ({formatted})
-      AND cd.cmpl_state_type_cde IN ('OPNL', 'TA', 'ABND')
-),
-perfs AS (
-    SELECT t.well_api_nbr, t.cmpl_nme, t.cmpl_fac_id,
-           t.well_fac_id, t.engr_strg_nme,
-           MIN(opg.top_md_qty) AS top_perf,
-           MAX(opg.btm_md_qty) AS btm_perf
-    FROM T
-    JOIN dwrptg.wlbr_dmn wd ON t.well_fac_id = wd.well_fac_id
-    JOIN dwrptg.actl_wlbr_opg_ntvl_dmn opg ON wd.wlbr_fac_id = opg.wlbr_fac_id
-    GROUP BY t.well_api_nbr, t.cmpl_nme, t.cmpl_fac_id,
-             t.well_fac_id, t.engr_strg_nme
-),
-surveys AS (
-    SELECT wd.well_fac_id,
-           d.md_qty AS svy_md,
-           d.tvd_qty AS svy_tvd
-    FROM dwrptg.dsvy_pt_dmn d
-    JOIN dwrptg.wlbr_dmn wd ON d.wlbr_fac_id = wd.wlbr_fac_id
-    WHERE wd.well_fac_id IN (SELECT well_fac_id FROM T)
-      AND d.tvd_qty IS NOT NULL
-      AND d.md_qty IS NOT NULL
-      AND d.tvd_qty <= d.md_qty
-),
-top_above AS (
-    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
-           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md DESC) AS rn
-    FROM perfs p
-    JOIN surveys s ON s.well_fac_id = p.well_fac_id
-    WHERE s.svy_md <= p.top_perf
-),
-top_below AS (
-    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
-           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md ASC) AS rn
-    FROM perfs p
-    JOIN surveys s ON s.well_fac_id = p.well_fac_id
-    WHERE s.svy_md > p.top_perf
-),
-btm_above AS (
-    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
-           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md DESC) AS rn
-    FROM perfs p
-    JOIN surveys s ON s.well_fac_id = p.well_fac_id
-    WHERE s.svy_md <= p.btm_perf
-),
-btm_below AS (
-    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
-           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md ASC) AS rn
-    FROM perfs p
-    JOIN surveys s ON s.well_fac_id = p.well_fac_id
-    WHERE s.svy_md > p.btm_perf
-)
-SELECT p.well_api_nbr,
-       p.cmpl_nme,
-       p.engr_strg_nme,
-       p.top_perf,
-       LEAST(
-           p.top_perf,
-           ROUND(
-               CASE
-                   WHEN ta.svy_md IS NOT NULL AND tb.svy_md IS NOT NULL
-                        AND tb.svy_md != ta.svy_md
-                   THEN ta.svy_tvd +
-                        (p.top_perf - ta.svy_md) *
-                        (tb.svy_tvd - ta.svy_tvd) /
-                        (tb.svy_md - ta.svy_md)
-                   WHEN ta.svy_md IS NOT NULL
-                   THEN ta.svy_tvd
-                   ELSE p.top_perf
-               END, 1)
-       ) AS top_perf_tvd,
-       p.btm_perf,
-       LEAST(
-           p.btm_perf,
-           ROUND(
-               CASE
-                   WHEN ba.svy_md IS NOT NULL AND bb.svy_md IS NOT NULL
-                        AND bb.svy_md != ba.svy_md
-                   THEN ba.svy_tvd +
-                        (p.btm_perf - ba.svy_md) *
-                        (bb.svy_tvd - ba.svy_tvd) /
-                        (bb.svy_md - ba.svy_md)
-                   WHEN ba.svy_md IS NOT NULL
-                   THEN ba.svy_tvd
-                   ELSE p.btm_perf
-               END, 1)
-       ) AS btm_perf_tvd
-FROM perfs p
-LEFT JOIN top_above ta ON p.cmpl_fac_id = ta.cmpl_fac_id AND ta.rn = 1
-LEFT JOIN top_below tb ON p.cmpl_fac_id = tb.cmpl_fac_id AND tb.rn = 1
-LEFT JOIN btm_above ba ON p.cmpl_fac_id = ba.cmpl_fac_id AND ba.rn = 1
-LEFT JOIN btm_below bb ON p.cmpl_fac_id = bb.cmpl_fac_id AND bb.rn = 1
-ORDER BY p.cmpl_nme
-"""
-        self._execute(sql_query)
-
-    def _execute(self, sql):
+        sql_query = SQL_TOP_PERF
+        self._execute(sql_query, {"apis": formatted})
+
+    def _execute(self, sql, params):
         try:
-            conn = self.conn_manager.get_connection('odw')
-            cursor = conn.cursor()
-            cursor.execute(sql)
-            if cursor.description:
-                rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
+            columns, rows = query_cache.run_query(sql, params, refresh=self.app.force_refresh.get())
+            if columns:
                 df = pd.DataFrame(rows, columns=columns)
                 self.display_results(df)
                 self.current_data = df
             else:
-                conn.commit()
                 messagebox.showinfo("Query Executed", "No results to display.")
                 self.clear_results()
-            cursor.close(); conn.close()
         except ConnectionError as e:
             messagebox.showerror("Connection Error", str(e)); self.clear_results()
         except oracledb.Error as e:
@@ -461,7 +298,6 @@ class PerformanceSummaryTab(tb.Frame, TreeviewMixin):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
-        self.conn_manager = OracleConnectionManager()
         self.current_data = None
         self.calculation_labels = {}
         self._build()
@@ -491,18 +327,7 @@ class PerformanceSummaryTab(tb.Frame, TreeviewMixin):
         calc_lf.pack(pady=10, padx=20, fill="x")
         calc_lf.columnconfigure(1, weight=1)
 
-        calc_items = [
-            ("Total INJ wells (Active/TA):", "total_inj"),
-            ("Total PROD wells:", "total_prod"),
-            ("Active Injectors (Last 2 yrs):", "active_injectors"),
-            ("Idle Injectors (Last 2 yrs):", "idle_injectors"),
-            ("Injectors Drilled Since Last Update:", "injectors_drilled"),
-            ("Active Producers (Last 2 yrs):", "active_producers"),
-            ("Idle Producers (Last 2 yrs):", "idle_producers"),
-            ("Producers Drilled Since Last Update:", "producers_drilled"),
-            ("Producers Abandoned Since Last Update:", "producers_abandoned"),
-        ]
-        for row_idx, (text, key) in enumerate(calc_items):
+        for row_idx, (text, key) in enumerate(CALC_ITEMS):
             tb.Label(calc_lf, text=text, anchor="w").grid(row=row_idx, column=0, sticky="ew", padx=5, pady=2)
             lbl = tb.Label(calc_lf, text="N/A", bootstyle="success", font=("TkDefaultFont", 10, "bold"))
             lbl.grid(row=row_idx, column=1, sticky="ew", padx=5, pady=2)
@@ -511,8 +336,7 @@ class PerformanceSummaryTab(tb.Frame, TreeviewMixin):
         self.tree_frame, self.result_tree = build_treeview(self)
         self.tree_frame.pack(pady=10, padx=20, fill="both", expand=True)
 
-        tb.Button(self, text="Copy Results to Clipboard", command=self.copy_to_clipboard,
-                  bootstyle="secondary").pack(pady=10)
+        self.build_output_buttons()
 
     def pull_summary_data(self):
         apis = self.app.api_tab.get_apis()
@@ -524,50 +348,11 @@ class PerformanceSummaryTab(tb.Frame, TreeviewMixin):
         if not formatted:
             self.clear_calculations(); return
 
-        sql_query = f"""
-        WITH T1 AS (
-            SELECT cmpl_fac_id, eftv_dttm AS last_inj_dte FROM
-            (
-                SELECT cmpl_fac_id, eftv_dttm, aloc_stm_inj_dly_rte_qty, aloc_wtr_inj_dly_rte_qty,
-                       DENSE_RANK() OVER (PARTITION BY cmpl_fac_id ORDER BY eftv_dttm DESC) AS rnk
-                FROM cmpl_mnly_fact
-                WHERE aloc_wtr_inj_dly_rte_qty > 0 OR aloc_stm_inj_dly_rte_qty > 0
-            ) WHERE rnk = 1
-        ),
-        T2 AS (
-            SELECT cmpl_fac_id, eftv_dttm AS last_prod_dte FROM
-            (
-                SELECT cmpl_fac_id, eftv_dttm, aloc_gros_prod_dly_rte_qty,
-                       DENSE_RANK() OVER (PARTITION BY cmpl_fac_id ORDER BY eftv_dttm DESC) AS rnk
-                FROM cmpl_mnly_fact
-                WHERE aloc_gros_prod_dly_rte_qty > 0
-            ) WHERE rnk = 1
-        )
-        SELECT wd.well_nme, wd.well_api_nbr, wd.fld_nme,
-               cd.init_prod_dte, cd.init_inj_dte, cd.prim_purp_type_cde,
-               cd.ENGR_STRG_NME,
-               t1.last_inj_dte, t2.last_prod_dte,
-               cd.CMPL_STATE_TYPE_DESC, cd.CMPL_STATE_EFTV_DTTM
-        FROM well_dmn wd
-        JOIN cmpl_dmn cd ON wd.well_fac_id = cd.well_fac_id
-        LEFT JOIN cmpl_non_ver_dmn cnd ON cd.cmpl_fac_id = cnd.cmpl_fac_id
-        LEFT JOIN curr_cmpl_opnl_stat os ON cd.cmpl_fac_id = os.cmpl_fac_id
-        LEFT JOIN T1 ON cd.cmpl_fac_id = T1.cmpl_fac_id
-        LEFT JOIN T2 ON cd.cmpl_fac_id = T2.cmpl_fac_id
-        WHERE
-            cd.actv_indc = 'Y'
-            AND wd.actv_indc = 'Y'
-            AND wd.well_api_nbr IN ({formatted})
-            AND cd.prim_purp_type_cde IN ('PROD', 'INJ')
-        """
+        sql_query = SQL_PERF_SUMMARY
 
         try:
-            conn = self.conn_manager.get_connection('odw')
-            cursor = conn.cursor()
-            cursor.execute(sql_query)
-            if cursor.description:
-                rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
+            columns, rows = query_cache.run_query(sql_query, {"apis": formatted}, refresh=self.app.force_refresh.get())
+            if columns:
                 df = pd.DataFrame(rows, columns=columns)
                 date_cols = ['LAST_INJ_DTE', 'LAST_PROD_DTE', 'INIT_INJ_DTE',
                              'INIT_PROD_DTE', 'CMPL_STATE_EFTV_DTTM']
@@ -578,10 +363,8 @@ class PerformanceSummaryTab(tb.Frame, TreeviewMixin):
                 self.current_data = df
                 self.perform_calculations(df)
             else:
-                conn.commit()
                 messagebox.showinfo("Query Executed", "No results to display.")
                 self.clear_results(); self.clear_calculations()
-            cursor.close(); conn.close()
         except ConnectionError as e:
             messagebox.showerror("Connection Error", str(e))
             self.clear_results(); self.clear_calculations()
@@ -601,31 +384,10 @@ class PerformanceSummaryTab(tb.Frame, TreeviewMixin):
             messagebox.showerror("Date Error", "Invalid date format. Please use YYYY-MM-DD.")
             self.clear_calculations(); return
 
-        today = date.today()
-        project_update_date_ts = pd.Timestamp(project_update_date)
-        two_years_ago_ts = pd.Timestamp(today - timedelta(days=730))
-
-        inj_df = df[df['PRIM_PURP_TYPE_CDE'] == 'INJ']
-        prod_df = df[df['PRIM_PURP_TYPE_CDE'] == 'PROD']
-
-        def _set(key, val):
+        for key, val in summary_metrics(df, project_update_date).items():
             if key in self.calculation_labels:
                 self.calculation_labels[key].config(text=str(val))
 
-        _set("total_inj", len(inj_df[inj_df['CMPL_STATE_TYPE_DESC'] != 'Permanently Abandoned']))
-        _set("total_prod", len(prod_df))
-        _set("active_injectors", len(inj_df[inj_df['LAST_INJ_DTE'] >= two_years_ago_ts]))
-        _set("idle_injectors", len(inj_df[(inj_df['LAST_INJ_DTE'] < two_years_ago_ts) &
-                                           (inj_df['CMPL_STATE_TYPE_DESC'] != 'Permanently Abandoned')]))
-        _set("injectors_drilled", len(inj_df[(inj_df['INIT_INJ_DTE'] > project_update_date_ts) &
-                                              (inj_df['CMPL_STATE_TYPE_DESC'] != 'Permanently Abandoned')]))
-        _set("active_producers", len(prod_df[prod_df['LAST_PROD_DTE'] >= two_years_ago_ts]))
-        _set("idle_producers", len(prod_df[(prod_df['LAST_PROD_DTE'] < two_years_ago_ts) &
-                                            (prod_df['CMPL_STATE_TYPE_DESC'] != 'Permanently Abandoned')]))
-        _set("producers_drilled", len(prod_df[prod_df['INIT_PROD_DTE'] > project_update_date_ts]))
-        _set("producers_abandoned", len(prod_df[(prod_df['CMPL_STATE_TYPE_DESC'] == 'Permanently Abandoned') &
-                                                 (prod_df['CMPL_STATE_EFTV_DTTM'] > project_update_date_ts)]))
-
     def clear_calculations(self):
         for lbl in self.calculation_labels.values():
             lbl.config(text="N/A")
@@ -638,7 +400,6 @@ class TubingPressureTab(tb.Frame, TreeviewMixin):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
-        self.conn_manager = OracleConnectionManager()
         self.current_data = None
         self._build()
 
@@ -662,8 +423,7 @@ class TubingPressureTab(tb.Frame, TreeviewMixin):
         self.tree_frame, self.result_tree = build_treeview(self)
         self.tree_frame.pack(pady=10, padx=20, fill="both", expand=True)
 
-        tb.Button(self, text="Copy Results to Clipboard", command=self.copy_to_clipboard,
-                  bootstyle="secondary").pack(pady=10)
+        self.build_output_buttons()
 
     def pull_data(self):
         apis = self.app.api_tab.get_apis()
@@ -675,36 +435,18 @@ class TubingPressureTab(tb.Frame, TreeviewMixin):
         if not formatted:
             self.clear_results(); self._clear_avg(); return
 
-        sql_query = f"""
-        SELECT wd.well_nme, wd.well_api_nbr, cd.cmpl_nme, cd.cmpl_fac_id,
-            AVG(CASE WHEN cf.aloc_stm_inj_vol_qty > 0 THEN cf.aloc_stm_inj_vol_qty END) AS avg_stm_inj_vol,
-            ROUND(AVG(CASE WHEN cf.aloc_wtr_inj_vol_qty > 0 THEN cf.aloc_wtr_inj_vol_qty END), 2) AS avg_wtr_inj_vol,
-            ROUND(AVG(CASE WHEN cf.wlhd_tbg_prsr_qty > 0 THEN cf.wlhd_tbg_prsr_qty END), 2) AS avg_wlhd_tbg_prsr
-        FROM well_dmn wd
-        JOIN cmpl_dmn cd ON wd.well_fac_id = cd.well_fac_id
-        JOIN cmpl_dly_fact cf ON cd.cmpl_fac_id = cf.cmpl_fac_id
-        WHERE wd.actv_indc = 'Y' AND cd.actv_indc = 'Y'
-            AND cf.eftv_dttm >= TRUNC(SYSDATE) - 60
-            AND wd.well_api_nbr IN ({formatted})
-        GROUP BY wd.well_nme, wd.well_api_nbr, cd.cmpl_nme, cd.cmpl_fac_id
-        """
+        sql_query = SQL_TUBING_AVG
 
         try:
-            conn = self.conn_manager.get_connection('odw')
-            cursor = conn.cursor()
-            cursor.execute(sql_query)
-            if cursor.description:
-                rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
+            columns, rows = query_cache.run_query(sql_query, {"apis": formatted}, refresh=self.app.force_refresh.get())
+            if columns:
                 df = pd.DataFrame(rows, columns=columns)
                 self.display_results(df)
                 self.current_data = df
                 self._calc_avg(df)
             else:
-                conn.commit()
                 messagebox.showinfo("Query Executed", "No results to display.")
                 self.clear_results(); self._clear_avg()
-            cursor.close(); conn.close()
         except ConnectionError as e:
             messagebox.showerror("Connection Error", str(e)); self.clear_results(); self._clear_avg()
         except oracledb.Error as e:
@@ -714,12 +456,12 @@ class TubingPressureTab(tb.Frame, TreeviewMixin):
             messagebox.showerror("Error", f"An unexpected error occurred: {e}"); self.clear_results(); self._clear_avg()
 
     def _calc_avg(self, df):
-        col = next((c for c in df.columns if c.upper() == 'AVG_WLHD_TBG_PRSR'), None)
-        if col is None:
+        try:
+            avg = avg_tubing_pressure(df)
+        except KeyError:
             self.avg_pressure_label.config(text="Column not found"); return
-        vals = pd.to_numeric(df[col], errors='coerce').dropna()
-        if not vals.empty:
-            self.avg_pressure_label.config(text=f"{vals.mean():.1f}")
+        if avg is not None:
+            self.avg_pressure_label.config(text=f"{avg:.1f}")
         else:
             self.avg_pressure_label.config(text="No valid data")
 
@@ -734,7 +476,6 @@ class ProductionInjectionTab(tb.Frame, TreeviewMixin):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
-        self.conn_manager = OracleConnectionManager()
         self.current_data = None
         self._build()
 
@@ -747,8 +488,7 @@ class ProductionInjectionTab(tb.Frame, TreeviewMixin):
         self.tree_frame, self.result_tree = build_treeview(self)
         self.tree_frame.pack(pady=10, padx=20, fill="both", expand=True)
 
-        tb.Button(self, text="Copy Results to Clipboard", command=self.copy_to_clipboard,
-                  bootstyle="secondary").pack(pady=10)
+        self.build_output_buttons()
 
     def pull_data(self):
         apis = self.app.api_tab.get_apis()
@@ -775,29 +515,51 @@ class ProductionInjectionTab(tb.Frame, TreeviewMixin):
         JOIN cmpl_dmn cd ON wd.well_fac_id = cd.well_fac_id
         JOIN cmpl_mnly_fact cf ON cd.cmpl_fac_id = cf.cmpl_fac_id
         WHERE cd.actv_indc = 'Y' AND wd.actv_indc = 'Y'
-            AND wd.well_api_nbr IN ({formatted})
+            AND wd.well_api_nbr IN {API_IN_LIST}
             AND cf.eftv_dttm >= ADD_MONTHS(TRUNC(SYSDATE), -62)
             AND cf.eftv_dttm <= TRUNC(SYSDATE)
         ORDER BY wd.well_api_nbr, cf.eftv_dttm
         """
 
+        # Same query against the local replica (SQLite) when every API is mirrored
+        sql_mirror = """
+        SELECT
+            cd.well_nme AS "WELL NAME",
+            cd.well_api_nbr AS "WELL API",
+            cf.eftv_dttm AS "DATE",
+            cf.aloc_oil_prod_dly_rte_qty AS "OIL PROD BOPD",
+            cf.aloc_wtr_prod_dly_rte_qty AS "WATER PROD BWPD",
+            cf.aloc_gas_prod_dly_rte_qty AS "GAS PROD MCFD",
+            cf.aloc_stm_inj_dly_rte_qty AS "STEAM INJ Per Day",
+            cf.aloc_wtr_inj_dly_rte_qty AS "WATER INJ Per Day",
+            cf.aloc_gas_inj_dly_rte_qty AS "GAS INJ Per Day"
+        FROM cmpl_dmn cd
+        JOIN cmpl_mnly_fact cf ON cd.cmpl_fac_id = cf.cmpl_fac_id
+        WHERE cd.actv_indc = 'Y' AND cd.well_nme IS NOT NULL
+            AND cd.well_api_nbr IN (SELECT value FROM json_each(:apis))
+            AND cf.eftv_dttm >= :since AND cf.eftv_dttm <= :until
+        ORDER BY cd.well_api_nbr, cf.eftv_dttm
+        """
+
         try:
-            conn = self.conn_manager.get_connection('odw')
-            cursor = conn.cursor()
-            cursor.execute(sql_query)
-            if cursor.description:
-                rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
+            refresh = self.app.force_refresh.get()
+            if not refresh and mirror.covers_apis(apis):
+                columns, rows = mirror.query(
+                    sql_mirror, {"apis": mirror.api_list(apis),
+                                 "since": mirror.months_ago(62, trunc_month=False),
+                                 "until": mirror.months_ago(0, trunc_month=False)},
+                    date_cols=("DATE",))
+            else:
+                columns, rows = query_cache.run_query(sql_query, {"apis": formatted}, refresh=refresh)
+            if columns:
                 df = pd.DataFrame(rows, columns=columns)
                 if 'DATE' in df.columns:
                     df['DATE'] = pd.to_datetime(df['DATE'], errors='coerce')
                 self.display_results(df, apply_global_sort=False)
                 self.current_data = df
             else:
-                conn.commit()
                 messagebox.showinfo("Query Executed", "No results to display.")
                 self.clear_results()
-            cursor.close(); conn.close()
         except ConnectionError as e:
             messagebox.showerror("Connection Error", str(e)); self.clear_results()
         except oracledb.Error as e:
@@ -814,7 +576,6 @@ class DailyInjectionPressureTab(tb.Frame, TreeviewMixin):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
-        self.conn_manager = OracleConnectionManager()
         self.current_data = None
         self._build()
 
@@ -827,8 +588,7 @@ class DailyInjectionPressureTab(tb.Frame, TreeviewMixin):
         self.tree_frame, self.result_tree = build_treeview(self)
         self.tree_frame.pack(pady=10, padx=20, fill="both", expand=True)
 
-        tb.Button(self, text="Copy Results to Clipboard", command=self.copy_to_clipboard,
-                  bootstyle="secondary").pack(pady=10)
+        self.build_output_buttons()
 
     def pull_data(self):
         apis = self.app.api_tab.get_apis()
@@ -851,27 +611,21 @@ class DailyInjectionPressureTab(tb.Frame, TreeviewMixin):
         JOIN cmpl_dly_fact cf ON cd.cmpl_fac_id = cf.cmpl_fac_id
         WHERE wd.actv_indc = 'Y' AND cd.actv_indc = 'Y'
             AND cf.eftv_dttm >= TRUNC(SYSDATE) - 60
-            AND wd.well_api_nbr IN ({formatted})
+            AND wd.well_api_nbr IN {API_IN_LIST}
         ORDER BY cf.eftv_dttm
         """
 
         try:
-            conn = self.conn_manager.get_connection('odw')
-            cursor = conn.cursor()
-            cursor.execute(sql_query)
-            if cursor.description:
-                rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
+            columns, rows = query_cache.run_query(sql_query, {"apis": formatted}, refresh=self.app.force_refresh.get())
+            if columns:
                 df = pd.DataFrame(rows, columns=columns)
                 if 'EFTV_DTTM' in df.columns:
                     df['EFTV_DTTM'] = pd.to_datetime(df['EFTV_DTTM'], errors='coerce')
                 self.display_results(df, apply_global_sort=False)
                 self.current_data = df
             else:
-                conn.commit()
                 messagebox.showinfo("Query Executed", "No results to display.")
                 self.clear_results()
-            cursor.close(); conn.close()
         except ConnectionError as e:
             messagebox.showerror("Connection Error", str(e)); self.clear_results()
         except oracledb.Error as e:
@@ -897,6 +651,13 @@ class MainApplication(tb.Window):
 
         self.shared_data = {}
 
+        # "Force refresh" — every tab's pull bypasses the local query cache
+        self.force_refresh = tk.BooleanVar(value=False)
+        bar = tb.Frame(self)
+        bar.pack(fill="x", padx=10, pady=(10, 0))
+        tb.Checkbutton(bar, text="Force refresh (skip cached results)",
+                       variable=self.force_refresh, bootstyle="round-toggle").pack(side="right")
+
         # Create Notebook (tab container)
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
@@ -925,5 +686,7 @@ class MainApplication(tb.Window):
 
 
 if __name__ == "__main__":
+    startup.mark("imports")
     app = MainApplication()
+    startup.first_paint(app, then=lambda: startup.preload(pd, background=True))
     app.mainloop()
\ No newline at end of file
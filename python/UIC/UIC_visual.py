@@ -15,47 +15,34 @@ Run:            python uic_dashboard.py
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading, csv, sys
+import threading, sys, os
 from datetime import datetime
-from collections import defaultdict
 
-# ═══════════════════════════════════════════════════════════════════════════════
-TNS_ALIAS   = "ODW"
-DB_USERNAME = "rptguser"
-DB_PASSWORD = "allusers"
-# ═══════════════════════════════════════════════════════════════════════════════
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup       # lazy heavy imports + startup timing — see python/common/
+from common import query_cache   # pooled + disk-cached ODW reads — see python/common/
+from common.vtable import VirtualTable   # only the visible rows live in Tk
+from common import mirror        # local cmpl_mnly_fact replica (common/mirror.py)
+from common import export        # streamed .csv / .xlsx / .parquet exports
 
-try:
-    import oracledb
-except ImportError:
+if not startup.available("oracledb"):
     sys.exit("ERROR: oracledb not installed.  Run:  pip install oracledb")
 
-try:
-    import matplotlib
-    matplotlib.use("TkAgg")
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    import matplotlib.ticker as mticker
-    HAS_MPL = True
-except ImportError:
-    HAS_MPL = False
-
+# numpy / matplotlib load with the first result set, not before the window
+HAS_MPL = startup.available("matplotlib") and startup.available("numpy")
+FigureCanvasTkAgg = startup.lazy("matplotlib.backends.backend_tkagg", "FigureCanvasTkAgg")
+NavigationToolbar2Tk = startup.lazy("matplotlib.backends.backend_tkagg", "NavigationToolbar2Tk")
+Figure = startup.lazy("matplotlib.figure", "Figure")
+mdates = startup.lazy("matplotlib.dates")
+mticker = startup.lazy("matplotlib.ticker")
+np = startup.lazy("numpy")
+ChartHost = startup.lazy("common.charts", "ChartHost")   # one figure per chart tab, updated in place
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DB helpers
 # ─────────────────────────────────────────────────────────────────────────────
-def get_connection():
-    try: oracledb.init_oracle_client()
-    except: pass
-    return oracledb.connect(user=DB_USERNAME, password=DB_PASSWORD, dsn=TNS_ALIAS)
-
-def run_query(sql, params=None):
-    conn = get_connection(); cur = conn.cursor()
-    cur.execute(sql, params or {})
-    cols = [d[0] for d in cur.description]; rows = cur.fetchall()
-    cur.close(); conn.close()
-    return cols, rows
+def run_query(sql, params=None, refresh=False):
+    return query_cache.run_query(sql, params, "odw", refresh=refresh)
 
 def fmt(val):
     if val is None: return ""
@@ -154,39 +141,91 @@ WHERE cd.well_api_nbr IN ({in_list})
   AND cmf.eftv_dttm >= ADD_MONTHS(TRUNC(SYSDATE, 'MM'), -120)
 ORDER BY cd.cmpl_nme, TRUNC(cmf.eftv_dttm, 'MM')"""
 
+# Per-well monthly data from the local replica (SQLite) — same 17 columns
+SQL_PRODUCTION_BY_API_MIRROR = """
+SELECT cd.cmpl_nme AS WELL_NME, cd.well_api_nbr AS WELL_API_NBR,
+       substr(cmf.eftv_dttm, 1, 8) || '01 00:00:00' AS MONTH_DT,
+       cmf.aloc_oil_prod_vol_qty AS OIL_VOL, cmf.aloc_wtr_prod_vol_qty AS WATER_VOL,
+       cmf.aloc_gas_prod_vol_qty AS GAS_VOL, cmf.aloc_gros_prod_vol_qty AS GROSS_VOL,
+       cmf.aloc_stm_inj_vol_qty AS STEAM_INJ_VOL, cmf.aloc_wtr_inj_vol_qty AS WATER_INJ_VOL,
+       cmf.aloc_gas_inj_vol_qty AS GAS_INJ_VOL,
+       cmf.aloc_oil_prod_dly_rte_qty AS OIL_RATE, cmf.aloc_wtr_prod_dly_rte_qty AS WATER_RATE,
+       cmf.aloc_gas_prod_dly_rte_qty AS GAS_RATE, cmf.aloc_gros_prod_dly_rte_qty AS GROSS_RATE,
+       cmf.aloc_stm_inj_dly_rte_qty AS STEAM_INJ_RATE,
+       cmf.aloc_wtr_inj_dly_rte_qty AS WATER_INJ_RATE,
+       cmf.aloc_gas_inj_dly_rte_qty AS GAS_INJ_RATE
+FROM cmpl_dmn cd
+JOIN cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+WHERE cd.well_api_nbr IN (SELECT value FROM json_each(:apis))
+  AND cd.actv_indc = 'Y'
+  AND cmf.eftv_dttm >= :since
+ORDER BY cd.cmpl_nme, MONTH_DT"""
+
+def production_by_well(apis, odw_sql, refresh=False):
+    """Per-well monthly rows — local replica when every API is mirrored, else ODW."""
+    if not refresh and apis and mirror.covers_apis(apis):
+        return mirror.query(SQL_PRODUCTION_BY_API_MIRROR,
+                            {"apis": mirror.api_list(apis), "since": mirror.months_ago(120)},
+                            date_cols=("MONTH_DT",))
+    return run_query(odw_sql, refresh=refresh)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-well monthly cube — pivoted once per load, any well subset sums in numpy
+# ─────────────────────────────────────────────────────────────────────────────
+NUM_VAL_COLS = 14   # per-well query value columns 3..16 (OIL_VOL .. GAS_INJ_RATE)
+
+class ProdCube:
+    """prod_well_rows as a dense [well x month x metric] float array."""
+
+    def __init__(self, rows):
+        self.wells = sorted({r[0] for r in rows}); self.months = sorted({r[2] for r in rows})
+        self.well_idx = {w: i for i, w in enumerate(self.wells)}
+        month_idx = {m: i for i, m in enumerate(self.months)}
+        self.vals = np.zeros((len(self.wells), len(self.months), NUM_VAL_COLS))
+        self.present = np.zeros((len(self.wells), len(self.months)), dtype=bool)  # well had a row
+        if rows:
+            wi = np.fromiter((self.well_idx[r[0]] for r in rows), np.intp, len(rows))
+            mi = np.fromiter((month_idx[r[2]] for r in rows), np.intp, len(rows))
+            v = np.array([r[3:3 + NUM_VAL_COLS] for r in rows], dtype=float)   # None -> NaN
+            np.add.at(self.vals, (wi, mi), np.nan_to_num(v))   # same name twice in a month adds up
+            self.present[wi, mi] = True
+
+    def aggregate(self, selected_wells=None):
+        """[(MONTH_DT, val0..val13)] summed over the wells (None = all), months with data only."""
+        if selected_wells is None:
+            vals, present = self.vals, self.present
+        else:
+            idx = [self.well_idx[w] for w in selected_wells if w in self.well_idx]
+            vals, present = self.vals[idx], self.present[idx]
+        total = vals.sum(axis=0); keep = present.any(axis=0)
+        return [(self.months[m],) + tuple(total[m].tolist()) for m in np.flatnonzero(keep)]
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Treeview helpers
 # ─────────────────────────────────────────────────────────────────────────────
 def populate_tree(tree, columns, rows, col_widths=None):
-    tree.delete(*tree.get_children())
     dcols = ["#"] + list(columns); tree["columns"] = dcols; tree["show"] = "headings"
     tree.heading("#", text="#", anchor="center"); tree.column("#", width=45, anchor="center", stretch=False)
     for c in columns:
         tree.heading(c, text=c, anchor="w", command=lambda col=c: _sort_tree(tree, col, False))
         tree.column(c, width=(col_widths or {}).get(c, max(80, len(c)*9)), anchor="w")
-    for i, row in enumerate(rows):
-        tree.insert("", "end", values=[i+1]+[fmt(v) for v in row], tags=("even" if i%2==0 else "odd",))
+    VirtualTable.attach(tree, formatter=fmt, number_col="#").set_rows(columns, rows)
 
 def _sort_tree(tree, col, rev):
-    data = [(tree.set(k, col), k) for k in tree.get_children("")]
-    try: data.sort(key=lambda t: float(t[0].replace(",","")), reverse=rev)
-    except: data.sort(key=lambda t: t[0], reverse=rev)
-    for i,(_,k) in enumerate(data):
-        tree.move(k,"",i); tree.item(k, tags=("even" if i%2==0 else "odd",)); tree.set(k,"#",i+1)
+    VirtualTable.of(tree).sort(col, rev)
     tree.heading(col, command=lambda: _sort_tree(tree, col, not rev))
 
 def export_tree(tree, title="export"):
-    ch = tree.get_children()
-    if not ch: messagebox.showinfo("No Data","Nothing to export."); return
-    path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")],
+    vt = VirtualTable.of(tree)
+    if not vt or not len(vt): messagebox.showinfo("No Data","Nothing to export."); return
+    path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=export.FILETYPES,
         initialfile=f"{title}_{datetime.now():%Y%m%d_%H%M%S}.csv")
     if not path: return
-    cols = [c for c in tree["columns"] if c!="#"]
-    with open(path,"w",newline="",encoding="utf-8") as f:
-        w = csv.writer(f); w.writerow(cols)
-        for c in ch: w.writerow(tree.item(c,"values")[1:])
-    messagebox.showinfo("Saved",f"{len(ch)} rows -> {path}")
+    try: n = vt.export(path)    # typed values, streamed — see common/export.py
+    except Exception as e: messagebox.showerror("Export Error", str(e)); return
+    messagebox.showinfo("Saved",f"{n:,} rows -> {path}")
 
 
 COLORS = {
@@ -209,7 +248,9 @@ class App:
         self.projects_rows=[]; self.all_proj_items=[]
         self.well_cols=[]; self.well_rows=[]
         self.prod_well_cols=[]; self.prod_well_rows=[]  # per-well monthly data
+        self.prod_cube=None  # ProdCube of prod_well_rows, built in the load thread
         self.selected_codes=[]; self.well_list_for_charts=[]  # [(well_nme, api), ...]
+        self.refresh=False  # "Force refresh" — bypass the local query cache
         self._style(); self._build_ui(); self._statusbar()
         self._set_status("Connecting to database ...")
         self.root.after(100, self._load_projects)
@@ -235,6 +276,9 @@ class App:
         ttk.Label(hdr,text="UIC Project Dashboard",style="Header.TLabel").pack(side="left")
         ttk.Label(hdr,text="Underground Injection Control — Surveillance & Reporting",
                   style="Sub.TLabel").pack(side="left",padx=15)
+        self.force_refresh=tk.BooleanVar(value=False)
+        ttk.Checkbutton(hdr,text="Force refresh",variable=self.force_refresh,
+            command=lambda: setattr(self,"refresh",self.force_refresh.get())).pack(side="right")
         pw=ttk.PanedWindow(self.root,orient="horizontal")
         pw.pack(fill="both",expand=True,padx=10,pady=(0,5))
         # LEFT — project picker
@@ -297,7 +341,7 @@ class App:
         threading.Thread(target=self._load_projects_bg, daemon=True).start()
     def _load_projects_bg(self):
         try:
-            cols,rows = run_query(SQL_PROJECTS); self.projects_rows=rows
+            cols,rows = run_query(SQL_PROJECTS, refresh=self.refresh); self.projects_rows=rows
             self.root.after(0,self._populate_projects)
         except Exception as e:
             self.root.after(0,lambda: messagebox.showerror("Database Error",f"Cannot connect:\n{e}"))
@@ -331,11 +375,15 @@ class App:
     def _load_bg(self, codes):
         try:
             self.root.after(0,lambda: self._set_status("Querying wells ..."))
-            wc,wr = run_query(sql_wells(codes)); self.well_cols=wc; self.well_rows=wr
+            wc,wr = run_query(sql_wells(codes), refresh=self.refresh); self.well_cols=wc; self.well_rows=wr
 
             self.root.after(0,lambda: self._set_status("Querying per-well production & injection ..."))
-            pc,pr = run_query(sql_production_by_well(codes))
+            apis=sorted({r[1] for r in wr if r[1]})
+            pc,pr = production_by_well(apis, sql_production_by_well(codes), self.refresh)
             self.prod_well_cols=pc; self.prod_well_rows=pr
+            self.prod_cube = ProdCube(pr) if HAS_MPL else None
+            if HAS_MPL:   # the chart tabs are next: import matplotlib here, not on the Tk thread
+                startup.preload(Figure, FigureCanvasTkAgg, mdates, mticker, ChartHost)
 
             # Build well list for chart selectors: unique (well_nme, api)
             seen=set(); wl=[]
@@ -385,13 +433,16 @@ class App:
         try:
             self.root.after(0, lambda: self._set_status(
                 f"Querying well details for {len(apis)} API(s) ..."))
-            wc, wr = run_query(sql_wells_by_api(apis))
+            wc, wr = run_query(sql_wells_by_api(apis), refresh=self.refresh)
             self.well_cols = wc; self.well_rows = wr
 
             self.root.after(0, lambda: self._set_status(
                 f"Querying per-well production & injection for {len(apis)} API(s) ..."))
-            pc, pr = run_query(sql_production_by_well_api(apis))
+            pc, pr = production_by_well(apis, sql_production_by_well_api(apis), self.refresh)
             self.prod_well_cols = pc; self.prod_well_rows = pr
+            self.prod_cube = ProdCube(pr) if HAS_MPL else None
+            if HAS_MPL:
+                startup.preload(Figure, FigureCanvasTkAgg, mdates, mticker, ChartHost)
 
             # Build well list for chart selectors
             seen = set(); wl = []
@@ -436,19 +487,9 @@ class App:
         Access in charts: r[0]=date, r[1]=OIL_VOL .. r[7]=GAS_INJ_VOL,
                           r[8]=OIL_RATE .. r[14]=GAS_INJ_RATE
         """
-        NUM_VAL_COLS = 14  # columns 3..16
-        monthly = defaultdict(lambda: [0.0] * NUM_VAL_COLS)
-        for r in self.prod_well_rows:
-            wn = r[0]
-            if selected_wells is not None and wn not in selected_wells:
-                continue
-            dt = r[2]  # MONTH_DT
-            for i in range(NUM_VAL_COLS):
-                monthly[dt][i] += float(r[3 + i] or 0)
-        result = []
-        for dt in sorted(monthly.keys()):
-            result.append((dt,) + tuple(monthly[dt]))
-        return result
+        if self.prod_cube is None:
+            self.prod_cube = ProdCube(self.prod_well_rows)
+        return self.prod_cube.aggregate(selected_wells)
 
     # ── Cards ────────────────────────────────────────────────────────────────
     def _update_cards(self):
@@ -564,14 +605,25 @@ class App:
         self.inj_lb = self._make_well_selector(outer, self._refresh_inj_chart)
         self.inj_chart_frame = tk.Frame(outer, bg=self.PANEL)
         self.inj_chart_frame.pack(side="left", fill="both", expand=True)
+        self.inj_host = ChartHost(self.inj_chart_frame, figsize=(10,5))   # reused by every refresh
         self._refresh_inj_chart()
 
+    def _inj_axes(self, fig):
+        ax=fig.add_subplot(111); ax2=ax.twinx()
+        ax.set_ylabel("Avg Daily Injection Rate",fontsize=10,color=self.ACCENT)
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
+        ax2.set_ylabel("Water Prod (BWPD)",fontsize=10,color=COLORS["water_prod"])
+        ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
+        ax2.tick_params(labelsize=8,labelcolor=COLORS["water_prod"])
+        ax.grid(axis="y",alpha=0.3,linestyle="--"); ax.set_axisbelow(True)
+        return ax, ax2
+
     def _refresh_inj_chart(self):
-        for w in self.inj_chart_frame.winfo_children(): w.destroy()
+        host = self.inj_host
         wells = self._get_selected_well_set(self.inj_lb)
         data = self._aggregate_data(wells)
         if not data:
-            tk.Label(self.inj_chart_frame,text="No data for selection.",bg=self.PANEL).pack(pady=40); return
+            host.message("No data for selection."); return
         suffix = self._get_chart_title_suffix(self.inj_lb)
         # Aggregated: r[0]=date, r[1..7]=vols, r[8..14]=rates
         # Rates: r[8]=OIL_RATE, r[9]=WATER_RATE, r[10]=GAS_RATE, r[11]=GROSS_RATE,
@@ -579,26 +631,19 @@ class App:
         dates=[r[0] for r in data]
         stm=[r[12] for r in data]; winj=[r[13] for r in data]
         ginj=[r[14] for r in data]; wprod=[r[9] for r in data]
-        fig=Figure(figsize=(10,5),dpi=100,facecolor="white"); ax=fig.add_subplot(111); lines=[]
+        ax, ax2 = host.begin("inj", self._inj_axes)
         if any(v>0 for v in stm):
-            l,=ax.plot(dates,stm,color=COLORS["steam_inj"],lw=1.8,label="Steam Inj (BWE/d)"); lines.append(l)
+            host.line("stm",ax,dates,stm,color=COLORS["steam_inj"],lw=1.8,label="Steam Inj (BWE/d)")
         if any(v>0 for v in winj):
-            l,=ax.plot(dates,winj,color=COLORS["water_inj"],lw=1.8,label="Water Inj (BWPD)"); lines.append(l)
+            host.line("winj",ax,dates,winj,color=COLORS["water_inj"],lw=1.8,label="Water Inj (BWPD)")
         if any(v>0 for v in ginj):
-            l,=ax.plot(dates,ginj,color=COLORS["gas_inj"],lw=1.5,linestyle="--",label="Gas Inj (MCFD)"); lines.append(l)
-        ax.set_ylabel("Avg Daily Injection Rate",fontsize=10,color=self.ACCENT)
-        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
-        if any(v>0 for v in wprod):
-            ax2=ax.twinx()
-            l,=ax2.plot(dates,wprod,color=COLORS["water_prod"],lw=1.5,linestyle="-.",alpha=0.8,label="Water Prod (BWPD)")
-            lines.append(l); ax2.set_ylabel("Water Prod (BWPD)",fontsize=10,color=COLORS["water_prod"])
-            ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
-            ax2.tick_params(labelsize=8,labelcolor=COLORS["water_prod"])
+            host.line("ginj",ax,dates,ginj,color=COLORS["gas_inj"],lw=1.5,linestyle="--",label="Gas Inj (MCFD)")
+        has_wprod = any(v>0 for v in wprod); ax2.set_visible(has_wprod)
+        if has_wprod:
+            host.line("wprod",ax2,dates,wprod,color=COLORS["water_prod"],lw=1.5,linestyle="-.",alpha=0.8,label="Water Prod (BWPD)")
         ax.set_title(f"Avg Daily Injection Rates  {suffix}",fontsize=11,fontweight="bold",color=self.ACCENT,pad=10)
-        if lines: ax.legend(lines,[l.get_label() for l in lines],fontsize=8,loc="upper left",framealpha=0.9)
-        self._fmt_x(ax,dates); ax.grid(axis="y",alpha=0.3,linestyle="--"); ax.set_axisbelow(True); fig.tight_layout()
-        canvas=FigureCanvasTkAgg(fig,self.inj_chart_frame); canvas.draw()
-        NavigationToolbar2Tk(canvas,self.inj_chart_frame).update(); canvas.get_tk_widget().pack(fill="both",expand=True)
+        host.legend(ax,[ax2],fontsize=8,loc="upper left",framealpha=0.9)
+        self._fmt_x(ax,dates); host.finish()
 
     # ══════════════════════════════════════════════════════════════════════════
     # Tab 3: Production
@@ -611,34 +656,38 @@ class App:
         self.prod_lb=self._make_well_selector(outer,self._refresh_prod_chart)
         self.prod_chart_frame=tk.Frame(outer,bg=self.PANEL)
         self.prod_chart_frame.pack(side="left",fill="both",expand=True)
+        self.prod_host=ChartHost(self.prod_chart_frame,figsize=(10,5))
         self._refresh_prod_chart()
 
+    def _prod_axes(self, fig):
+        ax1=fig.add_subplot(111); ax2=ax1.twinx()
+        ax1.set_ylabel("Oil Production (BOPD)",fontsize=10,color=COLORS["oil"])
+        ax1.tick_params(axis="y",labelsize=9,labelcolor=COLORS["oil"])
+        ax1.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
+        ax2.set_ylabel("Gas Production (MCFD)",fontsize=10,color=COLORS["gas_prod"])
+        ax2.tick_params(axis="y",labelsize=9,labelcolor=COLORS["gas_prod"])
+        ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
+        ax1.grid(axis="y",alpha=0.3,linestyle="--"); ax1.set_axisbelow(True)
+        return ax1, ax2
+
     def _refresh_prod_chart(self):
-        for w in self.prod_chart_frame.winfo_children(): w.destroy()
+        host=self.prod_host
         wells=self._get_selected_well_set(self.prod_lb)
         data=self._aggregate_data(wells)
         if not data:
-            tk.Label(self.prod_chart_frame,text="No data for selection.",bg=self.PANEL).pack(pady=40); return
+            host.message("No data for selection."); return
         suffix=self._get_chart_title_suffix(self.prod_lb)
         dates=[r[0] for r in data]; oil=[r[8] for r in data]; gas=[r[10] for r in data]
-        fig=Figure(figsize=(10,5),dpi=100,facecolor="white"); ax1=fig.add_subplot(111); lines=[]
+        ax1,ax2=host.begin("prod",self._prod_axes)
         if any(v>0 for v in oil):
-            ax1.fill_between(dates,oil,alpha=0.10,color=COLORS["oil"])
-            l,=ax1.plot(dates,oil,color=COLORS["oil"],lw=2.2,label="Oil (BOPD)"); lines.append(l)
-        ax1.set_ylabel("Oil Production (BOPD)",fontsize=10,color=COLORS["oil"])
-        ax1.tick_params(axis="y",labelsize=9,labelcolor=COLORS["oil"])
-        ax1.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
-        if any(v>0 for v in gas):
-            ax2=ax1.twinx()
-            l,=ax2.plot(dates,gas,color=COLORS["gas_prod"],lw=1.5,linestyle="--",label="Gas (MCFD)"); lines.append(l)
-            ax2.set_ylabel("Gas Production (MCFD)",fontsize=10,color=COLORS["gas_prod"])
-            ax2.tick_params(axis="y",labelsize=9,labelcolor=COLORS["gas_prod"])
-            ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
+            host.fill("oil_fill",ax1,dates,oil,alpha=0.10,color=COLORS["oil"])
+            host.line("oil",ax1,dates,oil,color=COLORS["oil"],lw=2.2,label="Oil (BOPD)")
+        has_gas=any(v>0 for v in gas); ax2.set_visible(has_gas)
+        if has_gas:
+            host.line("gas",ax2,dates,gas,color=COLORS["gas_prod"],lw=1.5,linestyle="--",label="Gas (MCFD)")
         ax1.set_title(f"Avg Daily Oil & Gas Production  {suffix}",fontsize=11,fontweight="bold",color=self.ACCENT,pad=10)
-        if lines: ax1.legend(lines,[l.get_label() for l in lines],fontsize=9,loc="upper right",framealpha=0.9)
-        self._fmt_x(ax1,dates); ax1.grid(axis="y",alpha=0.3,linestyle="--"); ax1.set_axisbelow(True); fig.tight_layout()
-        canvas=FigureCanvasTkAgg(fig,self.prod_chart_frame); canvas.draw()
-        NavigationToolbar2Tk(canvas,self.prod_chart_frame).update(); canvas.get_tk_widget().pack(fill="both",expand=True)
+        host.legend(ax1,[ax2],fontsize=9,loc="upper right",framealpha=0.9)
+        self._fmt_x(ax1,dates); host.finish()
 
     # ══════════════════════════════════════════════════════════════════════════
     # Tab 4: Cumulative + table
@@ -651,34 +700,9 @@ class App:
         self.cum_lb=self._make_well_selector(outer,self._refresh_cum_chart)
         self.cum_chart_frame=tk.Frame(outer,bg=self.PANEL)
         self.cum_chart_frame.pack(side="left",fill="both",expand=True)
-        self._refresh_cum_chart()
-
-    def _refresh_cum_chart(self):
-        for w in self.cum_chart_frame.winfo_children(): w.destroy()
-        wells=self._get_selected_well_set(self.cum_lb)
-        data=self._aggregate_data(wells)
-        if not data:
-            tk.Label(self.cum_chart_frame,text="No data for selection.",bg=self.PANEL).pack(pady=40); return
-        suffix=self._get_chart_title_suffix(self.cum_lb)
-        import numpy as np
-        dates=[r[0] for r in data]
-        oil=[r[1] for r in data]; water=[r[2] for r in data]; gas=[r[3] for r in data]
-        steam=[r[5] for r in data]; winj=[r[6] for r in data]; ginj=[r[7] for r in data]
-        co,cw,cg,cs,cwi,cgi = np.cumsum(oil),np.cumsum(water),np.cumsum(gas),np.cumsum(steam),np.cumsum(winj),np.cumsum(ginj)
         # Chart
         cf=tk.Frame(self.cum_chart_frame,bg=self.PANEL); cf.pack(fill="both",expand=True)
-        fig=Figure(figsize=(10,3.5),dpi=100,facecolor="white"); ax=fig.add_subplot(111)
-        ax.plot(dates,co,color=COLORS["cum_oil"],lw=2.5,label="Cum Oil")
-        ax.plot(dates,cw,color=COLORS["cum_water"],lw=1.8,label="Cum Water")
-        ax.plot(dates,cs,color=COLORS["cum_steam"],lw=2,linestyle="--",label="Cum Steam Inj")
-        ax.plot(dates,cwi,color=COLORS["cum_winj"],lw=1.5,linestyle="--",label="Cum Water Inj")
-        ax.plot(dates,cgi,color=COLORS["cum_ginj"],lw=1.5,linestyle=":",label="Cum Gas Inj")
-        ax.set_title(f"Cumulative  {suffix}",fontsize=11,fontweight="bold",color=self.ACCENT,pad=8)
-        ax.set_ylabel("Cumulative (bbl)",fontsize=9); ax.legend(fontsize=7,loc="upper left",framealpha=0.9)
-        self._fmt_x(ax,dates); ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
-        ax.grid(axis="y",alpha=0.3,linestyle="--"); ax.set_axisbelow(True); fig.tight_layout()
-        canvas=FigureCanvasTkAgg(fig,cf); canvas.draw()
-        NavigationToolbar2Tk(canvas,cf).update(); canvas.get_tk_widget().pack(fill="both",expand=True)
+        self.cum_host=ChartHost(cf,figsize=(10,3.5))
         # Table
         tk.Label(self.cum_chart_frame,text="Cumulative Summary",font=("Segoe UI",9,"bold"),
                  bg=self.PANEL,fg=self.ACCENT).pack(anchor="w",padx=6,pady=(4,1))
@@ -693,6 +717,39 @@ class App:
         tf.columnconfigure(0,weight=1); tf.rowconfigure(0,weight=1)
         ct.tag_configure("even",background="#f0f4f8"); ct.tag_configure("odd",background="white")
         ct.tag_configure("total",background="#e0e7ff",font=("Consolas",9,"bold"))
+        self.cum_tree=ct
+        self._refresh_cum_chart()
+
+    def _cum_axes(self, fig):
+        ax=fig.add_subplot(111)
+        ax.set_ylabel("Cumulative (bbl)",fontsize=9)
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x,_: fmt_num(x)))
+        ax.grid(axis="y",alpha=0.3,linestyle="--"); ax.set_axisbelow(True)
+        return [ax]
+
+    def _refresh_cum_chart(self):
+        host=self.cum_host; ct=self.cum_tree
+        ct.delete(*ct.get_children())
+        wells=self._get_selected_well_set(self.cum_lb)
+        data=self._aggregate_data(wells)
+        if not data:
+            host.message("No data for selection."); return
+        suffix=self._get_chart_title_suffix(self.cum_lb)
+        dates=[r[0] for r in data]
+        oil=[r[1] for r in data]; water=[r[2] for r in data]; gas=[r[3] for r in data]
+        steam=[r[5] for r in data]; winj=[r[6] for r in data]; ginj=[r[7] for r in data]
+        co,cw,cg,cs,cwi,cgi = np.cumsum(oil),np.cumsum(water),np.cumsum(gas),np.cumsum(steam),np.cumsum(winj),np.cumsum(ginj)
+        # Chart
+        ax,=host.begin("cum",self._cum_axes)
+        host.line("cum_oil",ax,dates,co,color=COLORS["cum_oil"],lw=2.5,label="Cum Oil")
+        host.line("cum_water",ax,dates,cw,color=COLORS["cum_water"],lw=1.8,label="Cum Water")
+        host.line("cum_steam",ax,dates,cs,color=COLORS["cum_steam"],lw=2,linestyle="--",label="Cum Steam Inj")
+        host.line("cum_winj",ax,dates,cwi,color=COLORS["cum_winj"],lw=1.5,linestyle="--",label="Cum Water Inj")
+        host.line("cum_ginj",ax,dates,cgi,color=COLORS["cum_ginj"],lw=1.5,linestyle=":",label="Cum Gas Inj")
+        ax.set_title(f"Cumulative  {suffix}",fontsize=11,fontweight="bold",color=self.ACCENT,pad=8)
+        host.legend(ax,fontsize=7,loc="upper left",framealpha=0.9)
+        self._fmt_x(ax,dates); host.finish()
+        # Table
         for i in range(len(dates)):
             dt=dates[i].strftime("%Y-%m") if hasattr(dates[i],"strftime") else str(dates[i])[:7]
             ct.insert("","end",values=[dt,f"{oil[i]:,.0f}",f"{water[i]:,.0f}",f"{gas[i]:,.0f}",
@@ -759,7 +816,8 @@ class App:
         return tree
 
 def main():
-    root = tk.Tk(); App(root); root.mainloop()
+    startup.mark("imports")
+    root = tk.Tk(); App(root); startup.first_paint(root); root.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import os
+import sys
 import shutil
 import threading
 from datetime import datetime
@@ -9,39 +10,9 @@ import oracledb
 import pandas as pd
 import queue
 
-# --- CONNECTION FIX: Enable Thick Mode ---
-try:
-    oracledb.init_oracle_client()
-except Exception as e:
-    print(f"Warning: Could not initialize Oracle thick client. {e}")
-# -----------------------------------------
-
-
 # --- ORACLE CONNECTION MANAGER ---
-class OracleConnectionManager:
-    """ Manages Oracle database connections. """
-    def __init__(self):
-        self._connections = {
-            "odw": {
-                "user": os.getenv("DB_USER_ODW", "rptguser"),
-                "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
-                "dsn": "odw"
-            }
-        }
-
-    def get_connection(self, name):
-        if name not in self._connections:
-            raise ValueError(f"Unknown DB connection name: {name}")
-        config = self._connections[name]
-        try:
-            return oracledb.connect(
-                user=config['user'],
-                password=config['password'],
-                dsn=config['dsn']
-            )
-        except oracledb.Error as e:
-            error_obj, = e.args
-            raise ConnectionError(f"Failed to connect to Oracle DB '{name}': {error_obj.message}") from e
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.db import OracleConnectionManager   # pooled sessions — python/common/db.py
 
 
 # --- MAIN APPLICATION ---
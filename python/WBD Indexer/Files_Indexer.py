@@ -1,18 +1,49 @@
 import os
+import sys
 import json
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, Listbox, Scrollbar, Frame, Button, Label
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.crawler import Crawler   # parallel scandir workers — see python/common/
+from common.compact_index import shards_dir_for, write_shards   # gzip shards for the search pages
+
 CONFIG_FILE = 'config.json'
+FULL_RELIST_DAYS = 7   # re-list a folder at least this often, even if its mtime hasn't moved
+
+
+def html_path(path):
+    """Index form of a path (backslashes), as stored in each record's 'path'."""
+    return path.replace('/', '\\')
+
+
+def dirs_file_for(output_file):
+    """Sidecar holding the folder state of `output_file`: index.json -> index_dirs.json."""
+    base, _ = os.path.splitext(output_file)
+    return base + '_dirs.json'
+
 
 def create_index(folder_paths, output_file, status_callback, progress_callback):
     """
     Scans folders and creates/updates a JSON index file with file metadata.
     Supports incremental updates to speed up re-scans.
+
+    Besides the index, <output>_dirs.json records every folder's mtime, entry
+    count and subfolders.  On a re-scan a folder whose mtime and entry count
+    still match is not listed again: its files are copied from the old index
+    and only its subfolders are visited (one stat each), so an unchanged share
+    costs one round trip per folder instead of a full listing.  Adding,
+    removing or renaming an entry changes the folder's mtime; a file edited in
+    place does not, so every folder is still fully re-listed once it is
+    FULL_RELIST_DAYS old.  Delete the _dirs.json file to force a full scan.
     """
     
     # --- Step 1: Load existing index if it exists ---
     old_index = {}
+    old_by_dir = {}
+    old_dirs = {}
+    dirs_file = dirs_file_for(output_file)
     if os.path.exists(output_file):
         status_callback("Loading existing index for comparison...")
         try:
@@ -21,63 +52,136 @@ def create_index(folder_paths, output_file, status_callback, progress_callback):
                 old_data = json.load(f)
                 for item in old_data:
                     old_index[item['path']] = item
+                    old_by_dir.setdefault(item['path'].rsplit('\\', 1)[0], []).append(item)
         except (json.JSONDecodeError, IOError) as e:
             status_callback(f"Warning: Could not read old index. Performing full scan. Error: {e}")
             old_index = {}
+            old_by_dir = {}
+        if old_index and os.path.exists(dirs_file):
+            try:
+                with open(dirs_file, 'r', encoding='utf-8') as f:
+                    old_dirs = json.load(f).get('dirs', {})
+            except (json.JSONDecodeError, IOError, AttributeError) as e:
+                status_callback(f"Warning: Could not read folder state, listing every folder. Error: {e}")
+                old_dirs = {}
 
     # --- Step 2: Walk through directories and update index ---
     new_index = []
+    new_dirs = {}
     paths_found = set()
+    dir_mtimes = {}
+    now = time.time()
+    max_age = FULL_RELIST_DAYS * 86400
     status_callback("Starting to scan folders...")
-    
+
+    def reuse(path):
+        """(subfolders, old file records) if `path` is unchanged since the last
+        scan, else None.  Runs on the crawler's worker threads."""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None                       # let the listing report it
+        dir_mtimes[path] = mtime
+        rec = old_dirs.get(html_path(path))
+        try:
+            if rec is None or rec.get('mtime') != mtime or now - rec.get('listed', 0) > max_age:
+                return None
+            files = old_by_dir.get(html_path(path), [])
+            if rec.get('count') != len(rec['subdirs']) + len(files):
+                return None                   # old index and folder state disagree
+            return [os.path.join(path, name) for name in rec['subdirs']], files
+        except (AttributeError, KeyError, TypeError):
+            return None                       # older / hand-edited _dirs.json entry: list it
+
+    roots = []
     for folder_path in folder_paths:
-        status_callback(f"Scanning: {folder_path}...")
         if not os.path.exists(folder_path):
             status_callback(f"WARNING: Path not found, skipping: {folder_path}")
             continue
-        
-        for root, _, files in os.walk(folder_path):
-            progress_callback() # Update progress bar for visual feedback
-            for filename in files:
-                try:
-                    full_path = os.path.join(root, filename)
-                    path_for_html = full_path.replace('/', '\\')
-                    paths_found.add(full_path)
-                    
-                    # Get file metadata
-                    mtime = os.path.getmtime(full_path)
-                    
-                    # If file is in old index and hasn't changed, reuse old data
-                    if full_path in old_index and old_index[full_path]['mtime'] == mtime:
-                        new_index.append(old_index[full_path])
-                        continue
-
-                    # Otherwise, it's a new or modified file, get fresh data
-                    file_stat = os.stat(full_path)
-                    _, extension = os.path.splitext(filename)
-                    
-                    new_index.append({
-                        'name': filename,
-                        'path': path_for_html,
-                        'size': file_stat.st_size,
-                        'mtime': file_stat.st_mtime,
-                        'type': extension.lower() if extension else '.file'
-                    })
-                except Exception as e:
-                    print(f"Could not process a file in {root}. Error: {e}")
+        roots.append(folder_path)
+    status_callback(f"Scanning: {', '.join(roots)}...")
+
+    skipped_dirs = 0
+    for listing in Crawler(reuse=reuse).walk(roots):
+        progress_callback() # Update progress bar for visual feedback
+        dir_key = html_path(listing.path)
+        if listing.error is not None:
+            print(f"Could not list {listing.path}. Error: {listing.error}")
+            continue
+        if listing.cached:
+            # Unchanged folder: keep its records and state as they were
+            skipped_dirs += 1
+            new_index.extend(listing.files)
+            paths_found.update(item['path'] for item in listing.files)
+            new_dirs[dir_key] = old_dirs[dir_key]
+            continue
+        for entry in listing.files:
+            try:
+                path_for_html = html_path(entry.path)
+                paths_found.add(path_for_html)
+
+                # File metadata: stat()ed once by the crawler, cached on the entry
+                file_stat = entry.stat(follow_symlinks=False)
+                mtime = file_stat.st_mtime
+
+                # If file is in old index and hasn't changed, reuse old data
+                if path_for_html in old_index and old_index[path_for_html]['mtime'] == mtime:
+                    new_index.append(old_index[path_for_html])
+                    continue
+
+                # Otherwise, it's a new or modified file
+                _, extension = os.path.splitext(entry.name)
+
+                new_index.append({
+                    'name': entry.name,
+                    'path': path_for_html,
+                    'size': file_stat.st_size,
+                    'mtime': file_stat.st_mtime,
+                    'type': extension.lower() if extension else '.file'
+                })
+            except Exception as e:
+                print(f"Could not process a file in {listing.path}. Error: {e}")
+        if listing.path in dir_mtimes:
+            new_dirs[dir_key] = {
+                'mtime': dir_mtimes[listing.path],
+                'count': len(listing.dirs) + len(listing.files),
+                'listed': now,
+                'subdirs': [d.name for d in listing.dirs],
+            }
 
     # --- Step 3: Report results and save the new index ---
     deleted_count = len(old_index) - len(paths_found.intersection(old_index.keys()))
-    status_callback(f"Scan complete. Found {len(new_index)} files. ({deleted_count} files removed).")
+    status_callback(f"Scan complete. Found {len(new_index)} files. ({deleted_count} files removed, "
+                    f"{skipped_dirs} unchanged folders not re-listed).")
     
     try:
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(new_index, f, indent=4)
         status_callback(f"Successfully saved index to: '{os.path.basename(output_file)}'")
-        messagebox.showinfo("Success", f"Indexing complete!\nFound {len(new_index)} files.\n\nSaved to: {output_file}")
     except IOError as e:
         status_callback(f"FATAL ERROR: Could not write to index file: {e}")
         messagebox.showerror("Error", f"Could not write to index file:\n{e}")
+        return
+
+    # Compact copy for the search pages: <output>_shards/, one .json.gz per top-level folder
+    try:
+        shards = write_shards(
+            shards_dir_for(output_file),
+            ((item['path'].rsplit('\\', 1)[0], item['name'], item['mtime'], item['size']) for item in new_index),
+            [html_path(r) for r in roots], os.path.splitext(os.path.basename(output_file))[0])
+        status_callback(f"Saved {len(shards['shards'])} index shards to: '{os.path.basename(shards_dir_for(output_file))}'")
+    except OSError as e:
+        status_callback(f"Warning: Could not write index shards: {e}")
+
+    # Folder state goes after the index it describes (a stale one only costs a re-list)
+    try:
+        tmp = dirs_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'dirs': new_dirs}, f)
+        os.replace(tmp, dirs_file)
+    except OSError as e:
+        status_callback(f"Warning: Could not save folder state (next scan lists every folder): {e}")
+    messagebox.showinfo("Success", f"Indexing complete!\nFound {len(new_index)} files.\n\nSaved to: {output_file}")
 
 
 class App(tk.Tk):
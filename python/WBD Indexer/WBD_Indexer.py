@@ -3,9 +3,13 @@ from tkinter import filedialog, messagebox, scrolledtext
 import os
 import re
 import json
+import sys
 import threading
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.crawler import Crawler   # parallel scandir workers — see python/common/
+
 class PdfIndexerApp:
     """
     A GUI application to scan a directory for PDF files, extract a 10-digit
@@ -125,13 +129,13 @@ class PdfIndexerApp:
         api_regex = re.compile(r'^(\d{10})')
 
         try:
-            for dirpath, _, filenames in os.walk(source_dir):
-                for filename in filenames:
+            for listing in Crawler(stat_files=False).walk([source_dir]):
+                for filename in (e.name for e in listing.files):
                     if filename.lower().endswith('.pdf'):
                         match = api_regex.search(filename)
                         if match:
                             api = match.group(1)
-                            full_path = os.path.join(dirpath, filename)
+                            full_path = os.path.join(listing.path, filename)
                             path_for_html = full_path.replace('\\', '/')
                             
                             well_data.append({
@@ -4,9 +4,13 @@ import os
 import re
 import json
 import csv # Imported the csv module
+import sys
 import threading
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.crawler import Crawler   # parallel scandir workers — see python/common/
+
 class PdfIndexerApp:
     """
     A GUI application to scan a list of directories for PDF files, extract a 10-digit
@@ -127,13 +131,17 @@ class PdfIndexerApp:
                         continue
                     
                     self.log(f"INFO: Scanning folder: {folder_to_scan}")
-                    for dirpath, _, filenames in os.walk(folder_to_scan):
-                        # --- NEW: Condition to exclude specific directory paths ---
-                        if "Don't use" in dirpath:
-                            self.log(f"  -> SKIPPING directory: {dirpath}")
-                            continue # Skip this directory and all its files
-
-                        for filename in filenames:
+                    # --- Condition to exclude specific directory paths (and everything below them) ---
+                    def skip_dir(entry):
+                        if "Don't use" in entry.path:
+                            self.log(f"  -> SKIPPING directory: {entry.path}")
+                            return True
+                        return False
+
+                    for listing in Crawler(skip_dir=skip_dir).walk([folder_to_scan]):
+                        dirpath = listing.path
+                        for entry in listing.files:
+                            filename = entry.name
                             if filename.lower().endswith('.pdf') and len(filename) <= 20:
                                 match = api_regex.search(filename)
                                 if match:
@@ -141,8 +149,8 @@ class PdfIndexerApp:
                                     full_path = os.path.join(dirpath, filename)
                                     path_for_html = full_path.replace('/', '\\')
 
-                                    # Get file modification date
-                                    mod_timestamp = os.path.getmtime(full_path)
+                                    # File modification date (stat()ed by the crawler)
+                                    mod_timestamp = entry.stat(follow_symlinks=False).st_mtime
                                     mod_date_str = datetime.fromtimestamp(mod_timestamp).strftime('%Y-%m-%d %H:%M:%S')
                                     
                                     well_data.append({
@@ -21,6 +21,7 @@ Environment variables for Oracle (optional overrides):
 """
 
 import os
+import sys
 import re
 import csv
 import threading
@@ -37,28 +38,8 @@ import oracledb
 # ---------------------------
 # Oracle connection manager
 # ---------------------------
-class OracleConnectionManager:
-    """Manages Oracle database connections."""
-    def __init__(self):
-        self._connections = {
-            "odw": {
-                "user": os.getenv("DB_USER_ODW", "rptguser"),
-                "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
-                "dsn": os.getenv("DB_DSN_ODW", "odw"),
-            }
-        }
-
-    def get_connection(self, name="odw"):
-        if name not in self._connections:
-            raise ValueError(f"Unknown DB connection name: {name}")
-        cfg = self._connections[name]
-        try:
-            return oracledb.connect(
-                user=cfg["user"], password=cfg["password"], dsn=cfg["dsn"]
-            )
-        except oracledb.Error as e:
-            (err,) = e.args
-            raise ConnectionError(f"Failed to connect to Oracle DB '{name}': {err.message}") from e
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.db import OracleConnectionManager   # pooled sessions — python/common/db.py
 
 
 # ---------------------------
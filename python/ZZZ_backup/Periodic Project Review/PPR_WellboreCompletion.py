@@ -6,6 +6,7 @@ from tkinter import ttk
 import tkinter.font
 import ttkbootstrap as tb
 import pandas as pd
+import heapq
 
 # --- CONNECTION FIX: Enable Thick Mode (same as PPR.py) ---
 try:
@@ -66,6 +67,30 @@ def format_well_api_list(raw_api_list):
     return ", ".join(escaped)
 
 
+AUTOFIT_SAMPLE = 2000   # rows sampled per column when sizing
+
+
+def frame_display(df, date_fmt):
+    """Display strings for every cell, formatted one column at a time."""
+    cols = []
+    for j in range(df.shape[1]):
+        s = df.iloc[:, j]
+        if pd.api.types.is_datetime64_any_dtype(s.dtype):
+            cols.append(s.dt.strftime(date_fmt).fillna('').tolist())
+        else:
+            cols.append(s.astype(str).where(s.notna(), '').tolist())
+    return list(zip(*cols))
+
+
+def autofit(tree, columns, rows, tree_font, head_pad=20, cell_pad=10):
+    """Width per column = heading or the longest few strings of a row sample."""
+    sample = rows[::max(1, len(rows) // AUTOFIT_SAMPLE)]
+    for i, col in enumerate(columns):
+        longest = heapq.nlargest(5, (r[i] for r in sample), key=len)
+        cell = max((tree_font.measure(t) for t in longest), default=0)
+        tree.column(col, width=max(tree_font.measure(col) + head_pad, cell + cell_pad), stretch=False)
+
+
 class Page(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -99,24 +124,11 @@ class Page(tk.Frame):
 
         for col in columns:
             self.result_tree.heading(col, text=col, anchor="w")
-            self.result_tree.column(col, width=tree_font.measure(col) + 20, stretch=False)
-
-        for _, row in df_copy.iterrows():
-            display_values = []
-            for item in row:
-                if isinstance(item, pd.Timestamp):
-                    display_values.append(item.strftime('%Y-%m-%d') if not pd.isna(item) else '')
-                elif pd.isna(item):
-                    display_values.append('')
-                else:
-                    display_values.append(item)
-            self.result_tree.insert("", "end", values=display_values)
-
-            for i, item in enumerate(display_values):
-                col = columns[i]
-                width = tree_font.measure(str(item)) + 10
-                if self.result_tree.column(col, width=None) < width:
-                    self.result_tree.column(col, width=width)
+
+        rows = frame_display(df_copy, '%Y-%m-%d')
+        autofit(self.result_tree, columns, rows, tree_font)
+        for values in rows:
+            self.result_tree.insert("", "end", values=values)
 
         self.current_data = df_copy
 
@@ -0,0 +1,9 @@
+"""
+Shared helpers for the RE-tools scripts.
+
+This folder is NOT scanned by Launcher.py, so modules here never show up as
+buttons.  Tools in the sibling folders import it with:
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from common import db
+"""
@@ -0,0 +1,88 @@
+"""
+Script catalog for the Launcher
+===============================
+Building the Launcher used to list every section folder and open every .py
+to read its `#Help` line — on a network share that is seconds before the
+window appears.  The catalog keeps, per folder, each script's name, help
+text, mtime and size in a JSON file next to Launcher.py:
+
+    cat = load(CATALOG_FILE)                       # {} if missing / unreadable
+    entries = cat.get("UIC")                       # draw buttons from these now
+    fresh = scan(folder_path, entries)             # later, on a worker thread
+    if fresh != entries: ...                       # refresh just that section
+    save(CATALOG_FILE, cat | {"UIC": fresh})
+
+scan() uses os.scandir (size and mtime come with the listing on Windows, no
+extra round trip per file) and re-reads the `#Help` line only for scripts
+whose mtime or size changed.  A catalog that can't be written (read-only
+share) is simply not saved — the next start scans again.
+"""
+
+import json
+import os
+
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            ".launcher_catalog.json")
+VERSION = 1
+
+
+def read_help(path):
+    """Text after `#Help` on the script's first line, else None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            first_line = f.readline().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if first_line.startswith("#Help"):
+        return first_line[5:].strip(": -").lstrip(": ")
+    return None
+
+
+def scan(folder_path, previous=None):
+    """[{name, help, mtime, size}, ...] sorted by name; unchanged help is reused."""
+    known = {e["name"]: e for e in previous or ()}
+    entries = []
+    try:
+        with os.scandir(folder_path) as it:
+            for de in it:
+                if not de.name.endswith(".py") or not de.is_file():
+                    continue
+                st = de.stat()
+                old = known.get(de.name)
+                if old and old["mtime"] == st.st_mtime and old["size"] == st.st_size:
+                    entries.append(old)
+                    continue
+                entries.append({"name": de.name, "help": read_help(de.path),
+                                "mtime": st.st_mtime, "size": st.st_size})
+    except OSError:
+        return []
+    entries.sort(key=lambda e: e["name"])
+    return entries
+
+
+def load(path=CATALOG_FILE):
+    """{folder: entries} from the catalog file; {} if missing, stale or corrupt."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        return {}
+    return data.get("folders") or {}
+
+
+def save(path, folders):
+    """Write the catalog atomically; False if the location isn't writable."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": VERSION, "folders": folders}, f, indent=1)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
@@ -0,0 +1,205 @@
+"""
+Chart host — one Figure / canvas / toolbar per chart tab, updated in place
+==========================================================================
+The chart tabs used to destroy their widgets (or fig.clear()) and build a
+new Figure, FigureCanvasTkAgg and NavigationToolbar2Tk on every well click.
+ChartHost builds those once and keeps the axes and artists between
+updates; an update only swaps line data, limits, titles and legends:
+
+    host = ChartHost(frame, figsize=(10, 5))
+    ax, = host.begin("single", lambda fig: [fig.add_subplot(111)])
+    host.line("oil", ax, dates, oil, color="#2d6a4f", lw=2.2, label="Oil (BOPD)")
+    host.fill("oil_fill", ax, dates, oil, alpha=0.10, color="#2d6a4f")
+    ax.set_title(...); host.legend(ax, fontsize=8)
+    host.finish()
+
+begin(layout, build) re-creates the axes only when `layout` changes (e.g. a
+producer's two panels vs an injector's one).  Artists are keyed; keys not
+touched in an update are hidden, not deleted.  Data artists are drawn
+"animated" on top of a cached background, so when an update leaves the
+static frame alone (same limits, labels, title, legends) it is a blit of
+just the data — otherwise one full draw, which refreshes the background.
+
+A host line can go through common/downsample.attach(); the fill attached
+with it is drawn and autoscaled along with the line.
+
+Requires matplotlib (imported lazily; tools only create a host when HAS_MPL).
+"""
+
+import numpy as np
+
+
+def _fill_of(art):
+    """The fill downsample.attach() hung on a line, if any."""
+    series = getattr(art, "_downsample", None)
+    return series.fill if series is not None else None
+
+
+class ChartHost:
+    """Figure + TkAgg canvas + toolbar, with keyed artists updated in place."""
+
+    def __init__(self, parent, figsize=(10, 5), dpi=100, facecolor="white",
+                 toolbar_parent=None, tight=True):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+        self.fig = Figure(figsize=figsize, dpi=dpi, facecolor=facecolor)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, toolbar_parent or parent)
+        self.toolbar.update()
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.tight = tight
+        self.layout = None
+        self.axes = []
+        self._arts = {}          # key -> artist
+        self._pts = {}           # key -> (ax, Nx2 data points) for collections (relim skips them)
+        self._used = set()
+        self._bg = None          # canvas region without the data artists
+        self._sig = None         # static-frame signature the background was drawn with
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    # ─── Update cycle ────────────────────────────────────────────────────────
+    def begin(self, layout, build):
+        """Start an update; returns the axes list.  build(fig) -> axes, called
+        only when `layout` differs from the previous update."""
+        if layout != self.layout:
+            self.fig.clear()
+            self.axes = list(build(self.fig))
+            self.layout = layout
+            self._arts.clear()
+            self._pts.clear()
+            self._sig = None
+        else:
+            for ax in self.axes:                 # per-update state starts fresh
+                leg = ax.get_legend()
+                if leg is not None:
+                    leg.remove()
+                ax.set_autoscale_on(True)
+        self._used = set()
+        return self.axes
+
+    def _keep(self, key, art, ax=None, pts=None):
+        art.set_animated(True)
+        art.set_visible(True)
+        self._arts[key] = art
+        self._used.add(key)
+        if pts is not None:
+            self._pts[key] = (ax, pts)
+        return art
+
+    def line(self, key, ax, x, y, *fmt, **style):
+        """Line2D `key` on `ax` with data (x, y) — created once, then set_data()."""
+        art = self._arts.get(key)
+        if art is None:
+            art, = ax.plot(x, y, *fmt, **style)
+        else:
+            art.set_data(x, y)
+            if "label" in style:
+                art.set_label(style["label"])
+        return self._keep(key, art)
+
+    def scatter(self, key, ax, x, y, **style):
+        """Scatter `key` — created once, then set_offsets()."""
+        xy = np.column_stack([ax.convert_xunits(list(x)), np.asarray(y, dtype=float)])
+        art = self._arts.get(key)
+        if art is None:
+            art = ax.scatter(x, y, **style)
+        else:
+            art.set_offsets(xy)
+        return self._keep(key, art, ax, xy)
+
+    def fill(self, key, ax, x, y, **style):
+        """fill_between(x, y) `key` — polygons can't be reshaped, so this one is replaced."""
+        old = self._arts.pop(key, None)
+        if old is not None:
+            old.remove()
+        art = ax.fill_between(x, y, **style)
+        xn = np.asarray(ax.convert_xunits(list(x)), dtype=float)
+        yn = np.asarray(y, dtype=float)
+        pts = np.column_stack([np.concatenate([xn, xn]), np.concatenate([yn, np.zeros_like(yn)])])
+        return self._keep(key, art, ax, pts)
+
+    def vline(self, key, ax, x, **style):
+        """axvline `key` at x — created once, then moved."""
+        art = self._arts.get(key)
+        if art is None:
+            art = ax.axvline(x=x, **style)
+        else:
+            xn = ax.convert_xunits(x)
+            art.set_xdata([xn, xn])
+        return self._keep(key, art)
+
+    def legend(self, ax, others=(), **kw):
+        """ax.legend() over the labelled artists drawn this update on `ax` (and on
+        `others`, e.g. a twinx axis); hidden ones stay out."""
+        owners = (ax,) + tuple(others)
+        arts = [a for k, a in self._arts.items()
+                if k in self._used and a.axes in owners and not a.get_label().startswith("_")]
+        if arts:
+            return ax.legend(arts, [a.get_label() for a in arts], **kw)
+        return None
+
+    def finish(self):
+        """Hide untouched artists, rescale, then blit if the frame is unchanged."""
+        for key, art in self._arts.items():
+            if key not in self._used:
+                art.set_visible(False)
+        for ax in self.axes:
+            if not ax.get_visible():
+                continue
+            ax.relim(visible_only=True)
+            for key, (pax, pts) in self._pts.items():
+                if pax is ax and key in self._used and len(pts):
+                    ax.update_datalim(pts[np.isfinite(pts).all(axis=1)])
+            for key in self._used:
+                fill = _fill_of(self._arts[key])
+                if fill is not None and fill.axes is ax:
+                    for path in fill.get_paths():
+                        ax.update_datalim(path.vertices)
+            ax.autoscale_view()
+        if self._bg is not None and self._signature() == self._sig:
+            self.canvas.restore_region(self._bg)
+            self._draw_data()
+            self.canvas.blit(self.fig.bbox)
+        else:
+            if self.tight:
+                self.fig.tight_layout()
+            self.canvas.draw()
+        if self.toolbar is not None:
+            self.toolbar.update()        # new "home" view for the zoom/pan stack
+
+    def message(self, text, **style):
+        """Replace the chart with a centred message (no data / error)."""
+        self.fig.clear()
+        self.layout, self.axes = None, []
+        self._arts.clear(); self._pts.clear(); self._sig = None
+        self.fig.text(0.5, 0.5, text, ha="center", va="center",
+                      **({"fontsize": 11, "color": "#6b7280"} | style))
+        self.canvas.draw()
+
+    # ─── Blitting ────────────────────────────────────────────────────────────
+    def _signature(self):
+        """Everything drawn in the background: limits, visibility, texts, legends, size."""
+        sig = [tuple(self.fig.get_size_inches())]
+        for ax in self.axes:
+            leg = ax.get_legend()
+            sig.append((ax.get_visible(), ax.get_xlim(), ax.get_ylim(),
+                        ax.get_title(), ax.get_ylabel(), ax.get_xlabel(),
+                        tuple(t.get_text() for t in leg.get_texts()) if leg else None))
+        sig.extend(t.get_text() for t in self.fig.texts)
+        return tuple(sig)
+
+    def _draw_data(self):
+        for art in self._arts.values():
+            if art.get_visible():
+                art.axes.draw_artist(art)
+                fill = _fill_of(art)
+                if fill is not None:
+                    art.axes.draw_artist(fill)
+
+    def _on_draw(self, event):
+        # Any full draw (ours, resize, toolbar zoom/pan): grab the background
+        # without the animated data, then paint the data on top.
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._sig = self._signature()
+        self._draw_data()
@@ -0,0 +1,241 @@
+"""
+Compact, sharded file index for the HTML search pages
+=====================================================
+index.json and the per-share <name>_files.json are pretty-printed arrays of
+{"name", "path", ...} with the full absolute path on every record, and the
+search pages fetch and parse the whole thing before the first search.  The
+indexers now also write a compact copy, split by top-level folder:
+
+    <name>_shards/manifest.json
+        {"version": 1, "name": ..., "created": ..., "roots": [...],
+         "shards": [{"key": "J:\\\\Technical\\\\Reservoir", "file": "J_Technical_Reservoir.json.gz",
+                     "dirs": 812, "files": 20417, "bytes": 301234,
+                     "names": "J_Technical_Reservoir.names.json.gz", "names_bytes": 402311}, ...]}
+    <name>_shards/<key>.json.gz
+        {"version": 1, "key": ..., "dirs": ["J:\\\\Technical\\\\Reservoir", ...],
+         "files": [[dir index, name, mtime, size], ...]}
+    <name>_shards/<key>.names.json.gz
+        token / trigram index of the shard's file names (common/name_index.py)
+
+Every folder path is stored once, in the shard's prefix table; a file is a
+short row pointing into it (path = dirs[i] + "\\\\" + name).  mtime is whole
+seconds, size is null where the indexer didn't record it.  A shard is one
+top-level folder under a root (files directly in a root form the root's own
+shard), so a page ticks and downloads only the parts of a share it needs.
+
+    write_shards(out_dir, rows, roots, name="Technical")   # rows: (dir, name, mtime, size)
+    python common/compact_index.py index.json [--root D:\\\\Aera] [--out index_shards]
+
+The CLI converts an existing JSON index (either indexer's format) and prints
+the size of the original against the shards.  Shards are written first and
+the manifest last (temp file + rename each time), and shard files that the
+new manifest no longer lists are removed.
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+
+if __package__ in (None, ""):   # run as a script: make `common` importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import name_index
+
+VERSION = 1
+MANIFEST = "manifest.json"
+SEP = "\\"
+
+
+def shards_dir_for(index_file):
+    """Shard folder that goes with a JSON index: index.json -> index_shards."""
+    base, _ = os.path.splitext(index_file)
+    return base + "_shards"
+
+
+def _norm(path):
+    return path.replace("/", SEP).rstrip(SEP).lower()
+
+
+def _safe(key):
+    return "".join(c if c.isalnum() else "_" for c in key).strip("_") or "root"
+
+
+def shard_key(dir_path, roots):
+    """Top-level folder of `dir_path` under the first root containing it
+    (the root itself for its own files; the path's drive + first folder if
+    no root contains it)."""
+    d = _norm(dir_path)
+    for root in roots:
+        r = _norm(root)
+        if d == r:
+            return root
+        if d.startswith(r + SEP):
+            top = dir_path.replace("/", SEP)[len(r) + 1:].split(SEP, 1)[0]
+            return root.rstrip("/" + SEP) + SEP + top
+    parts = dir_path.replace("/", SEP).split(SEP)
+    return SEP.join(parts[:2])
+
+
+def _gzip_json(obj):
+    body = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class _Shard:
+    __slots__ = ("key", "dirs", "dir_ids", "files")
+
+    def __init__(self, key):
+        self.key, self.dirs, self.dir_ids, self.files = key, [], {}, []
+
+    def add(self, dir_path, name, mtime, size):
+        i = self.dir_ids.get(dir_path)
+        if i is None:
+            i = self.dir_ids[dir_path] = len(self.dirs)
+            self.dirs.append(dir_path)
+        self.files.append([i, name, None if mtime is None else int(mtime), size])
+
+
+def write_shards(out_dir, rows, roots, name=""):
+    """Write the shards + manifest for `rows` of (dir, name, mtime, size) into
+    `out_dir`; returns the manifest dict.  `dir` is stored as given (the
+    indexers pass the same form their JSON index uses)."""
+    shards = {}
+    key_of = {}                       # dir -> shard key (many files per dir)
+    for dir_path, file_name, mtime, size in rows:
+        key = key_of.get(dir_path)
+        if key is None:
+            key = key_of[dir_path] = shard_key(dir_path, roots)
+        shard = shards.get(key)
+        if shard is None:
+            shard = shards[key] = _Shard(key)
+        shard.add(dir_path, file_name, mtime, size)
+
+    os.makedirs(out_dir, exist_ok=True)
+    entries, used = [], set()
+    for key in sorted(shards, key=str.lower):
+        shard = shards[key]
+        stem = _safe(key)
+        while stem.lower() in used:               # keys that sanitise alike
+            stem += "_"
+        used.add(stem.lower())
+        file_name, names_name = stem + ".json.gz", stem + ".names.json.gz"
+        data = _gzip_json({"version": VERSION, "key": key, "dirs": shard.dirs, "files": shard.files})
+        _write_atomic(os.path.join(out_dir, file_name), data)
+        names = _gzip_json(name_index.build([f[1] for f in shard.files]))
+        _write_atomic(os.path.join(out_dir, names_name), names)
+        entries.append({"key": key, "file": file_name, "dirs": len(shard.dirs),
+                        "files": len(shard.files), "bytes": len(data),
+                        "names": names_name, "names_bytes": len(names)})
+
+    manifest = {"version": VERSION, "name": name, "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "roots": list(roots), "shards": entries}
+    _write_atomic(os.path.join(out_dir, MANIFEST),
+                  json.dumps(manifest, indent=1, ensure_ascii=False).encode("utf-8"))
+
+    keep = {e["file"] for e in entries} | {e["names"] for e in entries}
+    for old in os.listdir(out_dir):
+        if old.endswith(".json.gz") and old not in keep:
+            try:
+                os.remove(os.path.join(out_dir, old))
+            except OSError:
+                pass
+    return manifest
+
+
+# ─── Reading ─────────────────────────────────────────────────────────────────
+def load_manifest(out_dir):
+    with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_json_gz(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_shard(path):
+    """(dirs, files) of one .json.gz shard."""
+    shard = read_json_gz(path)
+    return shard["dirs"], shard["files"]
+
+
+def iter_shard_files(path):
+    """(dir, name, mtime, size) for every file in one shard."""
+    dirs, files = read_shard(path)
+    for i, name, mtime, size in files:
+        yield dirs[i], name, mtime, size
+
+
+# ─── Converting an existing JSON index ───────────────────────────────────────
+def _split(path):
+    """(dir, name) of an index path, whichever separators it mixes."""
+    p = path.replace("/", SEP)
+    cut = p.rfind(SEP)
+    return (path[:cut], path[cut + 1:]) if cut >= 0 else ("", path)
+
+
+def rows_from_json_index(records):
+    """(dir, name, mtime, size) from Files_Indexer records (mtime, size) or
+    FolderIndexer records (modified_date)."""
+    from datetime import datetime
+    for rec in records:
+        dir_path, name = _split(rec["path"])
+        mtime = rec.get("mtime")
+        if mtime is None and rec.get("modified_date"):
+            try:
+                mtime = datetime.strptime(rec["modified_date"], "%Y-%m-%d %H:%M:%S").timestamp()
+            except ValueError:
+                mtime = None
+        yield dir_path, rec.get("name", name), mtime, rec.get("size")
+
+
+def common_root(dirs):
+    """Deepest folder containing every one of `dirs` ('' if they share none)."""
+    split = [d.replace("/", SEP).split(SEP) for d in dirs]
+    if not split:
+        return ""
+    prefix = split[0]
+    for parts in split[1:]:
+        n = 0
+        while n < min(len(prefix), len(parts)) and prefix[n].lower() == parts[n].lower():
+            n += 1
+        prefix = prefix[:n]
+    return SEP.join(prefix)
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Write the compact sharded copy of a JSON file index.")
+    ap.add_argument("index", help="index.json / <name>_files.json to convert")
+    ap.add_argument("--root", action="append", help="indexed root folder (repeatable; default: common prefix)")
+    ap.add_argument("--out", help="shard folder (default: <index>_shards next to the index)")
+    args = ap.parse_args(argv)
+    with open(args.index, encoding="utf-8") as f:
+        records = json.load(f)
+    rows = list(rows_from_json_index(records))
+    roots = args.root or [common_root({d for d, _, _, _ in rows})]
+    out_dir = args.out or shards_dir_for(args.index)
+    name = os.path.splitext(os.path.basename(args.index))[0]
+    manifest = write_shards(out_dir, rows, roots, name)
+    total = sum(s["bytes"] for s in manifest["shards"])
+    names = sum(s["names_bytes"] for s in manifest["shards"])
+    largest = max((s["bytes"] for s in manifest["shards"]), default=0)
+    print(f"{len(rows):,} files -> {len(manifest['shards'])} shards in {out_dir}")
+    print(f"  JSON index:    {os.path.getsize(args.index):>12,} bytes")
+    print(f"  all shards:    {total:>12,} bytes")
+    print(f"  largest shard: {largest:>12,} bytes")
+    print(f"  name indexes:  {names:>12,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
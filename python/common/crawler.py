@@ -0,0 +1,310 @@
+"""
+Parallel directory crawler for network shares
+=============================================
+FolderIndexer, Files_Indexer, the WBD indexers and OEC_search all walked
+SMB shares with a single-threaded os.walk / scandir, so every directory
+listing waited on its own network round trip.  Crawler lists directories
+from a shared work queue with a pool of scandir workers, so many round
+trips are in flight at once:
+
+    crawler = Crawler(progress=lambda s: log(f"{s.dirs} folders, {s.files} files"))
+    for listing in crawler.walk([r"J:\\Technical", r"R:\\SJV"]):
+        if listing.error: ...                     # unreadable folder
+        for entry in listing.files:               # os.DirEntry, stat() already cached
+            entry.name, entry.path, entry.stat().st_mtime
+        listing.dirs                              # subfolders (DirEntry), queued already
+
+  * WORKERS scandir threads in total, at most PER_SHARE of them on one share
+    (UNC \\\\server\\share or drive letter) so one slow server can't take
+    every worker and a big crawl doesn't hammer a single file server.
+  * Back-pressure: at most MAX_PENDING finished listings wait for the
+    consumer; beyond that the workers block, so memory stays bounded when
+    the consumer (JSON / SQLite writer) is the slow side.
+  * skip_dir(entry) -> True keeps a subfolder out of the crawl.
+  * reuse(path) -> (subfolder paths, files) or None is asked before a folder
+    is listed; a tuple is used instead of scandir and the Listing comes back
+    with cached=True (its files are whatever reuse returned, its dirs
+    DirRefs) — incremental re-indexing of folders known to be unchanged.
+  * A folder whose listing fails — OSError, or any exception from reuse,
+    skip_dir or scandir — comes back as a Listing with .error set.
+  * stop() (or leaving the for loop) ends the crawl; `should_stop` lets a
+    GUI's stop flag do the same.
+  * progress(stats) is called on the consumer's thread, at most every
+    progress_s seconds (PROGRESS_S) and once at the end.
+
+A Crawler is good for one walk().  Listings arrive in no particular order, except that a folder's listing
+always comes before its subfolders' listings.  A root listed twice (or a
+root inside another root) is listed once.
+
+    python common/crawler.py --bench [--latency-ms 20] [--workers 16]
+
+builds a local tree and times a single-worker crawl (what os.walk did)
+against the pool, with a simulated per-listing network latency.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+WORKERS = 16
+PER_SHARE = 8
+MAX_PENDING = 256
+PROGRESS_S = 1.0
+
+_DONE = object()
+
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def share_of(path):
+    """Concurrency bucket of `path`: UNC server\\share or drive ('' for POSIX)."""
+    return os.path.splitdrive(os.path.abspath(path))[0].lower()
+
+
+class DirRef:
+    """Subfolder of a reused listing: the .name / .path part of a DirEntry."""
+
+    __slots__ = ("name", "path")
+
+    def __init__(self, path):
+        self.name, self.path = os.path.basename(path), path
+
+
+class Listing:
+    """One listed folder: its DirEntry subfolders / files, or the error."""
+
+    __slots__ = ("root", "path", "dirs", "files", "error", "cached")
+
+    def __init__(self, root, path, dirs=(), files=(), error=None, cached=False):
+        self.root, self.path, self.dirs, self.files, self.error = root, path, dirs, files, error
+        self.cached = cached
+
+
+class Stats:
+    __slots__ = ("dirs", "files", "errors", "queued", "elapsed")
+
+    def __init__(self):
+        self.dirs = self.files = self.errors = self.queued = 0
+        self.elapsed = 0.0
+
+
+class Crawler:
+    """Bounded pool of scandir workers fed from per-share directory queues."""
+
+    def __init__(self, workers=WORKERS, per_share=PER_SHARE, max_pending=MAX_PENDING,
+                 skip_dir=None, stat_files=True, progress=None, progress_s=PROGRESS_S,
+                 should_stop=None, reuse=None, scandir=os.scandir):
+        self.workers = max(1, workers)
+        self.per_share = max(1, per_share)
+        self.max_pending = max(1, max_pending)
+        self.skip_dir = skip_dir
+        self.stat_files = stat_files
+        self.progress = progress
+        self.progress_s = progress_s
+        self.should_stop = should_stop
+        self.reuse = reuse
+        self.scandir = scandir
+        self.stats = Stats()
+        self._cv = threading.Condition()
+        self._queues = {}            # share -> deque of (root, path)
+        self._active = {}            # share -> folders being listed
+        self._outstanding = 0        # queued + being listed
+        self._roots = set()          # normalised roots: not queued again as subfolders
+        self._stopped = False
+
+    def stop(self):
+        with self._cv:
+            self._stopped = True
+            self._cv.notify_all()
+
+    # ─── Work queue ──────────────────────────────────────────────────────────
+    def _put(self, root, path):
+        share = share_of(path)
+        self._queues.setdefault(share, deque()).append((root, path))
+        self._active.setdefault(share, 0)
+        self._outstanding += 1
+
+    def _take(self):
+        """Next (share, root, path) a worker may list, or None when the crawl is over."""
+        with self._cv:
+            while True:
+                if self._stopped or self._outstanding == 0:
+                    return None
+                for share, q in self._queues.items():
+                    if q and self._active[share] < self.per_share:
+                        self._active[share] += 1
+                        return (share,) + q.popleft()
+                self._cv.wait()
+
+    # ─── Workers ─────────────────────────────────────────────────────────────
+    def _list(self, root, path):
+        if self.reuse is not None:
+            hit = self.reuse(path)
+            if hit is not None:
+                subdirs, files = hit
+                dirs = [DirRef(p) for p in subdirs]
+                if self.skip_dir is not None:
+                    dirs = [d for d in dirs if not self.skip_dir(d)]
+                return Listing(root, path, dirs, files, cached=True)
+        dirs, files = [], []
+        try:
+            with self.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.skip_dir is None or not self.skip_dir(entry):
+                                dirs.append(entry)
+                        elif entry.is_file(follow_symlinks=False):
+                            if self.stat_files:
+                                entry.stat(follow_symlinks=False)   # cached on the entry
+                            files.append(entry)
+                    except OSError:
+                        pass                        # vanished / unreadable entry
+        except OSError as e:
+            return Listing(root, path, error=e)
+        return Listing(root, path, dirs, files)
+
+    def _work(self, results, alive):
+        try:
+            while True:
+                job = self._take()
+                if job is None:
+                    return
+                share, root, path = job
+                listing = None
+                try:
+                    try:
+                        listing = self._list(root, path)
+                    except Exception as e:          # a failing reuse / skip_dir / scandir
+                        listing = Listing(root, path, error=e)
+                    # Hand the listing over before queueing its subfolders, so a
+                    # parent always reaches the consumer ahead of its children.
+                    while not self._stopped:
+                        try:
+                            results.put(listing, timeout=0.2)
+                            break
+                        except queue.Full:
+                            pass
+                finally:
+                    # Always settle the counts, or the other workers and walk() wait forever
+                    with self._cv:
+                        for d in (listing.dirs if listing is not None else ()):
+                            if len(self._roots) > 1 and _key(d.path) in self._roots:
+                                continue            # a root of its own
+                            self._put(root, d.path)
+                        self._active[share] -= 1
+                        self._outstanding -= 1
+                        self._cv.notify_all()
+        finally:
+            with alive[1]:
+                alive[0] -= 1
+                if alive[0] == 0:
+                    results.put(_DONE)
+
+    # ─── Consumer side ───────────────────────────────────────────────────────
+    def walk(self, roots):
+        """Yield a Listing for every folder under `roots` (roots included)."""
+        with self._cv:
+            for root in roots:
+                if _key(root) not in self._roots:
+                    self._roots.add(_key(root))
+                    self._put(root, root)
+        results = queue.Queue(self.max_pending)
+        alive = [self.workers, threading.Lock()]
+        threads = [threading.Thread(target=self._work, args=(results, alive), daemon=True,
+                                    name=f"crawler-{i}") for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        st = self.stats
+        t0 = last = time.perf_counter()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                st.dirs += 1
+                st.files += len(item.files)
+                st.errors += item.error is not None
+                yield item
+                if self.should_stop is not None and self.should_stop():
+                    break
+                now = time.perf_counter()
+                if self.progress is not None and now - last >= self.progress_s:
+                    last = now
+                    st.elapsed, st.queued = now - t0, self._outstanding
+                    self.progress(st)
+        finally:
+            self.stop()
+            while any(t.is_alive() for t in threads):   # unblock workers waiting on put()
+                try:
+                    results.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            st.elapsed, st.queued = time.perf_counter() - t0, self._outstanding
+            if self.progress is not None:
+                self.progress(st)
+
+
+# ─── Benchmark ───────────────────────────────────────────────────────────────
+def _make_tree(base, fanout=4, depth=4, files=10):
+    n = 0
+    todo = [(base, 0)]
+    while todo:
+        d, level = todo.pop()
+        os.makedirs(d, exist_ok=True)
+        for j in range(files):
+            with open(os.path.join(d, f"file_{j}.txt"), "w") as f:
+                f.write("x")
+        n += 1
+        if level < depth:
+            todo.extend((os.path.join(d, f"dir_{i}"), level + 1) for i in range(fanout))
+    return n
+
+
+def bench(latency_s=0.02, workers=WORKERS, fanout=4, depth=4):
+    """Seconds for a 1-worker crawl vs a `workers` crawl of a temp tree, with
+    `latency_s` added to every directory listing."""
+    import tempfile
+
+    def slow_scandir(path):
+        time.sleep(latency_s)
+        return os.scandir(path)
+
+    with tempfile.TemporaryDirectory() as base:
+        n_dirs = _make_tree(base, fanout, depth)
+        times = {}
+        for w in (1, workers):
+            c = Crawler(workers=w, per_share=w, scandir=slow_scandir)
+            t = time.perf_counter()
+            listed = sum(1 for _ in c.walk([base]))
+            times[w] = time.perf_counter() - t
+            assert listed == n_dirs, (listed, n_dirs)
+    return n_dirs, times
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Parallel directory crawler (benchmark).")
+    ap.add_argument("--bench", action="store_true", help="time serial vs pooled crawl of a temp tree")
+    ap.add_argument("--latency-ms", type=float, default=20.0, help="simulated latency per listing")
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--depth", type=int, default=4, help="tree depth (fan-out 4)")
+    args = ap.parse_args(argv)
+    if not args.bench:
+        ap.print_help()
+        return 1
+    n_dirs, times = bench(args.latency_ms / 1000, args.workers, depth=args.depth)
+    serial, pooled = times[1], times[args.workers]
+    print(f"{n_dirs} folders, {args.latency_ms:g} ms per listing")
+    print(f"  1 worker:   {serial:7.2f} s")
+    print(f"  {args.workers} workers: {pooled:7.2f} s   ({serial / pooled:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""
+Shared Oracle data access — one session pool per database
+==========================================================
+Every tool used to carry its own get_connection() / OracleConnectionManager
+and opened a brand-new Oracle session (TNS lookup + login handshake) for
+every single query.  This module owns that instead:
+
+  * Thick-mode client init happens exactly once per process.
+  * One session pool per named database (odw, sandbox, openwells, ekpspp),
+    created lazily on first use, with a per-session statement cache.
+  * Connections handed out are pooled — conn.close() (or leaving a `with`
+    block) returns the session to the pool rather than logging off.
+  * run_query() re-runs a SELECT once on a fresh session if the pooled one
+    was dropped by the server / network (idle timeout, VPN blip, ...).
+
+Usage:
+    from common import db
+    cols, rows = db.run_query(SQL, {"fld": "Belridge"})
+    with db.connection("odw") as conn:
+        cur = conn.cursor(); ...
+    mgr = db.OracleConnectionManager()      # drop-in for the old classes
+    conn = mgr.get_connection("odw")
+
+Long API lists:
+    sql = "... WHERE wd.well_api_nbr IN (SELECT column_value FROM TABLE(:apis))"
+    cols, rows = db.run_query(sql, {"apis": db.key_list(apis)})
+  The whole list goes over as one collection bind, so the SQL text never
+  changes with the list (one parse, cached cursor) and there is no
+  1000-entry IN-list limit.  Raw cursors: cur.execute(sql, db.bind_params(conn, binds)).
+
+Offline / unit testing:
+    db.set_driver(module)  — any DB-API 2.0 module whose connect() accepts
+    user=, password=, dsn= keywords.  Drivers without create_pool() get a
+    small built-in pool with the same behaviour.
+"""
+
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ─── Connection settings ─────────────────────────────────────────────────────
+DB_CONFIGS = {
+    "odw": {
+        "user": os.getenv("DB_USER_ODW", "rptguser"),
+        "password": os.getenv("DB_PASSWORD_ODW", "allusers"),
+        "dsn": os.getenv("DB_DSN_ODW", "odw"),
+    },
+    "sandbox": {
+        "user": os.getenv("DB_USER_SANDBOX", "engsb"),
+        "password": os.getenv("DB_PASSWORD_SANDBOX", "Engine33r_SB"),
+        "dsn": os.getenv("DB_DSN_SANDBOX", "odw"),
+    },
+    "openwells": {
+        "user": os.getenv("DB_USER_OW", "gen_user"),
+        "password": os.getenv("DB_PASSWORD_OW", "allusers"),
+        "dsn": os.getenv("DB_DSN_OW", "owdb1"),
+    },
+    "ekpspp": {
+        "user": os.getenv("DB_USER_EKPSPP", "oxy_read"),
+        "password": os.getenv("DB_PASSWORD_EKPSPP", "oxy_read"),
+        "dsn": os.getenv("DB_DSN_EKPSPP", "EKPSPP.WORLD"),
+    },
+}
+
+POOL_MIN = 1              # sessions opened when the pool is created
+POOL_MAX = 8              # upper bound per database (background threads share it)
+POOL_INCREMENT = 1
+STMT_CACHE_SIZE = 40      # per-session cached cursors (repeat queries skip the parse)
+RETRY_DELAY_S = 0.5
+KEY_LIST_TYPE = os.getenv("DB_KEY_LIST_TYPE", "SYS.ODCIVARCHAR2LIST")   # VARRAY(32767) OF VARCHAR2(4000)
+
+# Error codes meaning "this session is gone" — safe to re-run a SELECT elsewhere
+DISCONNECT_CODES = (
+    "DPY-1001", "DPY-4011", "DPI-1010", "DPI-1080",
+    "ORA-00028", "ORA-01012", "ORA-02396", "ORA-03113",
+    "ORA-03114", "ORA-03135", "ORA-12537",
+)
+
+_lock = threading.RLock()
+_driver = None
+_client_ready = False
+_client_error = None      # why thick mode failed; reported with the first connect failure
+_pools = {}
+
+
+# ─── Driver / client ─────────────────────────────────────────────────────────
+def set_driver(module):
+    """Use `module` instead of oracledb.  Closes any pools already open."""
+    global _driver, _client_ready, _client_error
+    with _lock:
+        close_all()
+        _driver = module
+        _client_ready = False
+        _client_error = None
+
+
+def get_driver():
+    global _driver
+    if _driver is None:
+        with _lock:
+            if _driver is None:
+                try:
+                    import oracledb as drv
+                except ImportError:
+                    try:
+                        import cx_Oracle as drv     # older installs (EKPSPP PCs)
+                    except ImportError:
+                        raise ImportError(
+                            "Neither 'oracledb' nor 'cx_Oracle' is installed.\n"
+                            "Install with:  pip install oracledb") from None
+                _driver = drv
+    return _driver
+
+
+def init_client():
+    """Switch oracledb to thick mode once per process.
+
+    Thick mode is needed for the older password verifiers on ODW (DPY-3015 in
+    thin mode).  ORACLE_CLIENT_LIB_DIR points at the Instant Client if it is
+    not already on PATH; if the client can't be loaded we stay in thin mode
+    and the load error is kept, so a connect that then fails names the
+    missing Instant Client instead of just DPY-3015.
+    """
+    global _client_ready, _client_error
+    if _client_ready:
+        return
+    with _lock:
+        if _client_ready:
+            return
+        drv = get_driver()
+        init = getattr(drv, "init_oracle_client", None)
+        is_thin = getattr(drv, "is_thin_mode", None)
+        if init is not None and (is_thin is None or is_thin()):
+            lib_dir = os.getenv("ORACLE_CLIENT_LIB_DIR")
+            try:
+                if lib_dir:
+                    init(lib_dir=lib_dir)
+                else:
+                    init()
+            except Exception as e:
+                _client_error = e   # thin mode fallback
+        _client_ready = True
+
+
+def _connect_error(name, exc):
+    """ConnectionError for a failed connect to `name`, naming the thick-mode
+    init failure too if there was one."""
+    msg = f"Failed to connect to Oracle DB '{name}': {error_message(exc)}"
+    if _client_error is not None:
+        msg += ("\n\nOracle thick mode could not be initialized. "
+                "Install Oracle Instant Client and set ORACLE_CLIENT_LIB_DIR, "
+                "or ensure ORACLE_HOME/PATH points to the client installation. "
+                f"Original error: {error_message(_client_error)}")
+    return ConnectionError(msg)
+
+
+def error_message(exc):
+    """Best human-readable text for a driver exception."""
+    obj = exc.args[0] if getattr(exc, "args", None) else exc
+    return getattr(obj, "message", None) or str(obj)
+
+
+def is_disconnect(exc):
+    """True if `exc` means the session was lost rather than the SQL failing."""
+    obj = exc.args[0] if getattr(exc, "args", None) else exc
+    text = f"{getattr(obj, 'full_code', '')} {obj}"
+    return any(code in text for code in DISCONNECT_CODES)
+
+
+# ─── Bulk key sets ───────────────────────────────────────────────────────────
+class KeyList(tuple):
+    """Key set bound as a single collection — see key_list() / bind_params()."""
+
+
+def key_list(values):
+    """Clean, de-duplicated, sorted KeyList from user-entered keys (APIs etc.).
+
+    Sorting means the same wells in a different order share a cache entry.
+    """
+    keys = {str(v).strip() for v in values if v is not None}
+    keys.discard("")
+    return KeyList(sorted(keys))
+
+
+def bind_params(conn, params):
+    """Bind dict for `conn` with every KeyList turned into a KEY_LIST_TYPE object."""
+    if not params or not any(isinstance(v, KeyList) for v in params.values()):
+        return params or {}
+    gettype = getattr(conn, "gettype", None)
+    if gettype is None:
+        return params
+    list_type = gettype(KEY_LIST_TYPE)
+    return {k: list_type.newobject(list(v)) if isinstance(v, KeyList) else v
+            for k, v in params.items()}
+
+
+# ─── Built-in pool (drivers without create_pool) ─────────────────────────────
+class _PooledConnection:
+    """Wraps a raw connection; close() hands it back to its pool."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise AttributeError(f"connection already returned to pool ({name})")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+
+class _SimplePool:
+    """Thread-safe fixed-size pool built on driver.connect()."""
+
+    def __init__(self, driver, cfg, min=1, max=8):
+        self._driver = driver
+        self._cfg = cfg
+        self._max = max
+        self._idle = []
+        self._cond = threading.Condition()
+        self.opened = 0
+        self.busy = 0
+        for _ in range(min):
+            self._idle.append(self._connect())
+            self.opened += 1
+
+    def _connect(self):
+        return self._driver.connect(user=self._cfg["user"],
+                                    password=self._cfg["password"],
+                                    dsn=self._cfg["dsn"])
+
+    def acquire(self):
+        with self._cond:
+            while not self._idle and self.opened >= self._max:
+                self._cond.wait()
+            if self._idle:
+                raw = self._idle.pop()
+            else:
+                self.opened += 1
+                try:
+                    raw = self._connect()
+                except Exception:
+                    self.opened -= 1
+                    raise
+            self.busy += 1
+        return _PooledConnection(self, raw)
+
+    def release(self, raw):
+        with self._cond:
+            self.busy -= 1
+            self._idle.append(raw)
+            self._cond.notify()
+
+    def drop(self, conn):
+        raw, conn._raw = conn._raw, None
+        with self._cond:
+            self.busy -= 1
+            self.opened -= 1
+            self._cond.notify()
+        if raw is not None:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def close(self, force=False):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self.opened -= len(idle)
+        for raw in idle:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+
+# ─── Pools ───────────────────────────────────────────────────────────────────
+def get_pool(name="odw"):
+    """Return (creating on first use) the session pool for database `name`."""
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+    if name not in DB_CONFIGS:
+        raise ValueError(f"Unknown DB connection name: {name}")
+    with _lock:
+        pool = _pools.get(name)
+        if pool is not None:
+            return pool
+        init_client()
+        drv = get_driver()
+        cfg = DB_CONFIGS[name]
+        try:
+            if hasattr(drv, "create_pool"):
+                pool = drv.create_pool(user=cfg["user"], password=cfg["password"],
+                                       dsn=cfg["dsn"], min=POOL_MIN, max=POOL_MAX,
+                                       increment=POOL_INCREMENT,
+                                       stmtcachesize=STMT_CACHE_SIZE)
+            else:
+                pool = _SimplePool(drv, cfg, min=POOL_MIN, max=POOL_MAX)
+        except Exception as e:
+            raise _connect_error(name, e) from e
+        _pools[name] = pool
+        return pool
+
+
+def get_connection(name="odw"):
+    """Pooled connection for `name`.  Call close() (or use `with`) when done."""
+    pool = get_pool(name)
+    try:
+        return pool.acquire()
+    except Exception as e:
+        raise _connect_error(name, e) from e
+
+
+def discard(conn, name="odw"):
+    """Drop a broken connection from its pool instead of returning it."""
+    pool = _pools.get(name)
+    try:
+        if pool is not None:
+            pool.drop(conn)
+        else:
+            conn.close()
+    except Exception:
+        pass
+
+
+@contextmanager
+def connection(name="odw"):
+    conn = get_connection(name)
+    try:
+        yield conn
+    except Exception as e:
+        if is_disconnect(e):
+            discard(conn, name)
+            conn = None
+        raise
+    finally:
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def run_query(sql, params=None, name="odw"):
+    """Execute a SELECT on a pooled session and return (cols, rows).
+
+    If the session turns out to be dead it is dropped from the pool and the
+    query is re-run once on a fresh one.
+    """
+    for attempt in (0, 1):
+        conn = get_connection(name)
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute(sql, bind_params(conn, params))
+                cols = [d[0] for d in cur.description] if cur.description else []
+                rows = cur.fetchall() if cur.description else []
+            finally:
+                try:
+                    cur.close()
+                except Exception:
+                    pass
+        except Exception as e:
+            if is_disconnect(e):
+                discard(conn, name)
+                if attempt == 0:
+                    time.sleep(RETRY_DELAY_S)
+                    continue
+            else:
+                conn.close()
+            raise
+        conn.close()
+        return cols, rows
+
+
+def close_all():
+    """Close every pool (called automatically at interpreter exit)."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.close(force=True)
+        except Exception:
+            pass
+
+
+atexit.register(close_all)
+
+
+# ─── Drop-in for the per-tool OracleConnectionManager classes ────────────────
+class OracleConnectionManager:
+    """Same interface the tools already use; sessions come from the pools."""
+
+    def get_connection(self, name="odw"):
+        return get_connection(name)
+
+    def connect(self, name="odw"):
+        return get_connection(name)
+
+    def available_connections(self):
+        return list(DB_CONFIGS.keys())
@@ -0,0 +1,153 @@
+"""
+Pixel-aware downsampling for long chart series
+==============================================
+New_Wells plots daily injection since spud and EKPSPP plots full monthly /
+daily histories; a line of tens of thousands of points still ends up on a
+~1000 pixel wide axes.  attach() keeps the full-resolution series on the
+side and gives matplotlib only what the current view can show:
+
+    line, = ax.plot(dates, stm, color="#e67e22", lw=0.9, label="Steam Inj")
+    downsample.attach(line, fill=dict(alpha=0.15, color="#e67e22"))
+
+  "minmax" (default)  first / min / max / last point of every pixel column
+                      (M4).  Spikes and dips are always kept, so the drawn
+                      line is the same as the full-resolution one.
+  "lttb"              Largest-Triangle-Three-Buckets, one point per pixel
+                      column.  Smoother, for series where shape matters more
+                      than single-day extremes.
+
+Only the visible x range is decimated, and it is redone whenever the x
+limits change (toolbar zoom / pan / home), so zooming in refines to the
+raw points.  Series at or under the pixel budget are left untouched.
+
+`fill` replaces an ax.fill_between(x, y, **fill) on the same data — the
+fill is rebuilt from the decimated points with the line.  attach() on a line
+that already has one (a ChartHost line reused for the next well) replaces
+the old series and fill rather than stacking another zoom callback.
+
+Needs numpy only; x must be sorted (dates from an ORDER BY query).
+"""
+
+import numpy as np
+
+POINTS_PER_PIXEL = 1     # buckets per pixel of axes width
+
+
+def minmax_indices(x, y, buckets):
+    """Indices of first / min / max / last y in each of `buckets` equal-width x bins."""
+    n = len(x)
+    if n <= 4 * buckets:
+        return np.arange(n)
+    x0, x1 = x[0], x[-1]
+    if x1 <= x0:
+        return np.array([0, n - 1])
+    b = np.minimum(((x - x0) * (buckets / (x1 - x0))).astype(np.int64), buckets - 1)
+    starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    keep = [starts, starts + counts - 1]
+    # fmin/fmax skip NaN; an all-NaN bin just keeps its first/last point
+    for red in (np.fmin, np.fmax):
+        ext = np.repeat(red.reduceat(y, starts), counts)
+        hit = np.flatnonzero(y == ext)
+        keep.append(hit[np.r_[True, b[hit[1:]] != b[hit[:-1]]]] if len(hit) else hit)
+    return np.unique(np.concatenate(keep))
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: `n_out` indices including both ends."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)   # n_out-2 inner buckets
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx = x[nlo:nhi].mean() if nhi > nlo else x[-1]
+        cy = np.nanmean(y[nlo:nhi]) if nhi > nlo else y[-1]
+        ax_, ay_ = x[a], y[a]
+        area = np.abs((ax_ - cx) * (y[lo:hi] - ay_) - (ax_ - x[lo:hi]) * (cy - ay_))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        out[i + 1] = a
+    return out
+
+
+def _fill_verts(x, y):
+    """fill_between(x, y) polygons (down to 0), one per run of finite y."""
+    ok = np.isfinite(y)
+    edges = np.flatnonzero(np.diff(np.r_[0, ok.astype(np.int8), 0]))
+    verts = []
+    for lo, hi in zip(edges[::2], edges[1::2]):
+        xs, ys = x[lo:hi], y[lo:hi]
+        verts.append(np.column_stack([np.r_[xs[0], xs, xs[-1], xs[::-1]],
+                                      np.r_[0.0, ys, 0.0, np.zeros(len(xs))]]))
+    return verts
+
+
+class _Series:
+    """One line's full data + the callback that re-decimates it on zoom."""
+
+    def __init__(self, line, x, y, method, fill):
+        self.line, self.ax, self.method = line, line.axes, method
+        self.x, self.y = x, y
+        xd, yd = self.refine(self.ax)
+        # Created once; refine() only swaps its polygons.  (A new fill_between
+        # inside the xlim callback would re-trigger autoscaling.)
+        self.fill = self.ax.fill_between(xd, yd, **fill) if fill is not None else None
+        if self.fill is not None and line.get_animated():
+            self.fill.set_animated(True)         # blitted with its line (common/charts.py)
+        self.cid = (self.ax.callbacks.connect("xlim_changed", self.refine)
+                    if method is not None else None)
+
+    def detach(self):
+        if self.cid is not None:
+            self.ax.callbacks.disconnect(self.cid)
+        if self.fill is not None:
+            try:
+                self.fill.remove()
+            except (ValueError, NotImplementedError):
+                pass                             # its axes are already gone
+        self.fill = None
+
+    def refine(self, _ax):
+        if self.method is None:                  # unsorted x: full resolution
+            return self.x, self.y
+        ax, n = self.ax, len(self.x)
+        lo, hi = 0, n
+        if not ax.get_autoscalex_on():           # zoomed / panned: visible range only
+            x0, x1 = sorted(ax.get_xlim())
+            lo = max(int(np.searchsorted(self.x, x0, "left")) - 1, 0)
+            hi = min(int(np.searchsorted(self.x, x1, "right")) + 1, n)
+        buckets = max(int(ax.bbox.width * POINTS_PER_PIXEL), 16)
+        xs, ys = self.x[lo:hi], self.y[lo:hi]
+        if self.method == "lttb":
+            idx = lttb_indices(xs, ys, buckets)
+        else:
+            idx = minmax_indices(xs, ys, buckets)
+        xd, yd = xs[idx], ys[idx]
+        self.line.set_data(xd, yd)
+        if getattr(self, "fill", None) is not None:
+            self.fill.set_verts(_fill_verts(xd, yd))
+        return xd, yd
+
+
+def attach(line, method="minmax", fill=None):
+    """Downsample a plotted Line2D to its axes' pixel width, refining on zoom.
+
+    Returns the line.  A line whose x isn't sorted is left at full resolution.
+    """
+    old = getattr(line, "_downsample", None)
+    if old is not None:
+        old.detach()
+        line._downsample = None
+    ax = line.axes
+    x = np.asarray(ax.xaxis.convert_units(line.get_xdata(orig=True)), dtype=float)
+    y = np.asarray(line.get_ydata(orig=True), dtype=float)
+    if len(x) < 2 or np.any(np.diff(x) < 0):
+        if fill is None:
+            return line
+        method = None
+    line._downsample = _Series(line, x, y, method, fill)   # lives as long as the line
+    return line
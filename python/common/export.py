@@ -0,0 +1,282 @@
+"""
+Streaming exports — CSV, write-only Excel workbook, Parquet
+===========================================================
+The export buttons used to read rows back out of the Treeview (display
+text, thousands separators and all) or build a whole DataFrame before
+writing.  write() streams typed rows from a result model straight to the
+file, EXPORT_CHUNK rows at a time, so memory stays flat however many rows
+the daily-injection pulls return, and numbers / dates land in the file as
+numbers and dates:
+
+    n = VirtualTable.of(tree).export(path)            # table rows, view order
+    n = export.write(path, *export.frame_source(df))  # a DataFrame, in slices
+    n = export.write(path, columns, rows)             # any iterable of tuples
+
+The format comes from the extension:
+
+  .csv       csv.writer; dates ISO (yyyy-mm-dd, time only when not midnight),
+             blanks for None / NaN, no number formatting
+  .xlsx      openpyxl write-only workbook (rows go straight to the zip);
+             real date cells, a new sheet every EXCEL_MAX_ROWS rows
+  .parquet   pyarrow, one row group per chunk; column types widen if a later
+             chunk needs it (optional — ImportError names the package if it
+             isn't installed)
+
+write_workbook(path, sheets) writes several sheets to one .xlsx; `sheets` can
+be a generator, so each sheet's query runs only when its turn comes.
+"""
+
+import csv
+import math
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+
+EXPORT_CHUNK = 50_000        # rows per write / parquet row group / DataFrame slice
+EXCEL_MAX_ROWS = 1_048_575   # data rows per sheet (Excel limit minus the header)
+FILETYPES = [("CSV", "*.csv"), ("Excel workbook", "*.xlsx"), ("Parquet", "*.parquet")]
+
+
+# ─── Values ──────────────────────────────────────────────────────────────────
+def _value(v):
+    """Plain Python value for a cell: None for blanks, datetime/float/int/str."""
+    if v is None:
+        return None
+    if isinstance(v, float):
+        return None if math.isnan(v) else v
+    if isinstance(v, Decimal):
+        return float(v)
+    if isinstance(v, datetime):
+        if v != v:                                  # NaT
+            return None
+        to_py = getattr(v, "to_pydatetime", None)  # pandas Timestamp
+        v = to_py() if to_py else v
+        return v.replace(tzinfo=None) if v.tzinfo else v
+    item = getattr(v, "item", None)                 # numpy scalar
+    if item is not None:
+        return _value(item())
+    return v
+
+
+def _csv_text(v):
+    v = _value(v)
+    if v is None:
+        return ""
+    if isinstance(v, datetime):
+        return v.strftime("%Y-%m-%d" if v.time() == datetime.min.time() else "%Y-%m-%d %H:%M:%S")
+    if isinstance(v, date):
+        return v.isoformat()
+    return v
+
+
+def _chunks(rows, size):
+    it = iter(rows)
+    while True:
+        block = list(islice(it, size))
+        if not block:
+            return
+        yield block
+
+
+def frame_source(df, chunk=EXPORT_CHUNK):
+    """(columns, rows) for write(): the frame's rows as tuples, a slice at a time."""
+    def rows():
+        for start in range(0, len(df), chunk):
+            part = df.iloc[start:start + chunk]
+            part = part.astype(object).where(part.notna(), None)
+            yield from part.itertuples(index=False, name=None)
+    return [str(c) for c in df.columns], rows()
+
+
+# ─── Writers ─────────────────────────────────────────────────────────────────
+def write_csv(path, columns, rows, chunk=EXPORT_CHUNK):
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(columns)
+        for block in _chunks(rows, chunk):
+            w.writerows([_csv_text(v) for v in r] for r in block)
+            n += len(block)
+    return n
+
+
+def _append_sheet(wb, name, columns, rows, chunk):
+    from openpyxl.cell import WriteOnlyCell
+
+    def new_sheet(part):
+        ws = wb.create_sheet(title=(name if part == 1 else f"{name} ({part})")[:31])
+        ws.append(list(columns))
+        return ws
+
+    part, ws, on_sheet, n = 1, new_sheet(1), 0, 0
+    for block in _chunks(rows, chunk):
+        for r in block:
+            if on_sheet == EXCEL_MAX_ROWS:
+                part += 1
+                ws, on_sheet = new_sheet(part), 0
+            out = []
+            for v in r:
+                v = _value(v)
+                if isinstance(v, datetime) and v.time() == datetime.min.time():
+                    v = WriteOnlyCell(ws, v)
+                    v.number_format = "yyyy-mm-dd"
+                out.append(v)
+            ws.append(out)
+            on_sheet += 1
+        n += len(block)
+    return n
+
+
+def write_workbook(path, sheets, chunk=EXPORT_CHUNK):
+    """Several (sheet name, columns, rows) to one write-only .xlsx; returns total rows.
+
+    The workbook is saved under a temp name and moved into place only once
+    every sheet is written, so a failed sheet leaves no half-finished file."""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    n = 0
+    try:
+        for name, columns, rows in sheets:
+            n += _append_sheet(wb, name, columns, rows, chunk)
+    except BaseException:
+        for ws in wb.worksheets:                    # drop the sheets' temp files
+            try:
+                ws.close()
+                ws._writer.cleanup()
+            except Exception:
+                pass
+        raise
+    if not wb.worksheets:
+        wb.create_sheet("Sheet1")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        wb.save(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return n
+
+
+def write_xlsx(path, columns, rows, sheet="Data", chunk=EXPORT_CHUNK):
+    return write_workbook(path, [(sheet, columns, rows)], chunk)
+
+
+def _arrow_type(pa, values):
+    """Column type of a chunk: numbers as float64 (Oracle NUMBER can mix
+    integral and fractional values), dates as timestamps, null while every
+    value is blank, else string."""
+    kinds = {type(v) for v in values if v is not None}
+    if not kinds:
+        return pa.null()
+    if all(issubclass(k, datetime) for k in kinds):
+        return pa.timestamp("us")
+    if all(issubclass(k, (int, float)) and not issubclass(k, bool) for k in kinds):
+        return pa.float64()
+    if kinds == {bool}:
+        return pa.bool_()
+    return pa.string()
+
+
+def _widened(pa, have, need):
+    """Type a column of type `have` takes to also hold a chunk needing `need`."""
+    if pa.types.is_null(need) or need == have or pa.types.is_string(have):
+        return have
+    return need if pa.types.is_null(have) else pa.string()
+
+
+def _arrow_array(pa, vals, type):
+    if pa.types.is_string(type):
+        vals = [None if v is None else str(v) for v in vals]
+    return pa.array(vals, type=type)
+
+
+def _rewrite(pa, pq, path, schema):
+    """Re-write the row groups already in `path` under the widened `schema`,
+    one row group at a time; returns the open writer to carry on with."""
+    moved = f"{path}.old"
+    os.replace(path, moved)
+    try:
+        old = pq.ParquetFile(moved)
+        writer = pq.ParquetWriter(path, schema)
+        for i in range(old.num_row_groups):
+            table = old.read_row_group(i)
+            arrays = [col if col.type == field.type else
+                      _arrow_array(pa, col.to_pylist(), field.type)
+                      for col, field in zip(table.columns, schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        old.close()
+    finally:
+        os.remove(moved)
+    return writer
+
+
+def write_parquet(path, columns, rows, chunk=EXPORT_CHUNK):
+    """Column types follow the data, not just the first chunk: a column blank
+    so far is null-typed until values turn up, and one whose later values
+    don't fit its type (a date in a number column, ...) becomes string — the
+    row groups already written are re-written to match.  The file is built
+    under a temp name, so a failed export leaves no partial file behind."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow:  pip install pyarrow") from None
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    writer, schema, n = None, None, 0
+    try:
+        for block in _chunks(rows, chunk):
+            cols = [[_value(v) for v in c] for c in zip(*block)] if block else []
+            need = [_arrow_type(pa, vals) for vals in cols]
+            if schema is None:
+                schema = pa.schema([(str(name), t) for name, t in zip(columns, need)])
+                writer = pq.ParquetWriter(tmp, schema)
+            else:
+                types = [_widened(pa, f.type, t) for f, t in zip(schema, need)]
+                if types != schema.types:
+                    schema = pa.schema([(f.name, t) for f, t in zip(schema, types)])
+                    writer.close()
+                    writer = None
+                    writer = _rewrite(pa, pq, tmp, schema)
+            arrays = [_arrow_array(pa, vals, field.type) for field, vals in zip(schema, cols)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            n += len(block)
+        if writer is None:                              # no rows: header-only file
+            schema = pa.schema([(str(c), pa.string()) for c in columns])
+            writer = pq.ParquetWriter(tmp, schema)
+        writer.close()
+        writer = None
+        os.replace(tmp, path)
+    except BaseException:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return n
+
+
+_WRITERS = {".csv": write_csv, ".xlsx": write_xlsx, ".parquet": write_parquet}
+
+
+def write(path, columns, rows, chunk=EXPORT_CHUNK, **kw):
+    """Stream rows to `path` in the format its extension names; returns row count.
+
+    `sheet=` names the .xlsx sheet (ignored for the other formats)."""
+    ext = os.path.splitext(path)[1].lower()
+    writer = _WRITERS.get(ext)
+    if writer is None:
+        raise ValueError(f"Unsupported export type '{ext}' (use .csv, .xlsx or .parquet)")
+    if writer is not write_xlsx:
+        kw.pop("sheet", None)
+    return writer(path, columns, rows, chunk=chunk, **kw)
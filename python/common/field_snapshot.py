@@ -0,0 +1,460 @@
+"""
+Field snapshot engine — one fetch for the Field Quicklook monthly views
+========================================================================
+The KPI, top/bottom, strategy and trend tabs used to be five separate ODW
+queries, four of them with their own correlated MAX(eftv_dttm) subquery over
+the whole field.  They all read the same rows: active PROD/INJ completions
+in the field joined to cmpl_mnly_fact.  This module pulls those rows ONCE
+for the trend window and derives every view locally with pandas/NumPy:
+
+  * prod KPIs  — latest month with any producer oil > 0
+  * inj KPIs   — latest month with any injector row
+  * top / bottom 15 producers by oil rate (that same producer month)
+  * engineering-strategy breakdown (latest month of any active completion,
+    PROD + INJ rows)
+  * 12-month field trend
+
+The "latest month" of each view comes from one small MAX(eftv_dttm) lookup
+over the field's whole history (SQL_LATEST_MONTHS), as the old correlated
+subqueries had it, so a field that hasn't reported in the last year still
+shows its last data month; that month's rows are fetched separately when it
+falls outside the trend window.
+
+The rows come from the local replica (common/mirror.py) when the field is
+mirrored, otherwise from ODW through the query cache.  Column names and
+shapes match what the old per-view SQL returned, so the tab code is
+unchanged.
+
+Built snapshots are kept in the query-cache file, keyed by field and
+SNAPSHOT_VERSION and tagged with their data month, so switching back to a
+field renders without touching ODW.  warm() / Warmer prefetch them for
+every field (or the most-used ones) at startup and on a schedule.
+
+Usage:
+    from common import field_snapshot
+    snap = field_snapshot.load("Belridge")
+    snap["prod_kpi"]["TOTAL_OIL_BOPD"];  cols, rows = snap["trend"]
+    field_snapshot.Warmer(FIELDS, extra_sql=(SQL_WELLS_DOWN,)).start()
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from common import mirror, query_cache
+
+TREND_MONTHS = 12
+TOP_N = 15
+
+SNAPSHOT_VERSION = 2      # bump whenever build() output changes — old snapshots are ignored
+WARM_TOP_N = int(os.getenv("RE_TOOLS_WARM_TOP_N", "0"))          # 0 = every field
+WARM_INTERVAL_S = int(os.getenv("RE_TOOLS_WARM_INTERVAL_S", "3600"))
+USAGE_FILE = os.path.join(query_cache.CACHE_DIR, "field_usage.json")
+
+# ─── Fetch ───────────────────────────────────────────────────────────────────
+_SNAPSHOT_SELECT = """
+SELECT cd.cmpl_fac_id AS FAC_ID, cd.cmpl_nme AS CMPL_NME,
+       cd.engr_strg_nme AS ENGR_STRG_NME, cd.prim_purp_type_cde AS PURPOSE,
+       cmf.eftv_dttm AS MONTH,
+       cmf.aloc_oil_prod_dly_rte_qty AS OIL, cmf.aloc_gros_prod_dly_rte_qty AS GROSS,
+       cmf.aloc_wtr_prod_dly_rte_qty AS WATER, cmf.aloc_cnts_stm_inj_dly_rte_qty AS STEAM,
+       cmf.aloc_wtr_inj_dly_rte_qty AS WATER_INJ
+"""
+
+SQL_SNAPSHOT = _SNAPSHOT_SELECT + f"""
+FROM dwrptg.cmpl_dmn cd
+JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+WHERE cd.opnl_fld = :field_name
+  AND cd.actv_indc = 'Y'
+  AND cd.prim_purp_type_cde IN ('PROD', 'INJ')
+  AND cmf.eftv_dttm >= ADD_MONTHS(TRUNC(SYSDATE, 'MM'), -{TREND_MONTHS})
+"""
+
+# Same rows from the local replica (SQLite)
+SQL_SNAPSHOT_MIRROR = _SNAPSHOT_SELECT + """
+FROM cmpl_dmn cd
+JOIN cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+WHERE cd.opnl_fld = :field_name
+  AND cd.actv_indc = 'Y'
+  AND cd.prim_purp_type_cde IN ('PROD', 'INJ')
+  AND cmf.eftv_dttm >= :since
+"""
+
+# Latest month per view, over the field's full history (not just the window)
+_LATEST_SELECT = """
+SELECT MAX(CASE WHEN cd.prim_purp_type_cde = 'PROD' AND cmf.aloc_oil_prod_dly_rte_qty > 0
+                THEN cmf.eftv_dttm END) AS PROD_MONTH,
+       MAX(CASE WHEN cd.prim_purp_type_cde = 'INJ' THEN cmf.eftv_dttm END) AS INJ_MONTH,
+       MAX(cmf.eftv_dttm) AS ANY_MONTH
+"""
+
+SQL_LATEST_MONTHS = _LATEST_SELECT + """
+FROM dwrptg.cmpl_dmn cd
+JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+WHERE cd.opnl_fld = :field_name
+  AND cd.actv_indc = 'Y'
+"""
+
+SQL_LATEST_MONTHS_MIRROR = _LATEST_SELECT + """
+FROM cmpl_dmn cd
+JOIN cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+WHERE cd.opnl_fld = :field_name
+  AND cd.actv_indc = 'Y'
+"""
+
+# Snapshot rows of latest months older than the window (fields gone quiet)
+_MONTH_ROWS_WHERE = """
+WHERE cd.opnl_fld = :field_name
+  AND cd.actv_indc = 'Y'
+  AND cd.prim_purp_type_cde IN ('PROD', 'INJ')
+  AND cmf.eftv_dttm IN (:m1, :m2, :m3)
+"""
+
+SQL_MONTH_ROWS = _SNAPSHOT_SELECT + """
+FROM dwrptg.cmpl_dmn cd
+JOIN dwrptg.cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+""" + _MONTH_ROWS_WHERE
+
+SQL_MONTH_ROWS_MIRROR = _SNAPSHOT_SELECT + """
+FROM cmpl_dmn cd
+JOIN cmpl_mnly_fact cmf ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+""" + _MONTH_ROWS_WHERE
+
+RATE_COLS = ("OIL", "GROSS", "WATER", "STEAM", "WATER_INJ")
+LATEST_COLS = ("PROD_MONTH", "INJ_MONTH", "ANY_MONTH")
+
+
+def _window_start(now=None):
+    """First month of the trend window — ADD_MONTHS(TRUNC(SYSDATE, 'MM'), -TREND_MONTHS)."""
+    return datetime.fromisoformat(mirror.months_ago(TREND_MONTHS, now=now))
+
+
+def fetch(field, refresh=False):
+    """(cols, rows, latest, extra_rows) for the field — replica first, then ODW.
+
+    rows cover the trend window; latest is {PROD_MONTH, INJ_MONTH, ANY_MONTH};
+    extra_rows are the rows of any of those months older than the window."""
+    use_mirror = not refresh and mirror.has_field(field)
+    if use_mirror:
+        cols, rows = mirror.query(SQL_SNAPSHOT_MIRROR,
+                                  {"field_name": field, "since": mirror.months_ago(TREND_MONTHS)},
+                                  date_cols=("MONTH",))
+        lcols, lrows = mirror.query(SQL_LATEST_MONTHS_MIRROR, {"field_name": field},
+                                    date_cols=LATEST_COLS)
+    else:
+        cols, rows = query_cache.run_query(SQL_SNAPSHOT, {"field_name": field}, "odw", refresh=refresh)
+        lcols, lrows = query_cache.run_query(SQL_LATEST_MONTHS, {"field_name": field}, "odw",
+                                             refresh=refresh)
+    latest = dict(zip([c.upper() for c in lcols], lrows[0])) if lrows else {}
+    latest = {c: latest.get(c) for c in LATEST_COLS}
+
+    start = _window_start()
+    old = sorted({m for m in latest.values() if m is not None and m < start})
+    extra_rows = []
+    if old:
+        months = (old + [old[0]] * 3)[:3]
+        if use_mirror:
+            binds = {f"m{i}": m.strftime("%Y-%m-%d %H:%M:%S") for i, m in enumerate(months, 1)}
+            _, extra_rows = mirror.query(SQL_MONTH_ROWS_MIRROR, dict(binds, field_name=field),
+                                         date_cols=("MONTH",))
+        else:
+            binds = {f"m{i}": m for i, m in enumerate(months, 1)}
+            _, extra_rows = query_cache.run_query(SQL_MONTH_ROWS, dict(binds, field_name=field),
+                                                  "odw", refresh=refresh)
+    return cols, rows, latest, extra_rows
+
+
+# ─── Derive ──────────────────────────────────────────────────────────────────
+def _frame(cols, rows):
+    df = pd.DataFrame.from_records(rows, columns=[c.upper() for c in cols])
+    df["MONTH"] = pd.to_datetime(df["MONTH"], errors="coerce")
+    for c in RATE_COLS:
+        df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+    return df
+
+
+def _records(df):
+    """DataFrame -> list of plain tuples, NaN/NaT -> None (Treeview / charts)."""
+    out = df.astype(object).where(df.notna(), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def _ratio(num, den, scale=100.0):
+    """ROUND(num / NULLIF(den, 0) * scale, 1) over arrays — den == 0 -> NaN."""
+    num = np.asarray(num, dtype="float64")
+    den = np.asarray(den, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.round(np.where(den != 0, num / den * scale, np.nan), 1)
+
+
+def _prod_kpi(prod, month):
+    if month is None:
+        return {}
+    cur = prod[prod["MONTH"] == month]
+    oil, gross, water = cur["OIL"].sum(), cur["GROSS"].sum(), cur["WATER"].sum()
+    return {
+        "ACTIVE_PRODUCERS": int(cur["FAC_ID"].nunique()),
+        "TOTAL_OIL_BOPD": round(float(oil)),
+        "TOTAL_GROSS_BFPD": round(float(gross)),
+        "TOTAL_WATER_BWPD": round(float(water)),
+        "FIELD_WC_PCT": round(float(water / gross * 100), 1) if gross else None,
+        "DATA_MONTH": month,
+    }
+
+
+def _inj_kpi(inj, month):
+    if month is None:
+        return {}
+    cur = inj[inj["MONTH"] == month]
+    return {
+        "ACTIVE_INJECTORS": int(cur["FAC_ID"].nunique()),
+        "TOTAL_STEAM_BSPD": round(float(cur["STEAM"].sum())),
+        "TOTAL_WATER_INJ_BWPD": round(float(cur["WATER_INJ"].sum())),
+    }
+
+
+def _top_bottom(prod, month):
+    cols = ["CMPL_NME", "ENGR_STRG_NME", "OIL_BOPD", "GROSS_BFPD", "WC_PCT",
+            "RANK_TOP", "RANK_BOT"]
+    if month is None:
+        return cols, []
+    cur = prod[(prod["MONTH"] == month) & (prod["OIL"] > 0)]
+    cur = cur.sort_values("OIL", ascending=False, kind="stable")
+    n = len(cur)
+    out = pd.DataFrame({
+        "CMPL_NME": cur["CMPL_NME"].to_numpy(),
+        "ENGR_STRG_NME": cur["ENGR_STRG_NME"].to_numpy(),
+        "OIL_BOPD": cur["OIL"].round(1).to_numpy(),
+        "GROSS_BFPD": cur["GROSS"].round(1).to_numpy(),
+        "WC_PCT": _ratio(cur["WATER"], cur["GROSS"].fillna(0)),
+        "RANK_TOP": np.arange(1, n + 1),
+        "RANK_BOT": np.arange(n, 0, -1),
+    })
+    out = out[(out["RANK_TOP"] <= TOP_N) | (out["RANK_BOT"] <= TOP_N)]
+    return cols, _records(out)
+
+
+def _by_purpose(df):
+    """Per-row rate columns zeroed outside their purpose (SUM(CASE ... ELSE 0))."""
+    is_prod = (df["PURPOSE"] == "PROD").to_numpy()
+    is_inj = (df["PURPOSE"] == "INJ").to_numpy()
+    return df.assign(
+        P_OIL=np.where(is_prod, df["OIL"].fillna(0), 0.0),
+        P_GROSS=np.where(is_prod, df["GROSS"].fillna(0), 0.0),
+        P_WATER=np.where(is_prod, df["WATER"].fillna(0), 0.0),
+        I_STEAM=np.where(is_inj, df["STEAM"].fillna(0), 0.0),
+        I_WATER=np.where(is_inj, df["WATER_INJ"].fillna(0), 0.0),
+        PROD_ID=df["FAC_ID"].where(is_prod),
+        INJ_ID=df["FAC_ID"].where(is_inj),
+    )
+
+
+def _engr(df, month):
+    cols = ["ENGR_STRG_NME", "PRODUCERS", "INJECTORS", "OIL_BOPD", "GROSS_BFPD",
+            "STEAM_BSPD", "WATER_INJ_BWPD", "WC_PCT", "INSTANTANEOUS_SOR"]
+    cur = df[df["MONTH"] == month] if month is not None else df.iloc[:0]
+    if cur.empty:
+        return cols, []
+    cur = _by_purpose(cur)
+    g = cur.groupby("ENGR_STRG_NME", dropna=False, sort=False).agg(
+        PRODUCERS=("PROD_ID", "nunique"), INJECTORS=("INJ_ID", "nunique"),
+        OIL=("P_OIL", "sum"), GROSS=("P_GROSS", "sum"), WATER=("P_WATER", "sum"),
+        STEAM=("I_STEAM", "sum"), WATER_INJ=("I_WATER", "sum"),
+    ).reset_index()
+    out = pd.DataFrame({
+        "ENGR_STRG_NME": g["ENGR_STRG_NME"],
+        "PRODUCERS": g["PRODUCERS"],
+        "INJECTORS": g["INJECTORS"],
+        "OIL_BOPD": g["OIL"].round(0).astype("int64"),
+        "GROSS_BFPD": g["GROSS"].round(0).astype("int64"),
+        "STEAM_BSPD": g["STEAM"].round(0).astype("int64"),
+        "WATER_INJ_BWPD": g["WATER_INJ"].round(0).astype("int64"),
+        "WC_PCT": _ratio(g["WATER"], g["GROSS"]),
+        "INSTANTANEOUS_SOR": _ratio(g["STEAM"], g["OIL"], scale=1.0),
+    })
+    out = out.sort_values("OIL_BOPD", ascending=False, kind="stable")
+    return cols, _records(out)
+
+
+def _trend(df):
+    cols = ["MONTH", "OIL_BOPD", "GROSS_BFPD", "STEAM_BSPD", "WATER_INJ_BWPD",
+            "WC_PCT", "ACTIVE_PRODUCERS", "ACTIVE_INJECTORS"]
+    if df.empty:
+        return cols, []
+    cur = _by_purpose(df)
+    cur["PROD_ID"] = cur["PROD_ID"].where(cur["OIL"] > 0)
+    cur["INJ_ID"] = cur["INJ_ID"].where(cur["STEAM"] > 0)
+    g = cur.groupby("MONTH", sort=True).agg(
+        OIL=("P_OIL", "sum"), GROSS=("P_GROSS", "sum"), WATER=("P_WATER", "sum"),
+        STEAM=("I_STEAM", "sum"), WATER_INJ=("I_WATER", "sum"),
+        PRODUCERS=("PROD_ID", "nunique"), INJECTORS=("INJ_ID", "nunique"),
+    ).reset_index()
+    out = pd.DataFrame({
+        "MONTH": g["MONTH"],
+        "OIL_BOPD": g["OIL"].round(0).astype("int64"),
+        "GROSS_BFPD": g["GROSS"].round(0).astype("int64"),
+        "STEAM_BSPD": g["STEAM"].round(0).astype("int64"),
+        "WATER_INJ_BWPD": g["WATER_INJ"].round(0).astype("int64"),
+        "WC_PCT": _ratio(g["WATER"], g["GROSS"]),
+        "ACTIVE_PRODUCERS": g["PRODUCERS"],
+        "ACTIVE_INJECTORS": g["INJECTORS"],
+    })
+    return cols, _records(out)
+
+
+def _month(value):
+    return None if value is None or pd.isna(value) else pd.Timestamp(value)
+
+
+def _latest_in(df):
+    """{PROD_MONTH, INJ_MONTH, ANY_MONTH} taken from the rows themselves."""
+    def top(months):
+        return months.max() if months.notna().any() else None
+    prod = df[df["PURPOSE"] == "PROD"]
+    return {"PROD_MONTH": top(prod.loc[prod["OIL"] > 0, "MONTH"]),
+            "INJ_MONTH": top(df.loc[df["PURPOSE"] == "INJ", "MONTH"]),
+            "ANY_MONTH": top(df["MONTH"])}
+
+
+def build(cols, rows, latest=None, extra_rows=()):
+    """Every monthly view from one snapshot fetch (see fetch()).
+
+    Without `latest` the months are taken from the rows (the window only)."""
+    window = _frame(cols, rows)
+    df = _frame(cols, list(rows) + list(extra_rows)) if extra_rows else window
+    latest = {c: _month(m) for c, m in (latest if latest is not None else _latest_in(df)).items()}
+    prod = df[df["PURPOSE"] == "PROD"]
+    inj = df[df["PURPOSE"] == "INJ"]
+    month = latest.get("PROD_MONTH")
+    return {
+        "data_month": month,
+        "prod_kpi": _prod_kpi(prod, month),
+        "inj_kpi": _inj_kpi(inj, latest.get("INJ_MONTH")),
+        "top_bottom": _top_bottom(prod, month),
+        "engr": _engr(df, latest.get("ANY_MONTH")),
+        "trend": _trend(window),
+    }
+
+
+# ─── Snapshot cache ──────────────────────────────────────────────────────────
+def _key(field):
+    return query_cache.make_key("field_snapshot", {"field": field, "v": SNAPSHOT_VERSION},
+                                "snapshot")
+
+
+def cached(field):
+    """Stored snapshot for `field`, or None (missing, expired, older version)."""
+    try:
+        return query_cache.get(_key(field))
+    except Exception:
+        return None
+
+
+def load(field, refresh=False, rebuild=False):
+    """Snapshot for one field — the stored copy if there is one.
+
+    rebuild=True re-derives it from fetch() (which may still be served by the
+    query cache); refresh=True also forces the fetch to go to ODW.
+    """
+    if not (refresh or rebuild):
+        snap = cached(field)
+        if snap is not None:
+            return snap
+    snap = build(*fetch(field, refresh))
+    snap["field"] = field
+    snap["built_at"] = datetime.now()
+    try:
+        # expires with the monthly facts it was built from
+        query_cache.put_value(_key(field), SQL_SNAPSHOT, snap, "snapshot")
+    except Exception:
+        pass
+    return snap
+
+
+# ─── Field usage (which fields to warm first) ────────────────────────────────
+_usage_lock = threading.Lock()
+
+
+def _read_usage():
+    try:
+        with open(USAGE_FILE, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_use(field):
+    """Count one Quicklook load of `field` (drives warm ordering)."""
+    with _usage_lock:
+        usage = _read_usage()
+        usage[field] = usage.get(field, 0) + 1
+        try:
+            os.makedirs(os.path.dirname(USAGE_FILE), exist_ok=True)
+            with open(USAGE_FILE, "w", encoding="utf-8") as fh:
+                json.dump(usage, fh)
+        except OSError:
+            pass
+
+
+def most_used(fields, n=0):
+    """`fields` ordered by past use (stable for ties); first n if n > 0."""
+    usage = _read_usage()
+    ordered = sorted(fields, key=lambda f: -usage.get(f, 0))
+    return ordered[:n] if n > 0 else ordered
+
+
+# ─── Warmer ──────────────────────────────────────────────────────────────────
+def warm(fields, extra_sql=(), rebuild=False, stop=None, progress=None):
+    """Build/store snapshots for `fields` and pre-run `extra_sql` (binds
+    :field_name) through the query cache.  Returns {field: error} for
+    failures; one bad field doesn't stop the rest."""
+    failed = {}
+    for i, field in enumerate(fields, 1):
+        if stop is not None and stop.is_set():
+            break
+        if progress:
+            progress(field, i, len(fields))
+        try:
+            load(field, rebuild=rebuild)
+            for sql in extra_sql:
+                query_cache.run_query(sql, {"field_name": field}, "odw")
+        except Exception as e:
+            failed[field] = str(e)
+    return failed
+
+
+class Warmer(threading.Thread):
+    """Daemon thread: warm() the most-used fields now, then every interval_s."""
+
+    def __init__(self, fields, extra_sql=(), top_n=WARM_TOP_N,
+                 interval_s=WARM_INTERVAL_S, progress=None, done=None):
+        super().__init__(name="field-warmer", daemon=True)
+        self.fields = list(fields)
+        self.extra_sql = tuple(extra_sql)
+        self.top_n = top_n
+        self.interval_s = interval_s
+        self.progress = progress      # progress(field, i, n) — called on this thread
+        self.done = done              # done(failed: dict) after each pass
+        self._halt = threading.Event()
+
+    def stop(self):
+        self._halt.set()
+
+    def run(self):
+        first = True
+        while not self._halt.is_set():
+            t0 = time.time()
+            failed = warm(most_used(self.fields, self.top_n), self.extra_sql,
+                          rebuild=not first, stop=self._halt, progress=self.progress)
+            first = False
+            if self.done:
+                self.done(failed)
+            if self.interval_s <= 0:
+                break
+            self._halt.wait(max(0.0, self.interval_s - (time.time() - t0)))
+
@@ -0,0 +1,116 @@
+"""
+Per-well chart histories, prefetched for a whole pull
+=====================================================
+The chart tabs (Abandoned_Wells, New_Wells) show one well's monthly
+production / well tests / status / daily injection at a time, and used to
+query ODW on every click.  HistoryStore.load() instead runs the history
+query once for every well in the pull — the key list bound as one
+collection, KEY_CHUNK keys per round trip — and files the rows per well:
+
+    store = HistoryStore()
+    store.load("tests", SQL_WELL_TEST_HISTORY_BULK, fac_ids, refresh=refresh)
+    hit = store.get("tests", fid)        # (cols, rows) as the per-well query, or None
+
+The bulk SQL is the per-well SQL with `= :key` swapped for
+`IN (SELECT TO_NUMBER(column_value) FROM TABLE(:keys))`, the key added as the
+FIRST selected column, and the key added to the front of ORDER BY.  The key
+column is dropped again when a well's rows are filed.
+
+Storage is columnar per well: int columns without blanks are packed into
+array('q'), float columns into array('d') (None kept as NaN, unless the
+column holds a NaN of its own), everything else is a tuple — so get() gives
+back the same values and types the query did.  Wells the query returned
+nothing for are filed empty, so get() only misses for wells never loaded.
+"""
+
+import math
+import threading
+from array import array
+
+from common import db
+from common import query_cache
+
+KEY_CHUNK = 1000    # keys bound per bulk query (one query-cache entry each)
+
+
+def _norm(key):
+    """Store key for a facility id / dmn key (1234, 1234.0 and "1234" match)."""
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    return str(key).strip()
+
+
+def _pack(values):
+    """Column of values -> array('q') / array('d') where that round-trips exactly, else a tuple."""
+    kinds = {type(v) for v in values}
+    if kinds == {int}:
+        try:
+            return array("q", values)
+        except OverflowError:
+            pass                                   # beyond int64
+    elif kinds <= {float, type(None)} and all(v is None or v == v for v in values):
+        return array("d", (math.nan if v is None else v for v in values))
+    return tuple(values)
+
+
+def _unpack(col):
+    if isinstance(col, array):
+        if col.typecode == "q":
+            return col.tolist()
+        return [None if v != v else v for v in col]
+    return col
+
+
+class HistoryStore:
+    """Columnar per-well history blocks, keyed (kind, well key)."""
+
+    def __init__(self):
+        self._data = {}                    # (kind, key) -> (cols, packed columns, nrows)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def put(self, kind, key, cols, rows):
+        packed = tuple(_pack(c) for c in zip(*rows)) if rows else ()
+        with self._lock:
+            self._data[(kind, _norm(key))] = (list(cols), packed, len(rows))
+
+    def has(self, kind, key):
+        return (kind, _norm(key)) in self._data
+
+    def get(self, kind, key):
+        """(cols, rows) for one well, exactly as its per-well query returns, or None."""
+        block = self._data.get((kind, _norm(key)))
+        if block is None:
+            return None
+        cols, packed, n = block
+        if not n:
+            return list(cols), []
+        return list(cols), list(zip(*(_unpack(c) for c in packed)))
+
+    def load(self, kind, sql, keys, params=None, refresh=False, name="odw", progress=None):
+        """Fetch `sql` for all `keys` in KEY_CHUNK batches and file rows per key.
+
+        `sql` binds the key list as :keys (plus any `params`) and returns the
+        key as its first column.  Returns the number of rows loaded.
+        """
+        keys = db.key_list(_norm(k) for k in keys if k is not None)
+        total = 0
+        for start in range(0, len(keys), KEY_CHUNK):
+            chunk = db.KeyList(keys[start:start + KEY_CHUNK])
+            binds = dict(params or {}, keys=chunk)
+            cols, rows = query_cache.run_query(sql, binds, name, refresh=refresh)
+            by_key = {k: [] for k in chunk}
+            for r in rows:
+                by_key.setdefault(_norm(r[0]), []).append(r[1:])
+            for k, krows in by_key.items():
+                self.put(kind, k, cols[1:], krows)
+            total += len(rows)
+            if progress:
+                progress(kind, min(start + KEY_CHUNK, len(keys)), len(keys))
+        return total
@@ -0,0 +1,154 @@
+"""
+Crash-safe folder-index store (SQLite, WAL) for the network-share indexers
+==========================================================================
+FolderIndexer used to checkpoint by rewriting the whole `<name>_status.json`
+and the ever-growing `<name>_files.json` every 500 folders — each checkpoint
+slower than the last, quadratic overall, and a crash mid-write could leave
+either file truncated.  IndexStore keeps the crawl state in one SQLite file
+instead:
+
+  folders  one row per directory: path, parent, state (PENDING / DONE /
+           SKIPPED).  New subfolders are added as PENDING when their parent
+           is listed, so discovery and indexing are the same pass.
+  files    (folder id, name, mtime, size) — the path prefix is stored once,
+           on the folder row.
+
+commit_folder() writes one folder's subfolders + files and marks it DONE in
+a single transaction, so the cost per folder is constant however big the
+index gets, and after a crash the run resumes at the first PENDING folder
+(a folder that was half-listed is simply listed again).
+
+    with IndexStore(db_path) as store:
+        store.add_root(r"J:\\Technical")
+        for fid, path in store.pending():
+            ...scandir(path)...
+            store.commit_folder(fid, subdir_paths, [(name, mtime, size), ...])
+        # or, crawled in parallel (common/crawler.py), seeded with the pending paths:
+        #     store.commit_path(listing.path, subdir_paths, files)
+        store.export_json(out_path, lambda path, name, mtime, size: {...})
+
+export_json() is the compaction step: it streams every file record to the
+final JSON (temp file + rename, never a half-written export).
+"""
+
+import json
+import os
+import sqlite3
+
+PENDING, DONE, SKIPPED = 0, 1, 2
+PENDING_BATCH = 500          # folders fetched per pending() round trip
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    id      INTEGER PRIMARY KEY,
+    path    TEXT NOT NULL UNIQUE,
+    parent  INTEGER,
+    state   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_folders_pending ON folders(id) WHERE state = 0;
+CREATE TABLE IF NOT EXISTS files (
+    folder  INTEGER NOT NULL,
+    name    TEXT NOT NULL,
+    mtime   REAL,
+    size    INTEGER,
+    PRIMARY KEY (folder, name)
+) WITHOUT ROWID;
+"""
+
+
+class IndexStore:
+    """One share's crawl state + file list, committed folder by folder."""
+
+    def __init__(self, path):
+        self.path = path
+        self.is_new = not os.path.exists(path)
+        self.con = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("PRAGMA synchronous=NORMAL")    # WAL: a crash loses at most the last folder
+        self.con.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.con is not None:
+            self.con.close()
+            self.con = None
+
+    # ─── Crawl state ─────────────────────────────────────────────────────────
+    def add_root(self, path):
+        self.con.execute("INSERT OR IGNORE INTO folders (path) VALUES (?)", (path,))
+
+    def pending(self, batch=PENDING_BATCH):
+        """Yield (folder id, path) until no PENDING folder is left — including
+        the ones added by commit_folder() while iterating."""
+        last = 0
+        while True:
+            rows = self.con.execute(
+                "SELECT id, path FROM folders WHERE state = 0 AND id > ? ORDER BY id LIMIT ?",
+                (last, batch)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][0]
+
+    def commit_folder(self, folder_id, subdirs=(), files=(), state=DONE):
+        """Record one listed folder atomically: its subfolders (queued as
+        PENDING), its files (replacing any earlier listing) and its state."""
+        con = self.con
+        con.execute("BEGIN")
+        try:
+            con.executemany("INSERT OR IGNORE INTO folders (path, parent) VALUES (?, ?)",
+                            [(p, folder_id) for p in subdirs])
+            con.execute("DELETE FROM files WHERE folder = ?", (folder_id,))
+            con.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                            [(folder_id, name, mtime, size) for name, mtime, size in files])
+            con.execute("UPDATE folders SET state = ? WHERE id = ?", (state, folder_id))
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def commit_path(self, path, subdirs=(), files=(), state=DONE):
+        """commit_folder() by path (a folder listed by the crawler, whose id
+        the caller doesn't hold)."""
+        row = self.con.execute("SELECT id FROM folders WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            self.add_root(path)
+            row = self.con.execute("SELECT id FROM folders WHERE path = ?", (path,)).fetchone()
+        self.commit_folder(row[0], subdirs, files, state)
+
+    def counts(self):
+        """{"pending", "done", "skipped", "files"} totals."""
+        by_state = dict(self.con.execute("SELECT state, COUNT(*) FROM folders GROUP BY state"))
+        n_files = self.con.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return {"pending": by_state.get(PENDING, 0), "done": by_state.get(DONE, 0),
+                "skipped": by_state.get(SKIPPED, 0), "files": n_files}
+
+    def is_complete(self):
+        return self.con.execute("SELECT 1 FROM folders WHERE state = 0 LIMIT 1").fetchone() is None
+
+    # ─── Export (compaction) ─────────────────────────────────────────────────
+    def iter_files(self):
+        """(folder path, name, mtime, size) for every file, folder by folder."""
+        yield from self.con.execute(
+            "SELECT d.path, f.name, f.mtime, f.size FROM files f "
+            "JOIN folders d ON d.id = f.folder ORDER BY d.id, f.name")
+
+    def export_json(self, out_path, record):
+        """Stream record(folder, name, mtime, size) -> dict for every file into a
+        JSON array at `out_path`; returns the number of records written."""
+        tmp = f"{out_path}.tmp"
+        n = 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("[")
+            for folder, name, mtime, size in self.iter_files():
+                f.write(",\n" if n else "\n")
+                f.write(json.dumps(record(folder, name, mtime, size)))
+                n += 1
+            f.write("\n]\n")
+        os.replace(tmp, out_path)
+        return n
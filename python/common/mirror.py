@@ -0,0 +1,349 @@
+"""
+Local mirror of dwrptg.cmpl_mnly_fact (+ cmpl_dmn) for selected fields
+======================================================================
+Field_Quicklook, UIC_visual, PPR and Abandoned_Wells all re-scan the monthly
+fact table for the same handful of fields.  This keeps a local SQLite replica
+of those fields so the monthly-rate / cumulative queries run in milliseconds:
+
+  cmpl_dmn         — every cmpl_dmn row for a mirrored field (+ well_nme),
+                     replaced wholesale on each sync (it is small)
+  cmpl_mnly_fact   — MNLY_COLS for the field, keyed (cmpl_dmn_key, eftv_dttm),
+                     clustered on the key (WITHOUT ROWID) with a month index
+  sync_state       — per-field watermark = newest eftv_dttm mirrored
+
+Each sync pulls only rows with eftv_dttm >= watermark - RESTATE_MONTHS (the
+last few months get re-allocated after close), deleting that window first so
+restated / removed rows don't linger.  The first sync pulls full history.
+A sync runs in one SQLite transaction; if ODW drops mid-way the replica is
+left as it was.
+
+Sync job (Task Scheduler / by hand):
+    python common/mirror.py                 # all MIRROR_FIELDS, incremental
+    python common/mirror.py --full --fields "Belridge,Lost Hills"
+    python common/mirror.py --status
+
+Tools:
+    if mirror.has_field(fld):
+        cols, rows = mirror.query(SQL_..._MIRROR, params, date_cols=("MONTH",))
+
+has_field() / covers_apis() only count fields synced within MAX_AGE_H hours
+(RE_TOOLS_MIRROR_MAX_AGE_H), so if the sync job stops running the tools go
+back to ODW instead of showing an ever older replica.
+
+Replica SQL is SQLite, not Oracle: dates are ISO text (compare against
+mirror.months_ago(n)), and API lists bind as one JSON string through
+`IN (SELECT value FROM json_each(:apis))`.
+
+Replica file:  <query cache dir>\\mnly_mirror.sqlite
+"""
+
+import calendar
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+if __package__ in (None, ""):   # run as a script: make `common` importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import db
+from common.query_cache import CACHE_DIR
+
+# ─── Settings ────────────────────────────────────────────────────────────────
+MIRROR_FILE = os.path.join(CACHE_DIR, "mnly_mirror.sqlite")
+
+MIRROR_FIELDS = [f.strip() for f in os.getenv(
+    "RE_TOOLS_MIRROR_FIELDS",
+    "San Ardo,Coalinga,Belridge,Elk Hills,Midway Sunset,Lost Hills,Ventura",
+).split(",") if f.strip()]
+
+DEFAULT_MAX_AGE_H = 48
+
+
+def _max_age_h():
+    try:
+        return float(os.getenv("RE_TOOLS_MIRROR_MAX_AGE_H", DEFAULT_MAX_AGE_H))
+    except ValueError:
+        return DEFAULT_MAX_AGE_H
+
+
+MAX_AGE_H = _max_age_h()    # a field synced longer ago than this is stale: use ODW
+RESTATE_MONTHS = 3        # re-pull this many months behind the watermark
+FETCH_BATCH = 5000        # rows per fetchmany / executemany
+FULL_HISTORY_START = datetime(1900, 1, 1)
+
+DMN_COLS = (
+    "cmpl_dmn_key", "cmpl_fac_id", "well_fac_id", "cmpl_nme", "well_api_nbr",
+    "opnl_fld", "engr_strg_nme", "prim_purp_type_cde", "prim_matl_desc",
+    "actv_indc", "in_svc_indc", "well_nme",
+)
+
+MNLY_COLS = (
+    "aloc_oil_prod_vol_qty", "aloc_wtr_prod_vol_qty", "aloc_gas_prod_vol_qty",
+    "aloc_gros_prod_vol_qty", "aloc_stm_inj_vol_qty", "aloc_wtr_inj_vol_qty",
+    "aloc_gas_inj_vol_qty",
+    "aloc_oil_prod_dly_rte_qty", "aloc_wtr_prod_dly_rte_qty", "aloc_gas_prod_dly_rte_qty",
+    "aloc_gros_prod_dly_rte_qty", "aloc_stm_inj_dly_rte_qty", "aloc_wtr_inj_dly_rte_qty",
+    "aloc_gas_inj_dly_rte_qty", "aloc_cnts_stm_inj_dly_rte_qty",
+    "aloc_cycl_stm_inj_dly_rte_qty", "avg_flw_line_temp_qty",
+)
+
+# ─── ODW side ────────────────────────────────────────────────────────────────
+SQL_SYNC_DMN = """
+SELECT cd.cmpl_dmn_key, cd.cmpl_fac_id, cd.well_fac_id, cd.cmpl_nme, cd.well_api_nbr,
+       cd.opnl_fld, cd.engr_strg_nme, cd.prim_purp_type_cde, cd.prim_matl_desc,
+       cd.actv_indc, cd.in_svc_indc, wd.well_nme
+FROM dwrptg.cmpl_dmn cd
+LEFT JOIN dwrptg.well_dmn wd ON wd.well_fac_id = cd.well_fac_id AND wd.actv_indc = 'Y'
+WHERE cd.opnl_fld = :field_name
+"""
+
+SQL_SYNC_MNLY = f"""
+SELECT cmf.cmpl_dmn_key, cmf.eftv_dttm, cmf.cmpl_fac_id,
+       {", ".join("cmf." + c for c in MNLY_COLS)}
+FROM dwrptg.cmpl_mnly_fact cmf
+JOIN dwrptg.cmpl_dmn cd ON cd.cmpl_dmn_key = cmf.cmpl_dmn_key
+WHERE cd.opnl_fld = :field_name
+  AND cmf.eftv_dttm >= :since
+"""
+
+# ─── Replica schema ──────────────────────────────────────────────────────────
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS cmpl_dmn (
+    {", ".join(c + (" INTEGER PRIMARY KEY" if c == "cmpl_dmn_key" else "") for c in DMN_COLS)}
+);
+CREATE INDEX IF NOT EXISTS ix_dmn_fld ON cmpl_dmn(opnl_fld, prim_purp_type_cde);
+CREATE INDEX IF NOT EXISTS ix_dmn_api ON cmpl_dmn(well_api_nbr);
+CREATE INDEX IF NOT EXISTS ix_dmn_fac ON cmpl_dmn(cmpl_fac_id);
+
+CREATE TABLE IF NOT EXISTS cmpl_mnly_fact (
+    cmpl_dmn_key INTEGER NOT NULL,
+    eftv_dttm    TEXT NOT NULL,
+    cmpl_fac_id  INTEGER,
+    opnl_fld     TEXT NOT NULL,
+    {", ".join(c + " REAL" for c in MNLY_COLS)},
+    PRIMARY KEY (cmpl_dmn_key, eftv_dttm)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_mnly_fld_dt ON cmpl_mnly_fact(opnl_fld, eftv_dttm);
+CREATE INDEX IF NOT EXISTS ix_mnly_fac ON cmpl_mnly_fact(cmpl_fac_id, eftv_dttm);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    opnl_fld   TEXT PRIMARY KEY,
+    watermark  TEXT,
+    last_sync  REAL,
+    fact_rows  INTEGER
+);
+"""
+
+_lock = threading.Lock()
+_ready = False
+
+
+def _open():
+    global _ready
+    if not _ready:
+        with _lock:
+            if not _ready:
+                os.makedirs(os.path.dirname(MIRROR_FILE), exist_ok=True)
+                con = sqlite3.connect(MIRROR_FILE, timeout=30)
+                con.execute("PRAGMA journal_mode=WAL")
+                con.executescript(_SCHEMA)
+                con.close()
+                _ready = True
+    con = sqlite3.connect(MIRROR_FILE, timeout=30, isolation_level=None)
+    con.execute("PRAGMA cache_size=-65536")
+    return con
+
+
+# ─── Value conversion ────────────────────────────────────────────────────────
+def _iso(val):
+    if isinstance(val, datetime):
+        return val.strftime("%Y-%m-%d %H:%M:%S")
+    return val
+
+
+def _dt(val):
+    if isinstance(val, str):
+        try:
+            return datetime.fromisoformat(val)
+        except ValueError:
+            return val
+    return val
+
+
+def months_ago(n, trunc_month=True, now=None):
+    """ISO cutoff string — ADD_MONTHS(TRUNC(SYSDATE[, 'MM']), -n) in replica terms."""
+    now = now or datetime.now()
+    y, m = divmod(now.year * 12 + (now.month - 1) - n, 12)
+    day = 1 if trunc_month else min(now.day, calendar.monthrange(y, m + 1)[1])
+    return f"{y:04d}-{m + 1:02d}-{day:02d} 00:00:00"
+
+
+def api_list(apis):
+    """Bind value for `IN (SELECT value FROM json_each(:apis))`."""
+    return json.dumps([str(a) for a in apis])
+
+
+# ─── Sync ────────────────────────────────────────────────────────────────────
+def sync_field(field, full=False, log=print):
+    """Bring one field's replica up to date; returns the number of fact rows pulled."""
+    t0 = time.time()
+    con = _open()
+    try:
+        row = con.execute("SELECT watermark FROM sync_state WHERE opnl_fld = ?",
+                          (field,)).fetchone()
+        wm = None if full or not row or not row[0] else datetime.fromisoformat(row[0])
+        since = FULL_HISTORY_START if wm is None else datetime.fromisoformat(
+            months_ago(RESTATE_MONTHS, now=wm))
+
+        _, dmn_rows = db.run_query(SQL_SYNC_DMN, {"field_name": field})
+
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.execute("DELETE FROM cmpl_dmn WHERE opnl_fld = ?", (field,))
+            con.executemany(
+                f"INSERT OR REPLACE INTO cmpl_dmn VALUES ({','.join('?' * len(DMN_COLS))})",
+                dmn_rows)
+            con.execute("DELETE FROM cmpl_mnly_fact WHERE opnl_fld = ? AND eftv_dttm >= ?",
+                        (field, _iso(since)))
+            ins = (f"INSERT OR REPLACE INTO cmpl_mnly_fact VALUES "
+                   f"({','.join('?' * (len(MNLY_COLS) + 4))})")
+            pulled = 0
+            with db.connection("odw") as conn:
+                cur = conn.cursor()
+                cur.arraysize = FETCH_BATCH
+                cur.execute(SQL_SYNC_MNLY, {"field_name": field, "since": since})
+                while True:
+                    batch = cur.fetchmany(FETCH_BATCH)
+                    if not batch:
+                        break
+                    con.executemany(ins, [(r[0], _iso(r[1]), r[2], field) + tuple(r[3:])
+                                          for r in batch])
+                    pulled += len(batch)
+                cur.close()
+            new_wm, total = con.execute(
+                "SELECT MAX(eftv_dttm), COUNT(*) FROM cmpl_mnly_fact WHERE opnl_fld = ?",
+                (field,)).fetchone()
+            con.execute("INSERT OR REPLACE INTO sync_state VALUES (?,?,?,?)",
+                        (field, new_wm, time.time(), total))
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+    log(f"{field}: {pulled:,} rows pulled since {since:%Y-%m-%d} "
+        f"({total:,} mirrored, through {new_wm or '-'}) in {time.time() - t0:.1f}s")
+    return pulled
+
+
+def sync(fields=None, full=False, log=print):
+    """Sync every field in `fields` (default MIRROR_FIELDS); errors are logged, not raised."""
+    failed = []
+    for fld in fields or MIRROR_FIELDS:
+        try:
+            sync_field(fld, full=full, log=log)
+        except Exception as e:
+            failed.append(fld)
+            log(f"{fld}: sync FAILED — {db.error_message(e)}")
+    return failed
+
+
+# ─── Reads ───────────────────────────────────────────────────────────────────
+def status():
+    """[(field, watermark, last_sync datetime, fact_rows), ...]"""
+    con = _open()
+    try:
+        return [(f, wm, datetime.fromtimestamp(ts) if ts else None, n) for f, wm, ts, n in
+                con.execute("SELECT * FROM sync_state ORDER BY opnl_fld").fetchall()]
+    finally:
+        con.close()
+
+
+def fields():
+    """Set of fields that have completed at least one sync."""
+    try:
+        return {s[0] for s in status() if s[1]}
+    except sqlite3.Error:
+        return set()
+
+
+def fresh_fields(now=None):
+    """Fields synced within the last MAX_AGE_H hours."""
+    cutoff = (time.time() if now is None else now) - MAX_AGE_H * 3600
+    try:
+        return {f for f, wm, ts, _ in status() if wm and ts and ts.timestamp() >= cutoff}
+    except sqlite3.Error:
+        return set()
+
+
+def is_fresh(field):
+    return field in fresh_fields()
+
+
+def has_field(field):
+    """True if `field` is mirrored and its last sync is recent enough to use."""
+    return is_fresh(field)
+
+
+def covers_apis(apis):
+    """True if every API is an active completion in a freshly synced field."""
+    apis = {str(a) for a in apis}
+    fresh = fresh_fields()
+    if not apis or not fresh:
+        return False
+    con = _open()
+    try:
+        found = {r[0] for r in con.execute(
+            "SELECT DISTINCT well_api_nbr FROM cmpl_dmn WHERE actv_indc = 'Y' "
+            "AND well_api_nbr IN (SELECT value FROM json_each(?)) "
+            "AND opnl_fld IN (SELECT value FROM json_each(?))",
+            (api_list(apis), api_list(sorted(fresh))))}
+    finally:
+        con.close()
+    return found >= apis
+
+
+def query(sql, params=None, date_cols=()):
+    """Run replica SQL; returns (cols, rows) like db.run_query().
+
+    Columns named in date_cols come back as datetime instead of ISO text.
+    """
+    con = _open()
+    try:
+        cur = con.execute(sql, params or {})
+        cols = [d[0] for d in cur.description] if cur.description else []
+        rows = cur.fetchall()
+    finally:
+        con.close()
+    idx = [i for i, c in enumerate(cols) if c in date_cols]
+    if idx:
+        rows = [tuple(_dt(v) if i in idx else v for i, v in enumerate(r)) for r in rows]
+    return cols, rows
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Sync the local cmpl_mnly_fact mirror from ODW.")
+    ap.add_argument("--fields", help="comma-separated field names (default: MIRROR_FIELDS)")
+    ap.add_argument("--full", action="store_true", help="re-pull full history")
+    ap.add_argument("--status", action="store_true", help="show mirror status and exit")
+    args = ap.parse_args(argv)
+
+    if args.status:
+        fresh = fresh_fields()
+        for fld, wm, ts, n in status():
+            print(f"{fld:<16} through {wm or '-':<20} {n or 0:>10,} rows   "
+                  f"synced {ts:%Y-%m-%d %H:%M}{'' if fld in fresh else '  (stale)'}"
+                  if ts else f"{fld:<16} (never synced)")
+        return 0
+    fl = [f.strip() for f in args.fields.split(",")] if args.fields else None
+    return 1 if sync(fl, full=args.full) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Token / trigram inverted index over file names
+==============================================
+The search pages matched keywords by lowercasing every file name and testing
+`name.includes(keyword)` on each search — a full scan of every loaded file
+per keystroke.  write_shards() (common/compact_index.py) now also writes a
+name index next to each shard, built once at index time:
+
+    <key>.json.gz        the shard: dirs + [dir index, name, mtime, size] rows
+    <key>.names.json.gz  {"version": 1, "files": n,
+                          "grams":  {"pdf": [3, 1, 4, ...], ...},
+                          "tokens": {"oec": [12, 40, ...], ...}}
+
+File ids are row numbers in the shard; posting lists are sorted and stored
+as gaps (first id, then differences), which gzip packs tightly.
+
+  * grams: every 3-character substring of the lowercased name.  A keyword of
+    3+ characters can only occur in names holding all of its trigrams, so
+    its candidates are the intersection of those posting lists; a final
+    `in` check drops the few that have the trigrams in another order.
+  * tokens: the name's runs of letters and digits.  A 1-2 character keyword
+    of letters/digits lies inside one run, so its matches are the union of
+    the postings of the tokens containing it (the token list is far shorter
+    than the file list).  Other short keywords fall back to a scan.
+
+Trigrams are taken rarest first, and once the candidates are VERIFY_RATIO
+times fewer than the next posting list they are checked directly instead of
+decoding it.  AND-of-keywords starts from the rarest keyword and narrows its
+matches by the others the same way; ANY is the union.  NameIndex is the
+Python side (the CLI); the search pages carry the same logic in JavaScript.
+
+    idx = NameIndex(build(names))
+    idx.search(["oec", "2019"], names)            # -> sorted row ids
+    python common/name_index.py index_shards oec 2019 [--any]
+"""
+
+import re
+import sys
+
+VERSION = 1
+VERIFY_RATIO = 8      # candidates this many times fewer than a posting list: check them directly
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def tokens(text):
+    return set(_TOKEN.findall(text))
+
+
+def _gaps(ids):
+    out, prev = [], 0
+    for i in ids:
+        out.append(i - prev)
+        prev = i
+    return out
+
+
+def _ungap(gaps):
+    out, v = [], 0
+    for g in gaps:
+        v += g
+        out.append(v)
+    return out
+
+
+def build(names):
+    """Name index (the JSON-able dict above) of `names`, ids = positions."""
+    grams, toks = {}, {}
+    for i, name in enumerate(names):
+        low = name.lower()
+        for g in trigrams(low):
+            grams.setdefault(g, []).append(i)
+        for t in tokens(low):
+            toks.setdefault(t, []).append(i)
+    return {"version": VERSION, "files": len(names),
+            "grams": {g: _gaps(ids) for g, ids in grams.items()},
+            "tokens": {t: _gaps(ids) for t, ids in toks.items()}}
+
+
+def intersect(a, b):
+    out, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            out.append(a[i])
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+class NameIndex:
+    """Query side of build(): keyword -> sorted ids of names containing it."""
+
+    def __init__(self, index):
+        self.n = index["files"]
+        self._grams = index["grams"]
+        self._tokens = index["tokens"]
+        self._decoded = {}
+
+    def _postings(self, table, key):
+        cache_key = (table is self._tokens, key)
+        ids = self._decoded.get(cache_key)
+        if ids is None:
+            gaps = table.get(key)
+            ids = self._decoded[cache_key] = _ungap(gaps) if gaps is not None else []
+        return ids
+
+    def estimate(self, keyword):
+        """Upper bound on the matches of `keyword`: its rarest trigram's count."""
+        if len(keyword) >= 3:
+            return min(len(self._grams.get(g, ())) for g in trigrams(keyword))
+        return self.n
+
+    def matches(self, keyword, names, within=None):
+        """Sorted ids whose lowercased name contains `keyword` (lowercase),
+        restricted to the sorted ids `within` if given."""
+        if within is not None and len(within) * VERIFY_RATIO < self.estimate(keyword):
+            return [i for i in within if keyword in names[i].lower()]
+        if len(keyword) >= 3:
+            # Rarest trigrams first; once the candidates are few, checking
+            # them beats decoding the long (common-trigram) lists
+            grams = sorted(trigrams(keyword), key=lambda g: len(self._grams.get(g, ())))
+            ids = within
+            for g in grams:
+                if ids is not None and len(ids) * VERIFY_RATIO < len(self._grams.get(g, ())):
+                    break
+                other = self._postings(self._grams, g)
+                ids = other if ids is None else intersect(ids, other)
+                if not ids:
+                    break
+            return [i for i in ids if keyword in names[i].lower()]
+        if keyword and _TOKEN.fullmatch(keyword):
+            found = set()
+            for t in self._tokens:
+                if keyword in t:
+                    found.update(self._postings(self._tokens, t))
+            return sorted(found) if within is None else intersect(within, sorted(found))
+        return [i for i in (range(self.n) if within is None else within) if keyword in names[i].lower()]
+
+    def search(self, keywords, names, match_all=True):
+        """Sorted ids matching all (or, match_all=False, any) of `keywords`."""
+        keywords = [k.lower() for k in keywords if k]
+        if not keywords:
+            return list(range(self.n))
+        if not match_all:
+            return sorted(set().union(*(self.matches(k, names) for k in keywords)))
+        # Rarest keyword first; the others only narrow its matches down
+        ids = None
+        for k in sorted(set(keywords), key=self.estimate):
+            ids = self.matches(k, names, ids)
+            if not ids:
+                break
+        return ids
+
+
+def main(argv=None):
+    import argparse
+    import os
+    import time
+    if __package__ in (None, ""):
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from common import compact_index
+
+    ap = argparse.ArgumentParser(description="Search a sharded index's file names through its name index.")
+    ap.add_argument("shards", help="<index>_shards folder (with manifest.json)")
+    ap.add_argument("keywords", nargs="+")
+    ap.add_argument("--any", action="store_true", help="match any keyword instead of all")
+    args = ap.parse_args(argv)
+    manifest = compact_index.load_manifest(args.shards)
+    found = scanned = 0
+    took = 0.0
+    for shard in manifest["shards"]:
+        if not shard.get("names"):
+            continue
+        dirs, files = compact_index.read_shard(os.path.join(args.shards, shard["file"]))
+        idx = NameIndex(compact_index.read_json_gz(os.path.join(args.shards, shard["names"])))
+        names = [f[1] for f in files]
+        t = time.perf_counter()
+        ids = idx.search(args.keywords, names, match_all=not args.any)
+        took += time.perf_counter() - t
+        scanned += len(names)
+        for i in ids:
+            print(f"{dirs[files[i][0]]}{compact_index.SEP}{files[i][1]}")
+        found += len(ids)
+    print(f"{found:,} of {scanned:,} files in {took * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
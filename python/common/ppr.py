@@ -0,0 +1,430 @@
+"""
+Periodic Project Review — queries, metrics and headless batch runs
+==================================================================
+UIC/PPR.py runs the review one API list at a time behind its tabs.  The
+tab queries and the Summary-tab calculations live here so the same review
+can be built without a window, for many projects at once:
+
+    python common/ppr.py --projects 0231004,0231012 --out "C:\\PPR\\2026Q3"
+    python common/ppr.py --project-file q3_projects.txt --since 2024-07-01
+    python common/ppr.py --api-files "North Unit.txt" "South Unit.txt" --workers 6
+
+  --projects / --project-file   UIC project codes; their wells come from
+                                UIC_PROJ_WELL_DMN in one query for all codes
+  --api-files                   one API per line (commas / spaces also fine);
+                                the file name is the project name
+  --since                       "Last Project Update Date" (default 2 yrs ago)
+
+Projects run on a thread pool (--workers, default WORKERS) that shares the
+ODW session pool in common/db.py and the local query cache.  Each project
+gets its own workbook, PPR_<project>_<yyyymmdd>.xlsx, streamed through
+common/export.py: one sheet per tab, written as soon as that tab's query
+returns, plus a Calculations sheet.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+if __name__ == "__main__":       # run as a script: make `common` importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import db
+from common import query_cache
+from common import export
+
+WORKERS = 4                      # projects in flight (each holds one pooled session at a time)
+SINCE_DAYS = 730                 # default "Last Project Update Date" = today - 2 yrs
+
+
+# Every API filter below binds the whole list as one collection:
+#     ... IN (SELECT column_value FROM TABLE(:apis))   with  {"apis": formatted}
+# so the SQL text is identical for any list (one parse) and has no 1000 limit.
+API_IN_LIST = "(SELECT column_value FROM TABLE(:apis))"
+
+
+# ─── Tab queries ─────────────────────────────────────────────────────────────
+SQL_BASIC_DATA = f"""
+SELECT
+    wd.wlbr_nme                    AS well_name,
+    cd.opnl_fld                    AS field_name,
+    cd.cmpl_nme                    AS completion_name,
+    cd.well_api_nbr                AS api_number,
+    wd.wlbr_api_suff_nbr           AS wellbore_suffix,
+    wd.wlbr_incl_type_desc         AS wellbore_type,
+    cd.prim_purp_type_cde          AS well_type,
+    cd.cmpl_state_type_cde         AS status,
+    cd.in_svc_indc                 AS in_service,
+    cd.init_prod_dte               AS initial_prod_date
+FROM dwrptg.cmpl_dmn cd
+JOIN dwrptg.wlbr_dmn wd ON cd.well_fac_id = wd.well_fac_id
+WHERE cd.actv_indc = 'Y' AND cd.well_api_nbr IN {API_IN_LIST}
+ORDER BY cd.well_api_nbr, wd.wlbr_api_suff_nbr, cd.cmpl_nme
+"""
+
+SQL_TOP_PERF = f"""
+WITH T AS (
+    SELECT cd.cmpl_nme, cd.cmpl_fac_id, cd.well_fac_id,
+           wd.well_api_nbr, cd.engr_strg_nme
+    FROM dwrptg.cmpl_dmn cd
+    JOIN dwrptg.well_dmn wd ON cd.well_fac_id = wd.well_fac_id
+    WHERE cd.actv_indc = 'Y'
+      AND wd.actv_indc = 'Y'
+      AND wd.well_api_nbr IN {API_IN_LIST}
+      AND cd.cmpl_state_type_cde IN ('OPNL', 'TA', 'ABND')
+),
+perfs AS (
+    SELECT t.well_api_nbr, t.cmpl_nme, t.cmpl_fac_id,
+           t.well_fac_id, t.engr_strg_nme,
+           MIN(opg.top_md_qty) AS top_perf,
+           MAX(opg.btm_md_qty) AS btm_perf
+    FROM T
+    JOIN dwrptg.wlbr_dmn wd ON t.well_fac_id = wd.well_fac_id
+    JOIN dwrptg.actl_wlbr_opg_ntvl_dmn opg ON wd.wlbr_fac_id = opg.wlbr_fac_id
+    GROUP BY t.well_api_nbr, t.cmpl_nme, t.cmpl_fac_id,
+             t.well_fac_id, t.engr_strg_nme
+),
+surveys AS (
+    SELECT wd.well_fac_id,
+           d.md_qty AS svy_md,
+           d.tvd_qty AS svy_tvd
+    FROM dwrptg.dsvy_pt_dmn d
+    JOIN dwrptg.wlbr_dmn wd ON d.wlbr_fac_id = wd.wlbr_fac_id
+    WHERE wd.well_fac_id IN (SELECT well_fac_id FROM T)
+      AND d.tvd_qty IS NOT NULL
+      AND d.md_qty IS NOT NULL
+      AND d.tvd_qty <= d.md_qty
+),
+top_above AS (
+    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
+           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md DESC) AS rn
+    FROM perfs p
+    JOIN surveys s ON s.well_fac_id = p.well_fac_id
+    WHERE s.svy_md <= p.top_perf
+),
+top_below AS (
+    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
+           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md ASC) AS rn
+    FROM perfs p
+    JOIN surveys s ON s.well_fac_id = p.well_fac_id
+    WHERE s.svy_md > p.top_perf
+),
+btm_above AS (
+    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
+           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md DESC) AS rn
+    FROM perfs p
+    JOIN surveys s ON s.well_fac_id = p.well_fac_id
+    WHERE s.svy_md <= p.btm_perf
+),
+btm_below AS (
+    SELECT p.cmpl_fac_id, s.svy_md, s.svy_tvd,
+           ROW_NUMBER() OVER (PARTITION BY p.cmpl_fac_id ORDER BY s.svy_md ASC) AS rn
+    FROM perfs p
+    JOIN surveys s ON s.well_fac_id = p.well_fac_id
+    WHERE s.svy_md > p.btm_perf
+)
+SELECT p.well_api_nbr,
+       p.cmpl_nme,
+       p.engr_strg_nme,
+       p.top_perf,
+       LEAST(
+           p.top_perf,
+           ROUND(
+               CASE
+                   WHEN ta.svy_md IS NOT NULL AND tb.svy_md IS NOT NULL
+                        AND tb.svy_md != ta.svy_md
+                   THEN ta.svy_tvd +
+                        (p.top_perf - ta.svy_md) *
+                        (tb.svy_tvd - ta.svy_tvd) /
+                        (tb.svy_md - ta.svy_md)
+                   WHEN ta.svy_md IS NOT NULL
+                   THEN ta.svy_tvd
+                   ELSE p.top_perf
+               END, 1)
+       ) AS top_perf_tvd,
+       p.btm_perf,
+       LEAST(
+           p.btm_perf,
+           ROUND(
+               CASE
+                   WHEN ba.svy_md IS NOT NULL AND bb.svy_md IS NOT NULL
+                        AND bb.svy_md != ba.svy_md
+                   THEN ba.svy_tvd +
+                        (p.btm_perf - ba.svy_md) *
+                        (bb.svy_tvd - ba.svy_tvd) /
+                        (bb.svy_md - ba.svy_md)
+                   WHEN ba.svy_md IS NOT NULL
+                   THEN ba.svy_tvd
+                   ELSE p.btm_perf
+               END, 1)
+       ) AS btm_perf_tvd
+FROM perfs p
+LEFT JOIN top_above ta ON p.cmpl_fac_id = ta.cmpl_fac_id AND ta.rn = 1
+LEFT JOIN top_below tb ON p.cmpl_fac_id = tb.cmpl_fac_id AND tb.rn = 1
+LEFT JOIN btm_above ba ON p.cmpl_fac_id = ba.cmpl_fac_id AND ba.rn = 1
+LEFT JOIN btm_below bb ON p.cmpl_fac_id = bb.cmpl_fac_id AND bb.rn = 1
+ORDER BY p.cmpl_nme
+"""
+
+SQL_PERF_SUMMARY = f"""
+WITH T1 AS (
+    SELECT cmpl_fac_id, eftv_dttm AS last_inj_dte FROM
+    (
+        SELECT cmpl_fac_id, eftv_dttm, aloc_stm_inj_dly_rte_qty, aloc_wtr_inj_dly_rte_qty,
+               DENSE_RANK() OVER (PARTITION BY cmpl_fac_id ORDER BY eftv_dttm DESC) AS rnk
+        FROM cmpl_mnly_fact
+        WHERE aloc_wtr_inj_dly_rte_qty > 0 OR aloc_stm_inj_dly_rte_qty > 0
+    ) WHERE rnk = 1
+),
+T2 AS (
+    SELECT cmpl_fac_id, eftv_dttm AS last_prod_dte FROM
+    (
+        SELECT cmpl_fac_id, eftv_dttm, aloc_gros_prod_dly_rte_qty,
+               DENSE_RANK() OVER (PARTITION BY cmpl_fac_id ORDER BY eftv_dttm DESC) AS rnk
+        FROM cmpl_mnly_fact
+        WHERE aloc_gros_prod_dly_rte_qty > 0
+    ) WHERE rnk = 1
+)
+SELECT wd.well_nme, wd.well_api_nbr, wd.fld_nme,
+       cd.init_prod_dte, cd.init_inj_dte, cd.prim_purp_type_cde,
+       cd.ENGR_STRG_NME,
+       t1.last_inj_dte, t2.last_prod_dte,
+       cd.CMPL_STATE_TYPE_DESC, cd.CMPL_STATE_EFTV_DTTM
+FROM well_dmn wd
+JOIN cmpl_dmn cd ON wd.well_fac_id = cd.well_fac_id
+LEFT JOIN cmpl_non_ver_dmn cnd ON cd.cmpl_fac_id = cnd.cmpl_fac_id
+LEFT JOIN curr_cmpl_opnl_stat os ON cd.cmpl_fac_id = os.cmpl_fac_id
+LEFT JOIN T1 ON cd.cmpl_fac_id = T1.cmpl_fac_id
+LEFT JOIN T2 ON cd.cmpl_fac_id = T2.cmpl_fac_id
+WHERE
+    cd.actv_indc = 'Y'
+    AND wd.actv_indc = 'Y'
+    AND wd.well_api_nbr IN {API_IN_LIST}
+    AND cd.prim_purp_type_cde IN ('PROD', 'INJ')
+"""
+
+SQL_TUBING_AVG = f"""
+SELECT wd.well_nme, wd.well_api_nbr, cd.cmpl_nme, cd.cmpl_fac_id,
+    AVG(CASE WHEN cf.aloc_stm_inj_vol_qty > 0 THEN cf.aloc_stm_inj_vol_qty END) AS avg_stm_inj_vol,
+    ROUND(AVG(CASE WHEN cf.aloc_wtr_inj_vol_qty > 0 THEN cf.aloc_wtr_inj_vol_qty END), 2) AS avg_wtr_inj_vol,
+    ROUND(AVG(CASE WHEN cf.wlhd_tbg_prsr_qty > 0 THEN cf.wlhd_tbg_prsr_qty END), 2) AS avg_wlhd_tbg_prsr
+FROM well_dmn wd
+JOIN cmpl_dmn cd ON wd.well_fac_id = cd.well_fac_id
+JOIN cmpl_dly_fact cf ON cd.cmpl_fac_id = cf.cmpl_fac_id
+WHERE wd.actv_indc = 'Y' AND cd.actv_indc = 'Y'
+    AND cf.eftv_dttm >= TRUNC(SYSDATE) - 60
+    AND wd.well_api_nbr IN {API_IN_LIST}
+GROUP BY wd.well_nme, wd.well_api_nbr, cd.cmpl_nme, cd.cmpl_fac_id
+"""
+
+SQL_PROJECT_APIS = """
+SELECT DISTINCT wpd.UIC_PROJ_CDE, cd.well_api_nbr
+FROM dwrptg.UIC_PROJ_WELL_DMN wpd
+JOIN dwrptg.cmpl_dmn cd ON wpd.WELL_FAC_ID = cd.well_fac_id AND cd.actv_indc = 'Y'
+WHERE wpd.UIC_PROJ_CDE IN (SELECT column_value FROM TABLE(:codes))
+  AND cd.well_api_nbr IS NOT NULL
+ORDER BY 1, 2
+"""
+
+# (sheet / tab name, SQL, date columns) in PPR.py tab order
+TABS = [
+    ("Basic Data",       SQL_BASIC_DATA,   ("INITIAL_PROD_DATE",)),
+    ("Top Perf",         SQL_TOP_PERF,     ()),
+    ("Summary",          SQL_PERF_SUMMARY, ("LAST_INJ_DTE", "LAST_PROD_DTE", "INIT_INJ_DTE",
+                                            "INIT_PROD_DTE", "CMPL_STATE_EFTV_DTTM")),
+    ("Avg Tubing Pres",  SQL_TUBING_AVG,   ()),
+]
+
+
+# ─── Calculations (Summary tab) ──────────────────────────────────────────────
+CALC_ITEMS = [
+    ("Total INJ wells (Active/TA):", "total_inj"),
+    ("Total PROD wells:", "total_prod"),
+    ("Active Injectors (Last 2 yrs):", "active_injectors"),
+    ("Idle Injectors (Last 2 yrs):", "idle_injectors"),
+    ("Injectors Drilled Since Last Update:", "injectors_drilled"),
+    ("Active Producers (Last 2 yrs):", "active_producers"),
+    ("Idle Producers (Last 2 yrs):", "idle_producers"),
+    ("Producers Drilled Since Last Update:", "producers_drilled"),
+    ("Producers Abandoned Since Last Update:", "producers_abandoned"),
+]
+
+
+def summary_metrics(df, project_update_date, today=None):
+    """Well counts shown under "Calculations", keyed as CALC_ITEMS."""
+    import pandas as pd          # not at module level: PPR.py's window comes up without it
+    today = today or date.today()
+    project_update_date_ts = pd.Timestamp(project_update_date)
+    two_years_ago_ts = pd.Timestamp(today - timedelta(days=730))
+
+    inj_df = df[df['PRIM_PURP_TYPE_CDE'] == 'INJ']
+    prod_df = df[df['PRIM_PURP_TYPE_CDE'] == 'PROD']
+    inj_open = inj_df['CMPL_STATE_TYPE_DESC'] != 'Permanently Abandoned'
+    prod_open = prod_df['CMPL_STATE_TYPE_DESC'] != 'Permanently Abandoned'
+
+    return {
+        "total_inj": int(inj_open.sum()),
+        "total_prod": len(prod_df),
+        "active_injectors": int((inj_df['LAST_INJ_DTE'] >= two_years_ago_ts).sum()),
+        "idle_injectors": int(((inj_df['LAST_INJ_DTE'] < two_years_ago_ts) & inj_open).sum()),
+        "injectors_drilled": int(((inj_df['INIT_INJ_DTE'] > project_update_date_ts) & inj_open).sum()),
+        "active_producers": int((prod_df['LAST_PROD_DTE'] >= two_years_ago_ts).sum()),
+        "idle_producers": int(((prod_df['LAST_PROD_DTE'] < two_years_ago_ts) & prod_open).sum()),
+        "producers_drilled": int((prod_df['INIT_PROD_DTE'] > project_update_date_ts).sum()),
+        "producers_abandoned": int(((~prod_open) &
+                                    (prod_df['CMPL_STATE_EFTV_DTTM'] > project_update_date_ts)).sum()),
+    }
+
+
+def avg_tubing_pressure(df):
+    """Mean AVG_WLHD_TBG_PRSR over wells, None if no valid values; KeyError if no column."""
+    col = next((c for c in df.columns if c.upper() == 'AVG_WLHD_TBG_PRSR'), None)
+    if col is None:
+        raise KeyError('AVG_WLHD_TBG_PRSR')
+    import pandas as pd
+    vals = pd.to_numeric(df[col], errors='coerce').dropna()
+    return float(vals.mean()) if not vals.empty else None
+
+
+def to_frame(cols, rows, date_cols=()):
+    import pandas as pd
+    df = pd.DataFrame(rows, columns=cols)
+    for col in date_cols:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+
+def review_rows(cols, rows):
+    """Rows in the tabs' display order (purpose, then API), APIs as text."""
+    if 'WELL_API_NBR' in cols:
+        i = cols.index('WELL_API_NBR')
+        rows = [r[:i] + (None if r[i] is None else str(r[i]),) + r[i + 1:] for r in rows]
+    by = [cols.index(c) for c in ('PRIM_PURP_TYPE_CDE', 'WELL_API_NBR') if c in cols]
+    if by:
+        rows = sorted(rows, key=lambda r: [(r[i] is None, r[i] or "") for i in by])
+    return rows
+
+
+# ─── Batch ───────────────────────────────────────────────────────────────────
+def project_apis(codes, refresh=False):
+    """{project code: [APIs]} for UIC project codes, in one query."""
+    out = {c: [] for c in codes}
+    _, rows = query_cache.run_query(SQL_PROJECT_APIS, {"codes": db.key_list(codes)}, refresh=refresh)
+    for code, api in rows:
+        out.setdefault(code, []).append(str(api))
+    return out
+
+
+def read_list(path):
+    """APIs / project codes from a text or CSV file — one per line, or comma / space separated."""
+    with open(path, encoding="utf-8-sig") as f:
+        return list(dict.fromkeys(t for t in re.split(r"[\s,;]+", f.read()) if t))
+
+
+def _safe_name(name):
+    return re.sub(r'[\\/:*?"<>|]+', "_", name).strip() or "project"
+
+
+def build_review(name, apis, out_dir, since, refresh=False, today=None):
+    """Run every tab for one project and write its workbook.  Returns (path, stats)."""
+    today = today or date.today()
+    path = os.path.join(out_dir, f"PPR_{_safe_name(name)}_{today:%Y%m%d}.xlsx")
+    binds = {"apis": db.key_list(apis)}
+    stats = {"apis": len(binds["apis"])}
+    calc = [("Project", name), ("Well APIs", stats["apis"]),
+            ("Last Project Update Date", since.strftime("%Y-%m-%d")), ("Run date", f"{today:%Y-%m-%d}")]
+
+    def sheets():
+        # Each tab's query runs when the workbook reaches its sheet, so only
+        # one tab's rows are held at a time.
+        for sheet, sql, date_cols in TABS:
+            cols, rows = query_cache.run_query(sql, binds, refresh=refresh)
+            stats[sheet] = len(rows)
+            if sheet == "Summary" and rows:
+                m = summary_metrics(to_frame(cols, rows, date_cols), since, today)
+                calc.extend((label, m[key]) for label, key in CALC_ITEMS)
+            elif sheet == "Avg Tubing Pres" and rows:
+                avg = avg_tubing_pressure(to_frame(cols, rows))
+                calc.append(("Overall Avg Tubing Pressure:", round(avg, 1) if avg is not None else None))
+            yield sheet, cols, review_rows(cols, rows)
+        yield "Calculations", ["Item", "Value"], calc
+
+    export.write_workbook(path, sheets())
+    return path, stats
+
+
+def run_batch(projects, out_dir, since, workers=WORKERS, refresh=False, log=print):
+    """Build a workbook per (name, apis) in `projects`.  Returns the names that failed."""
+    os.makedirs(out_dir, exist_ok=True)
+    lock = threading.Lock()
+
+    def one(name, apis):
+        t0 = time.perf_counter()
+        path, stats = build_review(name, apis, out_dir, since, refresh)
+        with lock:
+            log(f"{name}: {stats['apis']} APIs, "
+                + ", ".join(f"{s} {stats[s]:,}" for s, _, _ in TABS)
+                + f"  ({time.perf_counter() - t0:.1f}s)  -> {path}")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futs = {}
+        for name, apis in projects:
+            if not apis:
+                failed.append(name)
+                log(f"{name}: no wells found — skipped")
+                continue
+            futs[pool.submit(one, name, apis)] = name
+        for fut in as_completed(futs):
+            try:
+                fut.result()
+            except Exception as e:
+                failed.append(futs[fut])
+                with lock:
+                    log(f"{futs[fut]}: FAILED — {db.error_message(e)}")
+    return failed
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Build Periodic Project Review workbooks without the GUI.")
+    ap.add_argument("--projects", help="comma-separated UIC project codes")
+    ap.add_argument("--project-file", help="file of UIC project codes, one per line")
+    ap.add_argument("--api-files", nargs="+", default=[], help="API list files (one project each)")
+    ap.add_argument("--since", help="last project update date, YYYY-MM-DD (default: 2 years ago)")
+    ap.add_argument("--out", default=".", help="output folder for the workbooks")
+    ap.add_argument("--workers", type=int, default=WORKERS, help=f"projects run at once (default {WORKERS})")
+    ap.add_argument("--refresh", action="store_true", help="skip cached query results")
+    args = ap.parse_args(argv)
+
+    since = (datetime.strptime(args.since, "%Y-%m-%d").date() if args.since
+             else date.today() - timedelta(days=SINCE_DAYS))
+
+    codes = [c.strip() for c in (args.projects or "").split(",") if c.strip()]
+    if args.project_file:
+        codes += read_list(args.project_file)
+    codes = list(dict.fromkeys(codes))
+
+    projects = []
+    if codes:
+        projects += list(project_apis(codes, args.refresh).items())
+    for path in args.api_files:
+        projects.append((os.path.splitext(os.path.basename(path))[0], read_list(path)))
+    if not projects:
+        ap.error("give --projects, --project-file and/or --api-files")
+
+    t0 = time.perf_counter()
+    failed = run_batch(projects, args.out, since, args.workers, args.refresh)
+    print(f"{len(projects) - len(failed)}/{len(projects)} project(s) done in "
+          f"{time.perf_counter() - t0:.1f}s" + (f"; failed: {', '.join(failed)}" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
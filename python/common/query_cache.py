@@ -0,0 +1,212 @@
+"""
+On-disk query-result cache for ODW reads
+=========================================
+Most views (same field, same project, same well list) are pulled many times
+a day, and every pull used to go to the warehouse cold.  run_query() here
+sits in front of db.run_query() and keeps result sets in a local SQLite file:
+
+  * key   = database name + SQL with whitespace collapsed + bind values
+  * value = zlib-compressed pickle of (cols, rows)
+  * TTL   = picked from the tables the SQL touches (see TTL_RULES):
+              monthly facts  -> until the 1st of next month
+              status / daily -> 1 hour
+              everything else-> DEFAULT_TTL_S
+  * LRU eviction by total payload size once MAX_BYTES is exceeded
+
+Pass refresh=True (the "Force refresh" box in each tool) to skip the lookup
+and overwrite the cached copy.  Any cache error (locked file, bad pickle,
+read-only profile) just falls through to the database.
+
+Cache file:  %LOCALAPPDATA%\\RE-tools\\query_cache.sqlite
+             (override with RE_TOOLS_CACHE_DIR)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from common import db
+
+# ─── Settings ────────────────────────────────────────────────────────────────
+CACHE_DIR = os.getenv("RE_TOOLS_CACHE_DIR") or os.path.join(
+    os.getenv("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "RE-tools")
+CACHE_FILE = os.path.join(CACHE_DIR, "query_cache.sqlite")
+
+MAX_BYTES = 512 * 1024 * 1024      # total compressed payload before LRU eviction
+DEFAULT_TTL_S = 4 * 3600
+HOURLY = 3600
+MONTHLY = "monthly"                 # expires at the start of next calendar month
+
+# Every rule whose pattern appears in the SQL applies; the shortest TTL wins
+TTL_RULES = [
+    (re.compile(r"opnl_stat|stat_fact|off_rsn|state_type|_dly_fact|well_test|wra|notes", re.I), HOURLY),
+    (re.compile(r"_mnly_fact", re.I), MONTHLY),
+]
+
+_lock = threading.Lock()
+_ready = False
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key         TEXT PRIMARY KEY,
+    db_name     TEXT NOT NULL,
+    sql_text    TEXT NOT NULL,
+    created     REAL NOT NULL,
+    expires     REAL NOT NULL,
+    last_access REAL NOT NULL,
+    nbytes      INTEGER NOT NULL,
+    payload     BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_results_access ON results(last_access);
+"""
+
+
+# ─── Keys / TTL ──────────────────────────────────────────────────────────────
+def normalize_sql(sql):
+    return " ".join(sql.split())
+
+
+def make_key(sql, params=None, name="odw"):
+    binds = json.dumps(params or {}, sort_keys=True, default=str)
+    raw = f"{name}\x1f{normalize_sql(sql)}\x1f{binds}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _next_month_start(now):
+    dt = datetime.fromtimestamp(now)
+    if dt.month == 12:
+        nxt = dt.replace(year=dt.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        nxt = dt.replace(month=dt.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    return nxt.timestamp()
+
+
+def expiry_for(sql, now=None, ttl=None):
+    """Absolute expiry time (epoch s) for a result of `sql` fetched at `now`."""
+    now = time.time() if now is None else now
+    rules = [ttl] if ttl is not None else [t for rx, t in TTL_RULES if rx.search(sql)]
+    if not rules:
+        return now + DEFAULT_TTL_S
+    return min(_next_month_start(now) if t == MONTHLY else now + t for t in rules)
+
+
+# ─── SQLite store ────────────────────────────────────────────────────────────
+def _open():
+    global _ready
+    if not _ready:
+        with _lock:
+            if not _ready:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                con = sqlite3.connect(CACHE_FILE, timeout=10)
+                con.execute("PRAGMA journal_mode=WAL")
+                con.executescript(_SCHEMA)
+                con.close()
+                _ready = True
+    return sqlite3.connect(CACHE_FILE, timeout=10)
+
+
+def get(key, now=None):
+    """Cached value for `key` — (cols, rows) for query results — or None if
+    missing / expired."""
+    now = time.time() if now is None else now
+    con = _open()
+    try:
+        row = con.execute("SELECT expires, payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[0] <= now:
+            con.execute("DELETE FROM results WHERE key = ?", (key,))
+            con.commit()
+            return None
+        con.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+        con.commit()
+        return pickle.loads(zlib.decompress(row[1]))
+    finally:
+        con.close()
+
+
+def put(key, sql, cols, rows, name="odw", ttl=None, now=None):
+    put_value(key, sql, (cols, rows), name, ttl, now)
+
+
+def put_value(key, sql, value, name="odw", ttl=None, now=None):
+    """Store any picklable `value` (e.g. a derived snapshot) under `key`.
+
+    `sql` is the query (or a label) the value came from; it drives the TTL
+    lookup unless ttl is given.
+    """
+    now = time.time() if now is None else now
+    blob = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), 6)
+    con = _open()
+    try:
+        con.execute("INSERT OR REPLACE INTO results VALUES (?,?,?,?,?,?,?,?)",
+                    (key, name, normalize_sql(sql)[:2000], now,
+                     expiry_for(sql, now, ttl), now, len(blob), blob))
+        _evict(con, now)
+        con.commit()
+    finally:
+        con.close()
+
+
+def _evict(con, now):
+    con.execute("DELETE FROM results WHERE expires <= ?", (now,))
+    total = con.execute("SELECT COALESCE(SUM(nbytes), 0) FROM results").fetchone()[0]
+    if total <= MAX_BYTES:
+        return
+    for key, nbytes in con.execute(
+            "SELECT key, nbytes FROM results ORDER BY last_access").fetchall():
+        con.execute("DELETE FROM results WHERE key = ?", (key,))
+        total -= nbytes
+        if total <= MAX_BYTES:
+            break
+
+
+def clear():
+    """Drop every cached result."""
+    con = _open()
+    try:
+        con.execute("DELETE FROM results")
+        con.commit()
+    finally:
+        con.close()
+
+
+def stats():
+    """(entry count, total compressed bytes)."""
+    con = _open()
+    try:
+        return tuple(con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM results").fetchone())
+    finally:
+        con.close()
+
+
+# ─── Front door ──────────────────────────────────────────────────────────────
+def run_query(sql, params=None, name="odw", refresh=False, ttl=None):
+    """Cached drop-in for db.run_query(); returns (cols, rows).
+
+    refresh=True always hits the database and replaces the cached copy.
+    ttl (seconds or MONTHLY) overrides the TTL_RULES lookup.
+    """
+    key = make_key(sql, params, name)
+    if not refresh:
+        try:
+            hit = get(key)
+        except Exception:
+            hit = None
+        if hit is not None:
+            return hit
+    cols, rows = db.run_query(sql, params, name)
+    try:
+        put(key, sql, cols, rows, name, ttl)
+    except Exception:
+        pass
+    return cols, rows
@@ -0,0 +1,233 @@
+"""
+Lazy imports and startup timing for the tools
+=============================================
+Most of a tool's time-to-window used to go on imports it didn't need yet:
+matplotlib (backend included), pandas and numpy load at module top level
+even when no chart tab is ever opened.  lazy() hands back a stand-in that
+imports the real thing on first attribute access or call, so the window
+comes up first and the cost moves to the first chart / first query:
+
+    import os, sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from common import startup                  # first: starts the clock
+
+    HAS_MPL = startup.available("matplotlib")   # find_spec only, no import
+    Figure = startup.lazy("matplotlib.figure", "Figure")
+    mdates = startup.lazy("matplotlib.dates")
+    pd = startup.lazy("pandas")
+    ...
+    startup.mark("imports")                     # after the top-level imports
+    root = tk.Tk(); app = App(root)
+    startup.first_paint(root, then=app.start_background_work)
+
+Any matplotlib module loaded through lazy() selects the TkAgg backend first,
+as the tools' `matplotlib.use("TkAgg")` did.  A stand-in can't be a base
+class or an isinstance() target — import those for real.
+
+The profiler side records, per start: time to the end of the top-level
+imports, to the first paint of the window, and every lazy import (when it
+happened and how long it took).  first_paint() appends one row to
+startup_profile.csv in the query-cache folder; `python common/startup.py` prints the median per tool, cold
+starts and Launcher warm-pool starts (common/warm.py) kept apart.
+RE_TOOLS_PROFILE=0 turns the log off.  The clock starts when a tool first
+imports this module, so interpreter start-up itself isn't included.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+T0 = time.perf_counter()
+
+if __package__ in (None, ""):   # run as a script: make `common` importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROFILE = os.getenv("RE_TOOLS_PROFILE", "1") != "0"
+LOG_NAME = "startup_profile.csv"
+LOG_COLUMNS = ["started", "tool", "mode", "imports_ms", "first_paint_ms", "lazy_imports"]
+
+_lock = threading.RLock()
+_marks = {}            # label -> ms since T0
+_lazy_log = []         # (module, ms since T0 when asked for, ms it took)
+_backend_set = False
+
+
+def _ms():
+    return round((time.perf_counter() - T0) * 1000, 1)
+
+
+# ─── Lazy imports ────────────────────────────────────────────────────────────
+def available(name):
+    """True if `name` could be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _import(name):
+    global _backend_set
+    mod = sys.modules.get(name)
+    if mod is not None and (_backend_set or not name.startswith("matplotlib")):
+        return mod
+    with _lock:
+        at = _ms()
+        if name.split(".")[0] == "matplotlib" and not _backend_set:
+            import matplotlib
+            matplotlib.use("TkAgg")
+            _backend_set = True
+        loaded = name in sys.modules
+        mod = importlib.import_module(name)
+        if not loaded:
+            _lazy_log.append((name, at, round(_ms() - at, 1)))
+        return mod
+
+
+class _Lazy:
+    """Stand-in for a module, or one attribute of it, imported on first use."""
+
+    __slots__ = ("_name", "_attr", "_obj")
+
+    def __init__(self, name, attr=None):
+        self._name, self._attr, self._obj = name, attr, None
+
+    def _load(self):
+        obj = self._obj
+        if obj is None:
+            obj = _import(self._name)
+            if self._attr is not None:
+                obj = getattr(obj, self._attr)
+            self._obj = obj
+        return obj
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        what = f"{self._name}.{self._attr}" if self._attr else self._name
+        return f"<lazy {what}{'' if self._obj is None else ' (loaded)'}>"
+
+
+def lazy(name, attr=None):
+    """Module `name` (or its `attr`), imported the first time it's used."""
+    return _Lazy(name, attr)
+
+
+def preload(*stand_ins, background=False):
+    """Import lazy() stand-ins now, off the Tk thread: from a worker that is
+    about to hand results to a chart, or with background=True once the
+    window is up (first_paint's `then`), so the first click doesn't wait."""
+    def load():
+        for s in stand_ins:
+            try:
+                s._load()
+            except Exception:
+                pass                   # the real use reports it
+    if background:
+        threading.Thread(target=load, daemon=True).start()
+    else:
+        load()
+
+
+# ─── Timing ──────────────────────────────────────────────────────────────────
+def mark(label):
+    """Record `label` at the current time (ms since the tool started)."""
+    _marks.setdefault(label, _ms())
+
+
+def first_paint(root, then=None):
+    """Record the first paint of `root`, write the profile row, then call `then()`.
+
+    `then` is where deferred start-up work goes (prefetch threads, warmers),
+    so it doesn't hold up the window either."""
+    def painted():
+        root.update_idletasks()
+        mark("first_paint")
+        write_profile()
+        if then is not None:
+            then()
+
+    def on_map(event):
+        if event.widget is root and "first_paint" not in _marks:
+            root.after_idle(painted)
+
+    root.bind("<Map>", on_map, add="+")
+
+
+def profile_row():
+    tool = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+    return {
+        "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "tool": tool,
+        "mode": "warm" if os.getenv("RE_TOOLS_WARM_STARTED") else "cold",
+        "imports_ms": _marks.get("imports", ""),
+        "first_paint_ms": _marks.get("first_paint", ""),
+        "lazy_imports": "; ".join(f"{n} {took:g}ms@{at:g}" for n, at, took in _lazy_log),
+    }
+
+
+def _log_path():
+    from common.query_cache import CACHE_DIR
+    return os.path.join(CACHE_DIR, LOG_NAME)
+
+
+def write_profile():
+    """Append this start's row to the startup log (never raises)."""
+    if not PROFILE:
+        return
+    import csv
+    try:
+        path = _log_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        new = not os.path.exists(path)
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=LOG_COLUMNS)
+            if new:
+                w.writeheader()
+            w.writerow(profile_row())
+    except Exception:
+        pass
+
+
+# ─── Report ──────────────────────────────────────────────────────────────────
+def report(path=None, last=20):
+    """Median imports / first-paint ms per (tool, mode) over the last `last` starts."""
+    import csv
+    from statistics import median
+    runs = {}
+    with open(path or _log_path(), newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            runs.setdefault((row["tool"], row["mode"]), []).append(row)
+    lines = [f"{'tool':<22}{'mode':<6}{'starts':>7}{'imports ms':>12}{'first paint ms':>16}"]
+    for (tool, mode), rows in sorted(runs.items()):
+        rows = rows[-last:]
+
+        def med(col):
+            vals = [float(r[col]) for r in rows if r[col]]
+            return f"{median(vals):,.0f}" if vals else "-"
+        lines.append(f"{tool:<22}{mode:<6}{len(rows):>7}{med('imports_ms'):>12}{med('first_paint_ms'):>16}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Summarise the tools' startup profile log.")
+    ap.add_argument("--log", help="startup_profile.csv to read (default: the cache folder's)")
+    ap.add_argument("--last", type=int, default=20, help="starts per tool to include (default 20)")
+    args = ap.parse_args(argv)
+    try:
+        print(report(args.log, args.last))
+    except OSError as e:
+        print(f"No startup log: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+"""
+Virtual table — a ttk.Treeview that only holds the rows on screen
+==================================================================
+Inserting 20k+ well-month rows into a Treeview item by item freezes Tk for
+tens of seconds (every insert is a Tcl round trip plus layout).  VirtualTable
+keeps the full result in a plain Python row model and puts only the visible
+window (+ OVERSCAN rows) into the Treeview, re-using the same handful of
+items as you scroll.  Values are formatted as they scroll into view.
+
+It attaches to an existing Treeview and takes over its vertical scrollbar,
+so the tools keep their own layout code:
+
+    vt = VirtualTable.attach(tree, formatter=fmt, number_col="#")
+    vt.set_rows(columns, rows)          # columns already set up on the tree
+    vt.sort("OIL_VOL", reverse=True)    # model sort, then redraw
+    vt.export(path);  vt.copy_to_clipboard()     # .csv / .xlsx / .parquet
+
+Alternating rows get the "even" / "odd" tags the tools already configure.
+VirtualTable.of(tree) returns the table attached to a tree (or None).
+
+Sorting works on the raw typed rows, never on the text in Tk: sort keys are
+built once per column (numbers and dates by value, blanks last) and cached
+until the rows change, then the view is redrawn in one pass.  ListTable
+does the same for small pickers that keep every row in the tree.
+
+For DataFrame results, format every cell once up front and size the columns
+from a sample instead of measuring each cell in Tk:
+
+    shown = frame_display(df)                       # display strings, per column
+    autofit(tree, columns, shown, tree_font)        # one column() call per column
+    vt.set_rows(columns, list(df.itertuples(index=False, name=None)), display=shown)
+"""
+
+import heapq
+from datetime import datetime
+
+OVERSCAN = 5
+DEFAULT_ROW_HEIGHT = 20
+AUTOFIT_SAMPLE = 2000      # rows looked at per column when sizing
+AUTOFIT_LONGEST = 5        # longest sampled strings per column that get measured
+_EPOCH = datetime(1900, 1, 1)
+_char_widths = {}          # font description -> {char: px}
+
+
+def _default_fmt(val):
+    if val is None:
+        return ""
+    if isinstance(val, datetime):
+        return val.strftime("%Y-%m-%d")
+    return val
+
+
+def _text(val, date_fmt):
+    if val is None or val != val:                 # None / NaN / NaT
+        return ""
+    if isinstance(val, datetime):
+        return val.strftime(date_fmt)
+    return str(val)
+
+
+def frame_display(df, date_fmt="%Y-%m-%d"):
+    """Display strings for every cell of a DataFrame, as row tuples.
+
+    Formats a column at a time (dates with date_fmt, NaN/NaT blank) so the
+    table never has to format per cell in the Tk loop.
+    """
+    from pandas.api import types
+
+    cols = []
+    for j in range(df.shape[1]):
+        s = df.iloc[:, j]
+        if types.is_datetime64_any_dtype(s.dtype):
+            cols.append(s.dt.strftime(date_fmt).fillna("").tolist())
+        elif types.is_numeric_dtype(s.dtype) and not types.is_bool_dtype(s.dtype):
+            cols.append(s.astype(str).where(s.notna(), "").tolist())
+        else:
+            cols.append([_text(v, date_fmt) for v in s.tolist()])
+    return list(zip(*cols))
+
+
+def char_widths(font):
+    """{char: px} for printable ASCII in a tkinter Font, measured once per font."""
+    key = tuple(sorted(font.actual().items()))
+    table = _char_widths.get(key)
+    if table is None:
+        table = {chr(c): font.measure(chr(c)) for c in range(32, 127)}
+        _char_widths[key] = table
+    return table
+
+
+def text_width(text, widths):
+    """Estimated pixel width of `text` from a char_widths() table."""
+    wide = widths.get("W", 10)
+    return sum(widths.get(c, wide) for c in text)
+
+
+def autofit(tree, columns, display, font, head_pad=20, cell_pad=10, sample=AUTOFIT_SAMPLE):
+    """Size each column to its heading or its widest sampled display string.
+
+    Looks at up to `sample` evenly spaced rows, measures only the few longest
+    strings per column with the char-width table, and sets each width once.
+    """
+    widths = char_widths(font)
+    rows = display[::max(1, len(display) // sample)]
+    for i, col in enumerate(columns):
+        longest = heapq.nlargest(AUTOFIT_LONGEST, (r[i] for r in rows), key=len)
+        cell = max((text_width(t, widths) for t in longest), default=0)
+        tree.column(col, width=max(text_width(str(col), widths) + head_pad, cell + cell_pad),
+                    stretch=False)
+
+
+def sort_key(val):
+    """Blanks last, numbers (incl. '1,234' text) numerically, dates, then text."""
+    if val is None or val == "" or val != val:       # NaN / NaT -> blank
+        return (2, 0.0, "")
+    if isinstance(val, (bool, int, float)):
+        return (0, float(val), "")
+    if isinstance(val, datetime):
+        return (0, (val.replace(tzinfo=None) - _EPOCH).total_seconds(), "")
+    text = str(val)
+    try:
+        return (0, float(text.replace(",", "")), "")
+    except ValueError:
+        return (1, 0.0, text.lower())
+
+
+def _stripe(pos):
+    return ("even" if pos % 2 == 0 else "odd",)
+
+
+class _RowModel:
+    """Typed rows + view order + per-column sort-key cache, shared by the tables."""
+
+    ATTR = None                           # attribute the table is stored under on its tree
+
+    def __init__(self, tree, formatter=_default_fmt):
+        self.tree = tree
+        self.formatter = formatter
+        self.columns = []
+        self.rows = []                    # raw row tuples, as fetched
+        self.order = []                   # view position -> index into rows
+        self._keys = {}                   # column index -> [sort_key per row]
+        self._sort_col = None
+        self._sort_rev = False
+        setattr(tree, self.ATTR, self)
+
+    # ─── Lookup ──────────────────────────────────────────────────────────────
+    @classmethod
+    def attach(cls, tree, **kw):
+        """Existing table of this kind for `tree`, or a new one."""
+        t = getattr(tree, cls.ATTR, None)
+        if t is None:
+            t = cls(tree, **kw)
+        else:
+            for k, v in kw.items():
+                setattr(t, k, v)
+        return t
+
+    @classmethod
+    def of(cls, tree):
+        return getattr(tree, cls.ATTR, None)
+
+    def __len__(self):
+        return len(self.order)
+
+    # ─── Model ───────────────────────────────────────────────────────────────
+    def _set_model(self, columns, rows):
+        self.columns = list(columns)
+        self.rows = rows if isinstance(rows, list) else list(rows)
+        self.order = list(range(len(self.rows)))
+        self._keys = {}
+        self._sort_col = None
+
+    def sort_keys(self, col):
+        """sort_key() of every row for data column `col`, built once per model."""
+        i = self.columns.index(col)
+        keys = self._keys.get(i)
+        if keys is None:
+            keys = self._keys[i] = [sort_key(row[i]) for row in self.rows]
+        return keys
+
+    def _sort_order(self, col, reverse):
+        keys = self.sort_keys(col)
+        vals = [r for r in self.order if keys[r][0] != 2]
+        blanks = [r for r in self.order if keys[r][0] == 2]      # bottom either way
+        vals.sort(key=keys.__getitem__, reverse=reverse)
+        self.order = vals + blanks
+        self._sort_col, self._sort_rev = col, reverse
+
+    def view_rows(self):
+        """Raw rows in the current (sorted) order."""
+        return [self.rows[r] for r in self.order]
+
+
+class VirtualTable(_RowModel):
+    """Row model + windowed rendering for one ttk.Treeview."""
+
+    ATTR = "vtable"
+
+    def __init__(self, tree, formatter=_default_fmt, number_col=None, overscan=OVERSCAN):
+        super().__init__(tree, formatter)
+        self.number_col = number_col      # e.g. "#": 1-based position column
+        self.overscan = overscan
+        self.display = None               # pre-formatted rows (frame_display), if given
+        self.offset = 0                   # first view position on screen
+        self._iids = []                   # pooled Treeview items, top to bottom
+        self._iid_row = {}                # iid -> index into rows (current window)
+        self._selected = set()            # indexes into rows
+        self._row_h = None
+
+        # Take over the vertical scrollbar the tool wired to tree.yview
+        self._vsb = None
+        cmd = str(tree.cget("yscrollcommand") or "")
+        if cmd:
+            try:
+                self._vsb = tree.nametowidget(cmd.split()[0])
+                self._vsb.configure(command=self._yview)
+            except Exception:
+                self._vsb = None
+        tree.configure(yscrollcommand="")
+
+        tree.bind("<Configure>", lambda e: self.render(), add="+")
+        tree.bind("<MouseWheel>", self._on_wheel)
+        tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        tree.bind("<Button-5>", lambda e: self.scroll(3))
+        tree.bind("<Up>", lambda e: self._on_key(-1))
+        tree.bind("<Down>", lambda e: self._on_key(1))
+        tree.bind("<Prior>", lambda e: self._on_key(-self.visible_rows()))
+        tree.bind("<Next>", lambda e: self._on_key(self.visible_rows()))
+        tree.bind("<Home>", lambda e: self._on_key(-len(self.order)))
+        tree.bind("<End>", lambda e: self._on_key(len(self.order)))
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    # ─── Model ───────────────────────────────────────────────────────────────
+    def set_rows(self, columns, rows, display=None):
+        """Replace the model.  `columns` are the data columns, in row order.
+
+        `display` (same shape as rows, already strings) skips the formatter;
+        sorting still uses the raw rows.
+        """
+        self._set_model(columns, rows)
+        self.display = display
+        self.offset = 0
+        self._selected.clear()
+        self.render()
+
+    def clear(self):
+        self.set_rows([], [])
+
+    def sort(self, col, reverse=False):
+        """Sort the model on data column `col` and redraw from the top."""
+        self._sort_order(col, reverse)
+        self.offset = 0
+        self.render()
+
+    def _shown(self, r):
+        if self.display is not None:
+            return list(self.display[r])
+        return [self.formatter(v) for v in self.rows[r]]
+
+    def display_row(self, pos):
+        """Formatted values for view position `pos` (what the Treeview shows)."""
+        vals = self._shown(self.order[pos])
+        return [pos + 1] + vals if self.number_col else vals
+
+    def selected_rows(self):
+        """Raw rows currently selected, in view order."""
+        return [self.rows[r] for r in self.order if r in self._selected]
+
+    # ─── Rendering ───────────────────────────────────────────────────────────
+    def row_height(self):
+        if self._row_h is None:
+            try:
+                from tkinter import ttk
+                h = ttk.Style(self.tree).lookup("Treeview", "rowheight")
+                self._row_h = int(h) if h else DEFAULT_ROW_HEIGHT
+            except Exception:
+                self._row_h = DEFAULT_ROW_HEIGHT
+        return self._row_h
+
+    def visible_rows(self):
+        h = self.tree.winfo_height()
+        if h <= 1:       # not mapped yet — fall back to the configured height
+            try:
+                return max(1, int(self.tree.cget("height")))
+            except Exception:
+                return 10
+        rh = self.row_height()
+        return max(1, (h - rh - 4) // rh)       # minus the heading row
+
+    def _max_offset(self):
+        return max(0, len(self.order) - self.visible_rows())
+
+    def render(self):
+        """Write the visible window into the pooled Treeview items."""
+        tree = self.tree
+        n = len(self.order)
+        self.offset = max(0, min(self.offset, self._max_offset()))
+        want = max(0, min(self.visible_rows() + self.overscan, n - self.offset))
+
+        while len(self._iids) < want:
+            self._iids.append(tree.insert("", "end"))
+        if len(self._iids) > want:
+            tree.delete(*self._iids[want:])
+            del self._iids[want:]
+
+        self._iid_row = {}
+        show = []
+        for k, iid in enumerate(self._iids):
+            pos = self.offset + k
+            r = self.order[pos]
+            tree.item(iid, values=self.display_row(pos), tags=_stripe(pos))
+            self._iid_row[iid] = r
+            if r in self._selected:
+                show.append(iid)
+        if tuple(tree.selection()) != tuple(show):
+            tree.selection_set(show)
+        if self._iids:
+            tree.yview_moveto(0)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self._vsb is None:
+            return
+        n = len(self.order)
+        if n == 0:
+            self._vsb.set(0.0, 1.0)
+            return
+        vis = self.visible_rows()
+        self._vsb.set(self.offset / n, min(1.0, (self.offset + vis) / n))
+
+    # ─── Scrolling / keys / selection ────────────────────────────────────────
+    def scroll(self, delta):
+        new = max(0, min(self.offset + delta, self._max_offset()))
+        if new != self.offset:
+            self.offset = new
+            self.render()
+        return "break"
+
+    def _yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.order))
+            self.offset = max(0, min(self.offset, self._max_offset()))
+            self.render()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2].startswith("page"):
+                step *= self.visible_rows()
+            self.scroll(step)
+
+    def _on_wheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_key(self, delta):
+        """Move the focus row by `delta` view positions, scrolling as needed."""
+        if not self.order:
+            return "break"
+        focus = self.tree.focus()
+        pos = self.offset + self._iids.index(focus) if focus in self._iids else self.offset
+        pos = max(0, min(pos + delta, len(self.order) - 1))
+        vis = self.visible_rows()
+        if pos < self.offset:
+            self.offset = pos
+        elif pos >= self.offset + vis:
+            self.offset = pos - vis + 1
+        self._selected = {self.order[pos]}
+        self.render()
+        iid = self._iids[pos - self.offset]
+        self.tree.focus(iid)
+        return "break"
+
+    def _on_select(self, event=None):
+        on_screen = set(self._iid_row.values())
+        picked = {self._iid_row[i] for i in self.tree.selection() if i in self._iid_row}
+        self._selected = (self._selected - on_screen) | picked
+
+    # ─── Output ──────────────────────────────────────────────────────────────
+    def export(self, path, sheet="Data"):
+        """All rows (view order, typed values) to .csv / .xlsx / .parquet,
+        streamed in chunks (common/export.py); returns the row count."""
+        from common import export
+        return export.write(path, self.columns, (self.rows[r] for r in self.order), sheet=sheet)
+
+    def export_csv(self, path):
+        return self.export(path)
+
+    def to_tsv(self, selected_only=False):
+        picked = [r for r in self.order if not selected_only or r in self._selected]
+        lines = ["\t".join(self.columns)]
+        lines += ["\t".join("" if v is None else str(v) for v in self._shown(r))
+                  for r in picked]
+        return "\n".join(lines)
+
+    def copy_to_clipboard(self, selected_only=False):
+        """Tab-separated rows (Excel paste) — all rows, or just the selection."""
+        text = self.to_tsv(selected_only)
+        self.tree.clipboard_clear()
+        self.tree.clipboard_append(text)
+        return text.count("\n")
+
+
+class ListTable(_RowModel):
+    """Row model for a small Treeview that keeps every row as an item.
+
+    For the well pickers, which drive a chart from <<TreeviewSelect>>: each
+    row's item id is fixed ("r<index>"), so a sort is one set_children()
+    reorder plus a stripe pass, and the selection stays on the same well
+    without firing a new select event.
+    """
+
+    ATTR = "list_table"
+
+    def set_rows(self, columns, rows):
+        """Replace the model and (re)insert every row, formatted."""
+        self._set_model(columns, rows)
+        tree = self.tree
+        tree.delete(*tree.get_children())
+        for r, row in enumerate(self.rows):
+            tree.insert("", "end", iid=f"r{r}", tags=_stripe(r),
+                        values=[self.formatter(v) for v in row])
+
+    def sort(self, col, reverse=False):
+        """Sort the model on data column `col` and reorder the items in place."""
+        self._sort_order(col, reverse)
+        tree = self.tree
+        tree.set_children("", *(f"r{r}" for r in self.order))
+        for pos, r in enumerate(self.order):
+            tree.item(f"r{r}", tags=_stripe(pos))
+
+    def row_of(self, iid):
+        """Raw row behind a tree item id."""
+        return self.rows[int(iid[1:])]
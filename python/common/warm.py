@@ -0,0 +1,149 @@
+"""
+Warm tool processes for the Launcher
+====================================
+A tool started with `python tool.py` spends several seconds importing
+tkinter, ttkbootstrap, pandas, matplotlib and oracledb and loading the
+Oracle client before its window appears.  WarmPool keeps POOL_SIZE worker
+processes that have already done all of that and are waiting for a script:
+
+    pool = WarmPool(); pool.start()           # Launcher.__init__
+    if not pool.run(path):                    # button click
+        subprocess.Popen([sys.executable, path], cwd=os.path.dirname(path))
+    pool.close()                              # Launcher closing
+
+A worker is `python common/warm.py`: it imports PRELOAD, runs
+db.init_client(), then blocks on one line of stdin — the script path — and
+runs that script as __main__ in the script's folder, exactly as a normal
+start would (sys.argv, sys.path[0], cwd).  Each worker runs one tool and
+the pool refills REFILL_DELAY_S later, once the new tool is up.  A path
+sent before the worker finishes preloading is simply picked up when it's
+ready.  Idle workers exit when the Launcher does (their stdin closes).
+
+Works the same on Windows (no fork needed).  RE_TOOLS_WARM_POOL sets the
+number of workers (default 2, 0 turns the pool off; a value that isn't a
+whole number falls back to the default).  It is separate from RE_TOOLS_WARM,
+Field Quicklook's cache-warmer switch.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+DEFAULT_POOL_SIZE = 2
+
+
+def _pool_size():
+    try:
+        return max(0, int(os.getenv("RE_TOOLS_WARM_POOL", DEFAULT_POOL_SIZE)))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+
+POOL_SIZE = _pool_size()
+REFILL_DELAY_S = 3.0
+PRELOAD = (
+    "tkinter", "tkinter.ttk", "tkinter.font", "tkinter.filedialog", "tkinter.messagebox",
+    "ttkbootstrap", "numpy", "pandas",
+    "matplotlib", "matplotlib.figure", "matplotlib.dates", "matplotlib.backends.backend_tkagg",
+    "oracledb",
+    "common.db", "common.query_cache", "common.vtable",
+)
+WORKER = os.path.abspath(__file__)
+
+
+# ─── Launcher side ───────────────────────────────────────────────────────────
+class WarmPool:
+    """Pre-started worker processes, each good for one tool."""
+
+    def __init__(self, size=POOL_SIZE, python=sys.executable):
+        self.size = size
+        self.python = python
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        with self._lock:
+            self._idle = [p for p in self._idle if p.poll() is None]
+            while not self._closed and len(self._idle) < self.size:
+                try:
+                    self._idle.append(self._spawn())
+                except OSError:
+                    break
+
+    def _spawn(self):
+        return subprocess.Popen([self.python, WORKER], stdin=subprocess.PIPE,
+                                cwd=os.path.dirname(os.path.dirname(WORKER)))
+
+    def run(self, path):
+        """Hand `path` to an idle worker; False if none is available."""
+        with self._lock:
+            while self._idle:
+                proc = self._idle.pop(0)
+                if proc.poll() is not None:
+                    continue
+                try:
+                    proc.stdin.write((os.path.abspath(path) + "\n").encode("utf-8"))
+                    proc.stdin.close()
+                except OSError:
+                    continue
+                break
+            else:
+                proc = None
+        if not self._closed:
+            timer = threading.Timer(REFILL_DELAY_S, self.start)
+            timer.daemon = True
+            timer.start()
+        return proc is not None
+
+    def close(self):
+        """Stop the idle workers (tools already handed out keep running)."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for proc in idle:
+            try:
+                proc.stdin.close()
+                proc.terminate()
+            except OSError:
+                pass
+
+
+# ─── Worker side ─────────────────────────────────────────────────────────────
+def _preload():
+    import importlib
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass                       # missing optional package: the tool reports it
+    try:
+        from common import db
+        db.init_client()
+    except Exception:
+        pass
+
+
+def _run(path):
+    import runpy
+    folder = os.path.dirname(path)
+    os.chdir(folder)
+    sys.argv = [path]
+    sys.path[0] = folder               # as `python path` would have it
+    os.environ["RE_TOOLS_WARM_STARTED"] = "1"   # startup profile: warm vs cold
+    runpy.run_path(path, run_name="__main__")
+
+
+def main():
+    sys.path[0] = os.path.dirname(os.path.dirname(WORKER))   # python/, so `common` imports
+    _preload()
+    line = sys.stdin.readline().strip()
+    if not line:                       # Launcher closed before using this worker
+        return 0
+    _run(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())